@@ -3,7 +3,7 @@ import os
 
 from pdbstore.cli.command import BaseCommand
 from pdbstore.cli.once_argument import OnceArgument
-from pdbstore.const import ENV_PDBSTORE_STORAGE_DIR
+from pdbstore.const import ENV_PDBSTORE_HASH_CACHE, ENV_PDBSTORE_STORAGE_DIR
 
 
 def add_global_arguments(
@@ -62,6 +62,21 @@ def add_storage_arguments(parser: argparse.ArgumentParser, single: bool = True)
         )
 
 
+def add_hash_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add file identity cache command-line options"""
+    parser.add_argument(
+        "--hash-cache",
+        metavar="PATH",
+        dest="hash_cache",
+        type=str,
+        help="Cache file used to skip parsing unchanged files. "
+        f"[env var: {ENV_PDBSTORE_HASH_CACHE}]",
+        required=False,
+        default=os.getenv(ENV_PDBSTORE_HASH_CACHE),
+        action=OnceArgument,
+    )
+
+
 def add_product_arguments(parser: argparse.ArgumentParser) -> None:
     """Add product information command-line options"""
     parser.add_argument(
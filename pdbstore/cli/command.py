@@ -12,6 +12,7 @@ from pdbstore.exceptions import (
     PDBInvalidSubCommandNameException,
     PDBStoreException,
 )
+from pdbstore.io import hashcache
 from pdbstore.io.file import build_files_list
 from pdbstore.io.output import PDBStoreOutput
 from pdbstore.typing import (
@@ -84,6 +85,9 @@ class PDBStoreArgumentParser(argparse.ArgumentParser):
             if value is not None:
                 args_dict[key] = value
 
+        if args_dict.get("hash_cache"):
+            hashcache.activate(args_dict["hash_cache"])
+
         if "input_store_id" in args_dict:
             input_store_name = args_dict.get("input_store_id")
             if input_store_name:
@@ -305,7 +309,10 @@ class PDBStoreCommand(BaseCommand):
         )
         # pylint: disable=protected-access
         parser._command = self
-        info = self.callback(parser, *args)
+        try:
+            info = self.callback(parser, *args)
+        finally:
+            hashcache.deactivate()
 
         if not self.subcommands:
             self._format(parser, info, *args)
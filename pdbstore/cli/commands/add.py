@@ -1,8 +1,10 @@
+import zlib
 from pathlib import Path
 
 import pdbstore.io
 from pdbstore.cli.args import (
     add_global_arguments,
+    add_hash_cache_arguments,
     add_product_arguments,
     add_storage_arguments,
 )
@@ -17,7 +19,7 @@ from pdbstore.exceptions import (
     UnknowFileTypeError,
 )
 from pdbstore.io.output import cli_out_write, PDBStoreOutput
-from pdbstore.store import OpStatus, Store, Summary, TransactionType
+from pdbstore.store import CompressionPolicy, OpStatus, Store, Summary, TransactionType
 from pdbstore.typing import Any, Optional
 
 
@@ -33,6 +35,37 @@ def add_text_formatter(summary: Summary) -> None:
         raise PDBAbortExecution(summary.failed(True))
 
 
+def _compression_policy(opts: Any) -> Optional[CompressionPolicy]:
+    """Create the compression policy from command-line arguments
+
+    :param opts: The parsed command-line arguments
+    :return: The :class:`CompressionPolicy <pdbstore.store.CompressionPolicy>` object
+        if compression is requested, else None
+    :raise:
+        :CommandLineError: Invalid compression argument
+    """
+    if not opts.compress:
+        return None
+    level: Optional[int] = opts.compress_level
+    if level is not None and not 1 <= level <= 9:
+        raise CommandLineError(f"{level} : invalid compression level")
+    workers: Optional[int] = opts.compress_jobs
+    if workers is not None and workers < 0:
+        raise CommandLineError(f"{workers} : invalid number of compression jobs")
+    min_size: int = opts.compress_min_size
+    if min_size < 0:
+        raise CommandLineError(f"{min_size} : invalid minimum size")
+    min_ratio: float = opts.compress_min_ratio
+    if not 0.0 <= min_ratio <= 100.0:
+        raise CommandLineError(f"{min_ratio} : invalid minimum ratio")
+    return CompressionPolicy(
+        workers,
+        level if level is not None else zlib.Z_DEFAULT_COMPRESSION,
+        min_size,
+        min_ratio / 100.0,
+    )
+
+
 @pdbstore_command(
     group="Storage",
     formatters={"text": add_text_formatter, "json": summary_json_formatter},
@@ -56,8 +89,44 @@ def add(parser: PDBStoreArgumentParser, *args: Any) -> Any:
         default=False,
         help="Store compressed files on the server. Defaults to False.",
     )
+    parser.add_argument(
+        "--compress-level",
+        metavar="LEVEL",
+        dest="compress_level",
+        type=int,
+        default=None,
+        help="""Compression level from 1 (fastest) to 9 (smallest).
+        Defaults to a compromise between speed and size.""",
+    )
+    parser.add_argument(
+        "--compress-jobs",
+        metavar="N",
+        dest="compress_jobs",
+        type=int,
+        default=None,
+        help="""Maximum number of files compressed simultaneously.
+        Defaults to the number of processors.""",
+    )
+    parser.add_argument(
+        "--compress-min-size",
+        metavar="BYTES",
+        dest="compress_min_size",
+        type=int,
+        default=0,
+        help="Store files smaller than BYTES without compression. Defaults to 0.",
+    )
+    parser.add_argument(
+        "--compress-min-ratio",
+        metavar="PERCENT",
+        dest="compress_min_ratio",
+        type=float,
+        default=0.0,
+        help="""Store files without compression if compressing a sample of them
+        saves less than PERCENT of their size. Defaults to 0.""",
+    )
 
     add_storage_arguments(parser)
+    add_hash_cache_arguments(parser)
 
     parser.add_argument(
         "-k",
@@ -88,6 +157,17 @@ def add(parser: PDBStoreArgumentParser, *args: Any) -> Any:
         help="Add files or directories recursively.",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        metavar="N",
+        dest="jobs",
+        type=int,
+        default=None,
+        help="""Maximum number of files identified simultaneously.
+        Defaults to the number of processors.""",
+    )
+
     parser.add_argument(
         "files",
         metavar="FILE_OR_DIR",
@@ -121,9 +201,13 @@ def add(parser: PDBStoreArgumentParser, *args: Any) -> Any:
     if not input_files:
         raise CommandLineError("no file or directory given")
 
-    compress: bool = opts.compress
-    if compress and not pdbstore.io.is_compression_supported():
+    jobs: Optional[int] = opts.jobs
+    if jobs is not None and jobs < 0:
+        raise CommandLineError(f"{jobs} : invalid number of jobs")
+
+    if opts.compress and not pdbstore.io.is_compression_supported():
         raise CompressionNotSupportedError()
+    compression = _compression_policy(opts)
     store = Store(store_dir)
     # Generate next transaction id
     store.next_transaction_id  # pylint: disable=pointless-statement
@@ -138,25 +222,27 @@ def add(parser: PDBStoreArgumentParser, *args: Any) -> Any:
 
     success = 0
     errors_list = []
-    for file in input_files:
-        try:
-            if new_transaction.register_entry(Path(file), compress):
-                success += 1
-        except UnknowFileTypeError as exu:
+    results = new_transaction.register_entries(
+        [Path(file) for file in input_files], opts.compress, jobs
+    )
+    for file, (_, result) in zip(input_files, results):
+        if isinstance(result, UnknowFileTypeError):
             output.warning(f"{file}: not a known file type")
-            errors_list.append([file, str(exu)])
-        except PDBStoreException as exp:
-            output.error(str(exp))
-            errors_list.append([file, str(exp)])
-        except Exception as exg:  # pylint: disable=broad-except # pragma: no cover
-            errors_list.append([file, str(exg)])
+            errors_list.append([file, str(result)])
+        elif isinstance(result, PDBStoreException):
+            output.error(str(result))
+            errors_list.append([file, str(result)])
+        elif isinstance(result, Exception):  # pragma: no cover
+            errors_list.append([file, str(result)])
             output.error(f"unexpected error when adding {file} with the following error:")
-            output.error(exg)
+            output.error(result)
+        elif result:
+            success += 1
 
     if success > 0:
         # Commit modifications to the disk
         try:
-            summary = store.commit(new_transaction, opts.force)
+            summary = store.commit(new_transaction, opts.force, compression=compression)
         except PDBStoreException as exc:
             output.error(exc)
             return Summary(new_transaction.id, OpStatus.FAILED, TransactionType.ADD)
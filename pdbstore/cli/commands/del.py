@@ -4,7 +4,7 @@ from pdbstore.cli.formatters import summary_json_formatter
 from pdbstore.exceptions import CommandLineError, PDBAbortExecution, PDBStoreException
 from pdbstore.io.output import cli_out_write, PDBStoreOutput
 from pdbstore.store import OpStatus, Store, Summary, TransactionType
-from pdbstore.typing import Any, Optional
+from pdbstore.typing import Any
 
 __MAPPING__ = {"del": "delete"}
 
@@ -64,24 +64,15 @@ def delete(parser: PDBStoreArgumentParser, *args: Any) -> Any:
     # Generate next transaction id
     store.next_transaction_id  # pylint: disable=pointless-statement
 
-    # Delete the transaction from the store
-    summary: Optional[Summary] = None
-    summary_head: Optional[Summary] = None
-    for trans_id in transaction_id if isinstance(transaction_id, list) else [transaction_id]:
-        try:
-            summary_del: Summary = store.delete_transaction(trans_id, opts.dry_run)
-        except PDBStoreException as exp:
-            output.error(str(exp))
-            summary_del = Summary(trans_id, OpStatus.FAILED, TransactionType.DEL, str(exp))
-        except BaseException as exg:  # pylint: disable=broad-exception-caught # pragma: no cover
-            summary_del = Summary(trans_id, OpStatus.FAILED, TransactionType.DEL, str(exg))
-            output.error(
-                f"unexpected error when deleting {trans_id} transaction",
-            )
-        if summary:
-            summary.linked = summary_del
-        else:
-            summary_head = summary_del
-        summary = summary_del
+    # Delete the transactions from the store
+    transaction_ids = transaction_id if isinstance(transaction_id, list) else [transaction_id]
+    try:
+        summary_head: Summary = store.delete_transactions(transaction_ids, opts.dry_run)
+    except PDBStoreException as exp:
+        output.error(str(exp))
+        summary_head = Summary(None, OpStatus.FAILED, TransactionType.DEL, str(exp))
+    except BaseException as exg:  # pylint: disable=broad-exception-caught # pragma: no cover
+        summary_head = Summary(None, OpStatus.FAILED, TransactionType.DEL, str(exg))
+        output.error("unexpected error when deleting transactions")
 
     return summary_head
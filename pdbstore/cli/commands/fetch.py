@@ -2,7 +2,11 @@ import json
 import os
 
 from pdbstore import util
-from pdbstore.cli.args import add_global_arguments, add_storage_arguments
+from pdbstore.cli.args import (
+    add_global_arguments,
+    add_hash_cache_arguments,
+    add_storage_arguments,
+)
 from pdbstore.cli.command import pdbstore_command, PDBStoreArgumentParser
 from pdbstore.exceptions import (
     CommandLineError,
@@ -103,6 +107,7 @@ def fetch(parser: PDBStoreArgumentParser, *args: Any) -> Any:
     Fetch all files from a symbol store
     """
     add_storage_arguments(parser)
+    add_hash_cache_arguments(parser)
 
     parser.add_argument(
         "-r",
@@ -0,0 +1,63 @@
+from pdbstore import util
+from pdbstore.cli.args import add_global_arguments, add_storage_arguments
+from pdbstore.cli.command import pdbstore_command, PDBStoreArgumentParser
+from pdbstore.cli.formatters import default_json_formatter
+from pdbstore.exceptions import CommandLineError
+from pdbstore.io.output import cli_out_write, PDBStoreOutput
+from pdbstore.store import Store
+from pdbstore.typing import Any, Dict
+
+
+def index_text_formatter(index_dict: Dict[str, Any]) -> None:
+    """Print output text for index command as simple text"""
+    if index_dict["deleted"]:
+        cli_out_write(f"{index_dict['path']} deleted")
+    else:
+        cli_out_write(f"Number of transactions indexed = {index_dict['transactions']}")
+
+
+@pdbstore_command(
+    group="Storage",
+    formatters={"text": index_text_formatter, "json": default_json_formatter},
+)
+def index(parser: PDBStoreArgumentParser, *args: Any) -> Any:
+    """
+    Rebuild the persistent index of a local symbol store
+    """
+    add_storage_arguments(parser)
+
+    parser.add_argument(
+        "-d",
+        "--delete",
+        dest="delete",
+        default=False,
+        action="store_true",
+        help="Delete the persistent index instead of rebuilding it.",
+    )
+
+    add_global_arguments(parser)
+
+    opts = parser.parse_args(*args)
+
+    output = PDBStoreOutput()
+
+    # Check input configuration and arguments
+    store_dir = opts.store_dir
+    if not store_dir:
+        raise CommandLineError("no symbol store directory given")
+
+    store = Store(store_dir)
+
+    index_dict: Dict[str, Any] = {
+        "path": util.path_to_str(store.index_file_path),
+        "deleted": opts.delete,
+        "transactions": 0,
+    }
+    if opts.delete:
+        store.index.close()
+        store.index_file_path.unlink(missing_ok=True)
+        return index_dict
+
+    output.verbose(f"Rebuilding {store.index_file_path} ...")
+    index_dict["transactions"] = store.index.rebuild()
+    return index_dict
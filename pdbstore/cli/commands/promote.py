@@ -2,6 +2,7 @@ from pdbstore.cli.args import add_global_arguments, add_storage_arguments
 from pdbstore.cli.command import pdbstore_command, PDBStoreArgumentParser
 from pdbstore.cli.formatters import summary_json_formatter
 from pdbstore.exceptions import CommandLineError, PDBAbortExecution, PDBStoreException
+from pdbstore.io.copy import LinkMode
 from pdbstore.io.output import cli_out_write, PDBStoreOutput
 from pdbstore.store import OpStatus, Store, Summary, TransactionType
 from pdbstore.typing import Any, Optional
@@ -51,6 +52,17 @@ def promote(parser: PDBStoreArgumentParser, *args: Any) -> Any:
         to check if it's already exists in the store. Defaults to False.""",
     )
 
+    parser.add_argument(
+        "--link",
+        dest="link",
+        choices=[mode.value for mode in LinkMode],
+        default=LinkMode.COPY.value,
+        help="""Method used to store the promoted files: "hard" for hard links, "reflink"
+        for copy-on-write clones, "copy" for full copies, or "auto" to select the first
+        supported method from hard links, reflinks and copies. Unsupported methods
+        fall back to a full copy. Defaults to copy.""",
+    )
+
     parser.add_argument(
         "-d",
         "--display-full-name",
@@ -88,7 +100,9 @@ def promote(parser: PDBStoreArgumentParser, *args: Any) -> Any:
     for trans_id in transaction_id if isinstance(transaction_id, list) else [transaction_id]:
         try:
             trans_in = store_in.find_transaction(trans_id, TransactionType.ADD)
-            summary_trans = store_out.promote_transaction(trans_in, opts.comment)
+            summary_trans = store_out.promote_transaction(
+                trans_in, opts.comment, LinkMode(opts.link)
+            )
         except PDBStoreException as pdbse:
             summary_trans = Summary(trans_id, OpStatus.FAILED, None, str(pdbse))
         except Exception as exc:  # pylint: disable=broad-except # pragma: no cover
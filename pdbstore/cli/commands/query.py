@@ -1,7 +1,11 @@
 import json
 
 from pdbstore import util
-from pdbstore.cli.args import add_global_arguments, add_storage_arguments
+from pdbstore.cli.args import (
+    add_global_arguments,
+    add_hash_cache_arguments,
+    add_storage_arguments,
+)
 from pdbstore.cli.command import pdbstore_command, PDBStoreArgumentParser
 from pdbstore.exceptions import (
     CommandLineError,
@@ -105,6 +109,7 @@ def query(parser: PDBStoreArgumentParser, *args: Any) -> Any:
     Check if file(s) are indexed on the server
     """
     add_storage_arguments(parser)
+    add_hash_cache_arguments(parser)
 
     parser.add_argument(
         "-r",
@@ -136,6 +136,12 @@ def _report_command(
         default=sys.stdout,
         help="Generate PATH file. Defaults to stdout",
     )
+    subparser.add_argument(
+        "--rebuild",
+        dest="rebuild",
+        action="store_true",
+        help="Rebuild the report snapshot from the whole history",
+    )
 
     add_global_arguments(subparser, False)
 
@@ -148,7 +154,7 @@ def _report_command(
 
     store = Store(store_dir)
 
-    generated = ReportGenerator(store).generate(report_type)
+    generated = ReportGenerator(store, rebuild=opts.rebuild).generate(report_type)
     if generated is None:
         raise CommandLineError(f"failed to generate {report_type} report")
 
@@ -170,19 +176,28 @@ def _report_command(
 
 
 def _report_render(report_dict: ReportDict, report_format: str) -> None:
-    # Generate the requested report
-    rendered_text = templates.render_template(
-        report_dict["type"],
-        report_format,
-        report_dict["start"],
-        report=report_dict,
-    )
-    if report_dict.get("stream") is not sys.stdout:
+    # Generate the requested report piece by piece into the output stream
+    stdout: IO[str] = sys.stdout
+    if report_dict.get("stream") is not stdout:
         out_file: Path = Path(str(report_dict.get("stream"))).resolve()
         if out_file.is_file():
             out_file.unlink(missing_ok=True)
         else:
             out_file.parent.mkdir(parents=True, exist_ok=True)
-        out_file.write_text(rendered_text, encoding="utf-8")
+        with out_file.open("w", encoding="utf-8", buffering=templates.OUTPUT_BUFFER_SIZE) as fpo:
+            templates.stream_template(
+                report_dict["type"],
+                report_format,
+                fpo,
+                report_dict["start"],
+                report=report_dict,
+            )
     else:
-        cli_out_write(rendered_text)
+        templates.stream_template(
+            report_dict["type"],
+            report_format,
+            stdout,
+            report_dict["start"],
+            report=report_dict,
+        )
+        cli_out_write("")
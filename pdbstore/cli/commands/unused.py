@@ -187,7 +187,7 @@ def unused(parser: PDBStoreArgumentParser, *args: Any) -> Any:
             output.error(exc)
             output.error("unexpected error when checking {file_path} file usage")
 
-    # Delete all required obselete transactions
-    for transaction in obselete_transactions:
-        store.delete_transaction(transaction.id)
+    # Delete all required obselete transactions at once
+    if obselete_transactions:
+        store.delete_transactions([str(transaction.id) for transaction in obselete_transactions])
     return summary
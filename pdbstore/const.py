@@ -5,11 +5,14 @@ from pdbstore import _version
 __all__ = [
     "ADMIN_DIRNAME",
     "HISTORY_FILENAME",
+    "INDEX_FILENAME",
     "LASTID_FILENAME",
     "PINGME_FILENAME",
+    "REPORT_FILENAME",
     "SERVER_FILENAME",
     "USER_AGENT",
     "ENV_PDBSTORE_CFG",
+    "ENV_PDBSTORE_HASH_CACHE",
     "ENV_PDBSTORE_STORAGE_DIR",
     "ENV_PDBSTORE_VERBOSE",
     "ENV_PDBSTORE_COLOR_DARK",
@@ -31,12 +34,18 @@ This file contains the full history, so
 transactions can be present
 """
 
+INDEX_FILENAME = "index.db"
+"""The optional persistent index mapping files to transactions """
+
 LASTID_FILENAME = "lastid.txt"
 """The file containing the last transaction id """
 
 PINGME_FILENAME = "pingme.txt"
 """The file defining the date/time of the latest modification """
 
+REPORT_FILENAME = "000Report.db"
+"""The optional report snapshot, stored next to the administration directory """
+
 SERVER_FILENAME = "server.txt"
 """The server symbol store file containing only
 :const:`add <pdbstore.store.transaction_type.TransactionType.ADD>`
@@ -61,6 +70,13 @@ It can be a path to a local configuration to be used to configure
 **pdbstore** with appropriate default values
 """
 
+ENV_PDBSTORE_HASH_CACHE = "PDBSTORE_HASH_CACHE"
+"""Path to the optional file identity cache
+
+It can be a path to a local file where the computed hash keys and debugging
+information are saved, so unchanged files are not parsed again
+"""
+
 ENV_PDBSTORE_STORAGE_DIR = "PDBSTORE_STORAGE_DIR"
 """Root directory for the symbol store
 
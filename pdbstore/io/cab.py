@@ -1,17 +1,447 @@
+import ntpath
 import os
+import struct
 import subprocess
 import sys
+import time
+import zlib
 
 from pdbstore import exceptions, util
-from pdbstore.typing import Callable, PathLike, Union
+from pdbstore.typing import (
+    Any,
+    Callable,
+    Generator,
+    IO,
+    List,
+    Optional,
+    PathLike,
+    Tuple,
+    Union,
+)
 
 __all__ = ["compress", "decompress"]
 
-# By default, compression is not supported until we detect the appropriate exectuable
-compress: Union[None, Callable[[PathLike, PathLike], None]] = None  # pylint: disable=invalid-name
+CAB_SIGNATURE = b"MSCF"
+# CAB format version 1.3
+CAB_VERSION = (3, 1)
+# CFHEADER without reserved fields
+CAB_HEADER_FORMAT = "<4sIIIIIBBHHHHH"
+# CFFOLDER without reserved field
+CAB_FOLDER_FORMAT = "<IHH"
+# CFFILE without file name
+CAB_FILE_FORMAT = "<IIHHHH"
+# CFDATA without reserved field and data
+CAB_DATA_FORMAT = "<IHH"
+# Header flags
+CAB_FLAG_PREV_CABINET = 0x0001
+CAB_FLAG_NEXT_CABINET = 0x0002
+CAB_FLAG_RESERVE_PRESENT = 0x0004
+# Folder compression types
+CAB_COMPRESS_MASK = 0x000F
+CAB_COMPRESS_NONE = 0
+CAB_COMPRESS_MSZIP = 1
+# Maximum number of uncompressed bytes per data block
+CAB_BLOCK_SIZE = 0x8000
+# Each MSZIP block starts with this signature followed by raw deflate data
+MSZIP_SIGNATURE = b"CK"
+# File attributes
+CAB_ATTRIB_ARCHIVE = 0x20
+CAB_ATTRIB_NAME_IS_UTF = 0x80
 
-# By default, decompression is not supported until we detect the appropriate exectuable
-decompress: Union[None, Callable[[PathLike, PathLike], None]] = None  # pylint: disable=invalid-name
+# Built-in compression is used by default, see the end of this module
+compress: Union[None, Callable[..., None]] = None  # pylint: disable=invalid-name
+
+# Built-in decompression is used by default, see the end of this module
+decompress: Union[None, Callable[..., None]] = None  # pylint: disable=invalid-name
+
+# External decompression used for unsupported compression types (ex: LZX)
+_external_decompress: Optional[Callable[[PathLike, PathLike], None]] = None
+
+# Size of file objects buffer when extracting files
+CAB_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class CabFile:
+    """A file stored in a cabinet"""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, name: str, size: int, offset: int, folder: int) -> None:
+        """Class initialization.
+
+        :param name: The file name
+        :param size: The uncompressed file size
+        :param offset: The uncompressed offset from the beginning of the folder
+        :param folder: The folder zero-based index
+        """
+        self.name: str = name
+        self.size: int = size
+        self.offset: int = offset
+        self.folder: int = folder
+
+
+class CabFolder:
+    """A folder stored in a cabinet"""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, data_offset: int, blocks_count: int, compress_type: int) -> None:
+        """Class initialization.
+
+        :param data_offset: Offset of the first data block from the beginning of the cabinet
+        :param blocks_count: The number of data blocks
+        :param compress_type: The compression type
+        """
+        self.data_offset: int = data_offset
+        self.blocks_count: int = blocks_count
+        self.compress_type: int = compress_type
+
+
+class CabReader:
+    """A streaming cabinet reader.
+
+    Only the headers are read when the object is created. Files content is
+    decompressed block by block when extracted, so the cabinet is never fully
+    loaded into memory. Stored and MSZIP folders are supported.
+    """
+
+    SUPPORTED_COMPRESS_TYPES = (CAB_COMPRESS_NONE, CAB_COMPRESS_MSZIP)
+
+    def __init__(self, fcab: IO[bytes]) -> None:
+        """Parse cabinet headers.
+
+        :param fcab: File object to the previously opened cabinet file
+        :raise:
+            :struct.error: Truncated headers
+            :ValueError: Invalid or unsupported headers
+        """
+        self.fcab: IO[bytes] = fcab
+        self.folders: List[CabFolder] = []
+        self.files: List[CabFile] = []
+        self._data_reserve: int = 0
+        self._parse()
+
+    def _read(self, fmt: str) -> Tuple[Any, ...]:
+        """Read and unpack a structure from the current position.
+
+        :param fmt: The structure format
+        :return: The unpacked values
+        """
+        return struct.unpack(fmt, self.fcab.read(struct.calcsize(fmt)))
+
+    def _read_string(self) -> bytes:
+        """Read a null-terminated string from the current position.
+
+        :return: The string content without the null character
+        """
+        content = b""
+        while True:
+            char = self.fcab.read(1)
+            if not char:
+                raise ValueError("unterminated string")
+            if char == b"\0":
+                return content
+            content += char
+
+    def _parse(self) -> None:
+        """Parse the cabinet header, folders and files"""
+        self.fcab.seek(0)
+        header = self._read(CAB_HEADER_FORMAT)
+        if header[0] != CAB_SIGNATURE:
+            raise ValueError("cabinet signature not found")
+        files_offset, folders_count, files_count, flags = (
+            header[4],
+            header[8],
+            header[9],
+            header[10],
+        )
+        folder_reserve = 0
+        if flags & CAB_FLAG_RESERVE_PRESENT:
+            header_reserve, folder_reserve, self._data_reserve = self._read("<HBB")
+            self.fcab.seek(header_reserve, os.SEEK_CUR)
+        if flags & (CAB_FLAG_PREV_CABINET | CAB_FLAG_NEXT_CABINET):
+            raise ValueError("multi-volume cabinets are not supported")
+
+        for _ in range(folders_count):
+            self.folders.append(CabFolder(*self._read(CAB_FOLDER_FORMAT)))
+            self.fcab.seek(folder_reserve, os.SEEK_CUR)
+
+        self.fcab.seek(files_offset)
+        for _ in range(files_count):
+            size, offset, folder, _, _, attribs = self._read(CAB_FILE_FORMAT)
+            name = self._read_string().decode(
+                "utf-8" if attribs & CAB_ATTRIB_NAME_IS_UTF else "latin-1"
+            )
+            if folder >= folders_count:
+                raise ValueError(f"{name}: continued files are not supported")
+            self.files.append(CabFile(name, size, offset, folder))
+
+    def is_supported(self) -> bool:
+        """Determine whether all folders can be decompressed or not.
+
+        :return: True if all compression types are supported, else False
+        """
+        return all(
+            folder.compress_type & CAB_COMPRESS_MASK in self.SUPPORTED_COMPRESS_TYPES
+            for folder in self.folders
+        )
+
+    def _blocks(self, folder: CabFolder) -> Generator[bytes, None, None]:
+        """Decompress the data blocks of a folder.
+
+        :param folder: The folder to be decompressed
+        :return: Generator of uncompressed data blocks
+        :raise:
+            :ValueError: Unsupported compression type or corrupted data
+        """
+        compress_type = folder.compress_type & CAB_COMPRESS_MASK
+        if compress_type not in self.SUPPORTED_COMPRESS_TYPES:
+            raise ValueError(f"{compress_type}: unsupported compression type")
+
+        offset = folder.data_offset
+        window = b""
+        for _ in range(folder.blocks_count):
+            self.fcab.seek(offset)
+            _, compressed_size, uncompressed_size = self._read(CAB_DATA_FORMAT)
+            self.fcab.seek(self._data_reserve, os.SEEK_CUR)
+            data = self.fcab.read(compressed_size)
+            if len(data) != compressed_size:
+                raise ValueError("truncated data block")
+            offset = self.fcab.tell()
+
+            if compress_type == CAB_COMPRESS_MSZIP:
+                if data[:2] != MSZIP_SIGNATURE:
+                    raise ValueError("MSZIP signature not found")
+                # Each block may refer to the previous uncompressed block
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=window)
+                data = decompressor.decompress(data[2:]) + decompressor.flush()
+                window = data
+            if len(data) != uncompressed_size:
+                raise ValueError("invalid uncompressed block size")
+            yield data
+
+    def extract(self, open_file: Callable[[CabFile], IO[bytes]], close_files: bool = True) -> None:
+        """Extract all files.
+
+        :param open_file: Function returning the writable object associated to a file.
+        :param close_files: True to close the writable objects once the files are
+            fully written, else False
+        :raise:
+            :ValueError: Unsupported compression type or corrupted data
+        """
+        for index, folder in enumerate(self.folders):
+            files = sorted(
+                (file for file in self.files if file.folder == index),
+                key=lambda file: file.offset,
+            )
+            if not files:
+                continue
+            pending = iter(files)
+            current: Optional[CabFile] = next(pending)
+            fdest: Optional[IO[bytes]] = None
+            position = 0
+            try:
+                for block in self._blocks(folder):
+                    block_start = position
+                    position += len(block)
+                    while current is not None and current.offset < position:
+                        if fdest is None:
+                            fdest = open_file(current)
+                        start = max(current.offset, block_start) - block_start
+                        end = min(current.offset + current.size, position) - block_start
+                        fdest.write(memoryview(block)[start:end])
+                        if current.offset + current.size > position:
+                            break
+                        if close_files:
+                            fdest.close()
+                        fdest = None
+                        current = next(pending, None)
+                    while current is not None and current.size == 0:
+                        if close_files:
+                            open_file(current).close()
+                        current = next(pending, None)
+                    if current is None:
+                        break
+            finally:
+                if fdest is not None and close_files:
+                    fdest.close()
+            while current is not None and current.size == 0 and current.offset <= position:
+                if close_files:
+                    open_file(current).close()
+                current = next(pending, None)
+            if current is not None:
+                raise ValueError(f"{current.name}: truncated file")
+
+
+def _dos_date_time(timestamp: float) -> Tuple[int, int]:
+    """Convert a timestamp into MS-DOS date and time values.
+
+    :param timestamp: Number of seconds since the epoch
+    :return: A tuple containing the date and time values
+    """
+    tms = time.localtime(timestamp)
+    year = min(max(tms.tm_year, 1980), 2107)
+    return (
+        ((year - 1980) << 9) | (tms.tm_mon << 5) | tms.tm_mday,
+        (tms.tm_hour << 11) | (tms.tm_min << 5) | (tms.tm_sec // 2),
+    )
+
+
+def _write_mszip(
+    fsrc: IO[bytes],
+    fdest: IO[bytes],
+    file_name: str,
+    timestamp: float,
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> None:
+    """Write a single file cabinet with a MSZIP folder.
+
+    Input file is read and compressed by blocks, so it is never fully loaded into memory.
+    Fields depending on the compressed size are updated once all blocks are written.
+
+    :param fsrc: File object to the input file
+    :param fdest: File object to the output cabinet file
+    :param file_name: The file name to be stored
+    :param timestamp: The input file modification time
+    :param level: The deflate compression level
+    :raise:
+        :struct.error: The input file is too big
+    """
+    try:
+        name = file_name.encode("ascii")
+        attribs = CAB_ATTRIB_ARCHIVE
+    except UnicodeEncodeError:
+        name = file_name.encode("utf-8")
+        attribs = CAB_ATTRIB_ARCHIVE | CAB_ATTRIB_NAME_IS_UTF
+
+    header_size = struct.calcsize(CAB_HEADER_FORMAT)
+    folder_size = struct.calcsize(CAB_FOLDER_FORMAT)
+    data_start = header_size + folder_size + struct.calcsize(CAB_FILE_FORMAT) + len(name) + 1
+
+    # Reserve space for the headers
+    fdest.write(b"\0" * data_start)
+
+    blocks_count = 0
+    file_size = 0
+    while True:
+        block = fsrc.read(CAB_BLOCK_SIZE)
+        if not block:
+            break
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        data = MSZIP_SIGNATURE + compressor.compress(block) + compressor.flush()
+        # Checksum is optional, so let it to 0
+        fdest.write(struct.pack(CAB_DATA_FORMAT, 0, len(data), len(block)))
+        fdest.write(data)
+        blocks_count += 1
+        file_size += len(block)
+
+    cab_size = fdest.tell()
+    date, dos_time = _dos_date_time(timestamp)
+    fdest.seek(0)
+    fdest.write(
+        struct.pack(
+            CAB_HEADER_FORMAT,
+            CAB_SIGNATURE,
+            0,
+            cab_size,
+            0,
+            header_size + folder_size,
+            0,
+            CAB_VERSION[0],
+            CAB_VERSION[1],
+            1,  # cFolders
+            1,  # cFiles
+            0,  # flags
+            0,  # setID
+            0,  # iCabinet
+        )
+    )
+    fdest.write(struct.pack(CAB_FOLDER_FORMAT, data_start, blocks_count, CAB_COMPRESS_MSZIP))
+    fdest.write(struct.pack(CAB_FILE_FORMAT, file_size, 0, 0, date, dos_time, attribs))
+    fdest.write(name + b"\0")
+
+
+def _compress_mszip(
+    src_path: PathLike, dest_path: PathLike, level: int = zlib.Z_DEFAULT_COMPRESSION
+) -> None:
+    """Compress an input file using built-in MSZIP cabinet writer.
+
+    :param src_path: Path to the input file to be compressed
+    :param dest_path: Path to the output file
+    :param level: The deflate compression level from 1 (fastest) to 9 (smallest),
+        or -1 for the default compromise
+    :raise:
+        :CabCompressionError: Failed to compress the input file
+    """
+    try:
+        with open(src_path, "rb") as fsrc, open(dest_path, "wb") as fdest:
+            _write_mszip(
+                fsrc,
+                fdest,
+                os.path.basename(os.fspath(src_path)),
+                os.fstat(fsrc.fileno()).st_mtime,
+                level,
+            )
+    except (OSError, struct.error, zlib.error) as exc:
+        # Don't keep an incomplete cabinet file
+        try:
+            os.unlink(dest_path)
+        except OSError:
+            pass
+        raise exceptions.CabCompressionError(f"{src_path}: {exc}") from exc
+
+
+def decompress_to(src_path: PathLike, fdest: IO[bytes]) -> str:
+    """Decompress the single file of a cabinet to a writable object.
+
+    :param src_path: Path to the cabinet file
+    :param fdest: The writable object receiving the file content
+    :return: The name of the file stored in the cabinet
+    :raise:
+        :CabCompressionError: Failed to decompress the cabinet file
+    """
+    try:
+        with open(src_path, "rb") as fcab:
+            reader = CabReader(fcab)
+            if len(reader.files) != 1:
+                raise ValueError(f"{len(reader.files)} files found instead of 1")
+            reader.extract(lambda _: fdest, close_files=False)
+            return reader.files[0].name
+    except (OSError, struct.error, ValueError, zlib.error) as exc:
+        raise exceptions.CabCompressionError(f"{src_path}: {exc}") from exc
+
+
+def _decompress_cab(src_path: PathLike, dest_dir: PathLike) -> None:
+    """Decompress an input file using built-in cabinet reader.
+
+    Cabinets using an unsupported compression type (ex: LZX) are decompressed
+    with the external utility if available.
+
+    :param src_path: Path to the input file to be decompressed
+    :param dest_dir: Path to the output directory
+    :raise:
+        :CabCompressionError: Failed to decompress the input file
+    """
+    try:
+        with open(src_path, "rb") as fcab:
+            reader = CabReader(fcab)
+            if not reader.is_supported():
+                if _external_decompress is None:
+                    raise ValueError("unsupported compression type")
+                fcab.close()
+                _external_decompress(src_path, dest_dir)
+                return
+
+            def _open_file(file: CabFile) -> IO[bytes]:
+                # Never write outside of the output directory
+                name = ntpath.basename(file.name.replace("/", "\\"))
+                return open(  # pylint: disable=consider-using-with
+                    os.path.join(dest_dir, name), "wb", buffering=CAB_WRITE_BUFFER_SIZE
+                )
+
+            reader.extract(_open_file)
+    except (OSError, struct.error, ValueError, zlib.error) as exc:
+        raise exceptions.CabCompressionError(f"{src_path}: {exc}") from exc
 
 
 def _compress_makecab(src_path: PathLike, dest_path: PathLike) -> None:
@@ -102,12 +532,12 @@ def _decompress_gcab(src_path: PathLike, dest_dir: PathLike) -> None:
             raise exceptions.CabCompressionError(f"{out.decode('utf-8')}")
 
 
+compress = _compress_mszip
+decompress = _decompress_cab
+
 if sys.platform == "windows":
-    if util.which("makecab") is not None:
-        compress = _compress_makecab
     if util.which("expand") is not None:
-        decompress = _decompress_expand
+        _external_decompress = _decompress_expand
 else:
     if util.which("gcab") is not None:
-        compress = _compress_gcab
-        decompress = _decompress_gcab
+        _external_decompress = _decompress_gcab
@@ -0,0 +1,240 @@
+""" Store files using links or kernel-assisted copies when possible.
+"""
+
+import errno
+import os
+import shutil
+from enum import Enum
+
+from pdbstore.exceptions import CopyFileError
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.typing import PathLike
+
+__all__ = ["LinkMode", "copy_file", "link_file"]
+
+# FICLONE ioctl request number (see linux/fs.h)
+FICLONE = 0x40049409
+
+# Maximum number of bytes copied by a single system call
+COPY_CHUNK_SIZE = 1024 * 1024 * 1024
+
+# Size of the buffer used when copying files from user space
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Errors meaning that the requested method is not supported between both files
+_UNSUPPORTED_ERRORS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EMLINK,
+    errno.EINVAL,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.ENOSYS,
+    errno.EBADF,
+}
+
+
+class LinkMode(Enum):
+    """List of methods used to store a file already present on the disk."""
+
+    AUTO = "auto"
+    """ Use the first supported method from hard link, reflink and copy"""
+    HARD = "hard"
+    """ Create a hard link, or copy the file if not supported"""
+    REFLINK = "reflink"
+    """ Share the file content (copy-on-write), or copy the file if not supported"""
+    COPY = "copy"
+    """ Copy the file content"""
+
+
+def _hard_link(src_path: PathLike, dest_path: PathLike) -> None:
+    """Create a hard link
+
+    :param src_path: Path to the existing file
+    :param dest_path: Path to the new file
+    :raise:
+        :OSError: Failed to create the hard link
+    """
+    os.link(src_path, dest_path)
+
+
+def _reflink(src_path: PathLike, dest_path: PathLike) -> None:
+    """Clone a file content using FICLONE ioctl
+
+    :param src_path: Path to the existing file
+    :param dest_path: Path to the new file
+    :raise:
+        :OSError: The file system doesn't support cloning or failed to clone the file
+    """
+    try:
+        import fcntl  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:  # pragma: no cover
+        raise OSError(errno.ENOTSUP, "reflink not supported") from exc
+
+    with open(src_path, "rb") as fsrc, open(dest_path, "wb") as fdest:
+        try:
+            fcntl.ioctl(fdest.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdest.close()
+            os.unlink(dest_path)
+            raise
+    shutil.copymode(src_path, dest_path)
+
+
+def _copy_file_range(fdin: int, fdout: int, offset: int, size: int) -> int:
+    """Copy data between two files using copy_file_range system call
+
+    :param fdin: The input file descriptor
+    :param fdout: The output file descriptor
+    :param offset: Offset of the first byte to be copied, in both files
+    :param size: The input file size
+    :return: Offset of the first byte not copied. If the system call fails after
+        copying some data, the remaining data are left to the caller.
+    :raise:
+        :OSError: Failed to copy the first byte
+    """
+    start = offset
+    while offset < size:
+        try:
+            count = os.copy_file_range(
+                fdin, fdout, min(COPY_CHUNK_SIZE, size - offset), offset, offset
+            )
+        except OSError as exc:
+            if offset == start:
+                raise
+            PDBStoreOutput().trace(f"copy_file_range failed at offset {offset} ({exc})")
+            break
+        if count == 0:
+            break
+        offset += count
+    return offset
+
+
+def _sendfile(fdin: int, fdout: int, offset: int, size: int) -> int:
+    """Copy data between two files using sendfile system call
+
+    :param fdin: The input file descriptor
+    :param fdout: The output file descriptor
+    :param offset: Offset of the first byte to be copied, in both files
+    :param size: The input file size
+    :return: Offset of the first byte not copied. If the system call fails after
+        copying some data, the remaining data are left to the caller.
+    :raise:
+        :OSError: Failed to copy the first byte
+    """
+    start = offset
+    # sendfile writes from the current position of the output file
+    os.lseek(fdout, offset, os.SEEK_SET)
+    while offset < size:
+        try:
+            count = os.sendfile(fdout, fdin, offset, min(COPY_CHUNK_SIZE, size - offset))
+        except OSError as exc:
+            if offset == start:
+                raise
+            PDBStoreOutput().trace(f"sendfile failed at offset {offset} ({exc})")
+            break
+        if count == 0:
+            break
+        offset += count
+    return offset
+
+
+def copy_file(src_path: PathLike, dest_path: PathLike, data_only: bool = True) -> None:
+    """Copy a file content, letting the kernel move data if possible.
+
+    ``copy_file_range`` is used first, then ``sendfile``. If none of them is
+    supported, such as on Windows, data are copied from user space using large
+    buffers. Each method carries on from the data already copied by the previous
+    one.
+
+    :param src_path: Path to the existing file
+    :param dest_path: Path to the new file, overwritten if it already exists
+    :param data_only: True to only copy the file content, False to also copy the
+        permission bits
+    :raise:
+        :OSError: Failed to copy the file
+    """
+    with open(src_path, "rb") as fsrc, open(dest_path, "wb") as fdest:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+        for syscall in (
+            _copy_file_range if hasattr(os, "copy_file_range") else None,
+            _sendfile if hasattr(os, "sendfile") else None,
+        ):
+            if syscall is None or copied >= size:
+                continue
+            try:
+                copied = syscall(fsrc.fileno(), fdest.fileno(), copied, size)
+            except OSError as exc:
+                if exc.errno not in _UNSUPPORTED_ERRORS:
+                    raise
+                PDBStoreOutput().trace(f"{src_path}: {syscall.__name__} failed ({exc})")
+        if copied < size:
+            # Copy remaining data, if any, from user space
+            fsrc.seek(copied)
+            fdest.seek(copied)
+            shutil.copyfileobj(fsrc, fdest, COPY_BUFFER_SIZE)
+    if not data_only:
+        shutil.copymode(src_path, dest_path)
+
+
+def _copy(src_path: PathLike, dest_path: PathLike) -> None:
+    """Copy a file content and its permission bits
+
+    :param src_path: Path to the existing file
+    :param dest_path: Path to the new file
+    :raise:
+        :OSError: Failed to copy the file
+    """
+    copy_file(src_path, dest_path, False)
+
+
+_METHODS = {
+    LinkMode.HARD: _hard_link,
+    LinkMode.REFLINK: _reflink,
+    LinkMode.COPY: _copy,
+}
+
+_CANDIDATES = {
+    LinkMode.AUTO: [LinkMode.HARD, LinkMode.REFLINK, LinkMode.COPY],
+    LinkMode.HARD: [LinkMode.HARD, LinkMode.COPY],
+    LinkMode.REFLINK: [LinkMode.REFLINK, LinkMode.COPY],
+    LinkMode.COPY: [LinkMode.COPY],
+}
+
+
+def link_file(src_path: PathLike, dest_path: PathLike, mode: LinkMode = LinkMode.COPY) -> LinkMode:
+    """Store a file under a new path, sharing its content if possible.
+
+    Unsupported methods, such as hard links between two file systems, fall back to
+    the next method, up to a full copy. An existing destination file is only
+    replaced once the new file is complete, so a file shared with another store is
+    never modified.
+
+    :param src_path: Path to the existing file
+    :param dest_path: Path to the new file
+    :param mode: The requested method
+    :return: The method which was used
+    :raise:
+        :CopyFileError: Failed to store the file
+    """
+    tmp_path = f"{os.fspath(dest_path)}.tmp{os.getpid()}"
+    for method in _CANDIDATES[mode]:
+        try:
+            if os.path.lexists(tmp_path):
+                os.unlink(tmp_path)
+            _METHODS[method](src_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return method
+        except OSError as exc:
+            if method != LinkMode.COPY and exc.errno in _UNSUPPORTED_ERRORS:
+                PDBStoreOutput().debug(f"{src_path}: {method.value} not supported ({exc})")
+                continue
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise CopyFileError(src_path, dest_path) from exc
+    raise CopyFileError(src_path, dest_path)  # pragma: no cover
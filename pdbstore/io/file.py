@@ -15,10 +15,13 @@ from pdbstore.exceptions import (
     ReadFileError,
     UnknowFileTypeError,
 )
+from pdbstore.io import hashcache
 from pdbstore.io import pdbfile as pdb
+from pdbstore.io import peheader
 from pdbstore.io import portablepdbfile as portablepdb
+from pdbstore.io.file_type import FileType
 from pdbstore.io.output import PDBStoreOutput
-from pdbstore.typing import Any, List, Optional, PathLike, Tuple, Union
+from pdbstore.typing import Any, Generator, List, Optional, PathLike, Tuple, Union
 
 
 def read_file(fname: PathLike, mode: str = "rb", encoding: Optional[str] = None) -> Any:
@@ -57,6 +60,26 @@ def read_text_file(fname: PathLike, splitlines: Optional[bool] = False) -> Any:
     return read_file(fname, "rt", "utf-8")
 
 
+# Size of the buffer used to read text files line by line
+TEXT_FILE_BUFFER_SIZE = 1024 * 1024
+
+
+def iter_text_file(fname: PathLike) -> Generator[str, None, None]:
+    """Iterate over the lines of a text file without loading it into memory
+
+    :param fname: Path to the text file to be read
+    :return: A generator of lines without their end of line characters
+    :raise:
+        :ReadFileError: An errors occurs when reading the file
+    """
+    try:
+        with open(fname, mode="rt", encoding="utf-8", buffering=TEXT_FILE_BUFFER_SIZE) as fpt:
+            for line in fpt:
+                yield line[:-1] if line[-1:] == "\n" else line
+    except OSError as exc:
+        raise ReadFileError(fname) from exc
+
+
 def read_binary_file(fname: PathLike) -> Any:
     """Read all content of a binary file
 
@@ -68,6 +91,42 @@ def read_binary_file(fname: PathLike) -> Any:
     return read_file(fname, "rb")
 
 
+# Number of bytes to be read to identify a file type
+FILE_TYPE_HEADER_SIZE = 32
+
+
+def detect_file_type(file_path: PathLike) -> Optional[FileType]:
+    """Detect the type of a file given its first bytes
+
+    This function only reads the :data:`FILE_TYPE_HEADER_SIZE` first bytes, so it
+    can be used to filter input files cheaply.
+
+    :param file_path: Path to the file
+    :return: The detected :class:`FileType <pdbstore.io.file_type.FileType>` if
+        supported, else None
+    :raise:
+        :FileNotExistsError: The specified file doesn't exists
+        :ReadFileError: An errors occurs when reading the file
+    """
+    path = util.str_to_path(file_path)
+    if not path or not path.is_file():
+        raise FileNotExistsError(file_path)
+
+    try:
+        with path.open("rb") as fpf:
+            header = fpf.read(FILE_TYPE_HEADER_SIZE)
+    except OSError as exc:
+        raise ReadFileError(file_path) from exc
+
+    if header.startswith(pdb.PDB_HEADER_SIGNATURE):
+        return FileType.PDB
+    if header.startswith(portablepdb.PDB_HEADER_SIGNATURE):
+        return FileType.PORTABLE_PDB
+    if header.startswith(peheader.PE_DOS_SIGNATURE):
+        return FileType.PE
+    return None
+
+
 def compute_hash_key(file_path: PathLike) -> Union[str, None]:
     """Compute hash key given a file path
 
@@ -82,42 +141,75 @@ def compute_hash_key(file_path: PathLike) -> Union[str, None]:
             raise FileNotExistsError(file_path)
         return None
 
-    # Try to consider it as pe file
-    try:
-        # pylint: disable=no-member
-        pefile = pe.PE(file_path, fast_load=True)
-        return (
-            f"{pefile.FILE_HEADER.TimeDateStamp:x}" f"{pefile.OPTIONAL_HEADER.SizeOfImage:x}"
-        ).upper()
-    except pe.PEFormatError:
-        pass
+    cache = hashcache.get_active()
+    if cache is not None:
+        hash_key = cache.get_hash_key(file_path)
+        if hash_key:
+            return hash_key
+
+    hash_key = _compute_hash_key(file_path)
+    if cache is not None:
+        cache.set_hash_key(file_path, hash_key)
+    return hash_key
+
+
+def _compute_hash_key(file_path: PathLike) -> str:
+    """Compute hash key by parsing the file
 
-    # Try to consider it as pdb file
+    :param file_path: Path to the file
+    :return: The computed hash key
+    :raise:
+        :UnknowFileTypeError: Unsupported file type
+    """
+    file_type = detect_file_type(file_path)
     try:
-        pdbfile = pdb.PDB(file_path)
-        age_field = ""
-        if pdbfile.age:
-            age_field = f"{pdbfile.age:x}"
-        return f"{pdbfile.guid}{age_field}".upper()
-    except PDBSignatureNotFoundError:
-        pass
-    except ParseFileError:
+        if file_type == FileType.PE:
+            return _compute_pe_hash_key(file_path)
+
+        if file_type == FileType.PDB:
+            pdbfile = pdb.PDB(file_path)
+            age_field = ""
+            if pdbfile.age:
+                age_field = f"{pdbfile.age:x}"
+            return f"{pdbfile.guid}{age_field}".upper()
+
+        if file_type == FileType.PORTABLE_PDB:
+            ppdbfile = portablepdb.PortablePDB(file_path)
+            age_field = ""
+            if ppdbfile.age:
+                age_field = f"{ppdbfile.age:x}"
+            return f"{ppdbfile.guid}{age_field}".upper()
+    except (PDBSignatureNotFoundError, InvalidPEFile, ParseFileError):
         pass
 
-    # Try to consider it as pdb file
+    # Unsupported file
+    raise UnknowFileTypeError(file_path)
+
+
+def _compute_pe_hash_key(file_path: PathLike) -> str:
+    """Compute hash key of a pe file
+
+    :param file_path: Path to the pe file
+    :return: The computed hash key
+    :raise:
+        :InvalidPEFile: Invalid pe file
+    """
+    # Read the headers only
     try:
-        ppdbfile = portablepdb.PortablePDB(file_path)
-        age_field = ""
-        if ppdbfile.age:
-            age_field = f"{ppdbfile.age:x}"
-        return f"{ppdbfile.guid}{age_field}".upper()
-    except PDBSignatureNotFoundError:
-        pass
+        header = peheader.PEHeader(file_path)
+        return f"{header.timestamp:x}{header.size_of_image:x}".upper()
     except ParseFileError:
         pass
 
-    # Unsupported file
-    raise UnknowFileTypeError(file_path)
+    # Malformed headers, so let pefile decide
+    try:
+        # pylint: disable=no-member
+        pefile = pe.PE(file_path, fast_load=True)
+        return (
+            f"{pefile.FILE_HEADER.TimeDateStamp:x}" f"{pefile.OPTIONAL_HEADER.SizeOfImage:x}"
+        ).upper()
+    except pe.PEFormatError as pef:
+        raise InvalidPEFile(file_path) from pef
 
 
 def extract_dbg_info(file_path: PathLike) -> Optional[Tuple[str, str]]:
@@ -141,7 +233,52 @@ def extract_dbg_info(file_path: PathLike) -> Optional[Tuple[str, str]]:
             raise FileNotExistsError(file_path)
         return None
 
-    # Try to consider it as pe file
+    cache = hashcache.get_active()
+    if cache is not None:
+        dbg_info = cache.get_dbg_info(file_path)
+        if dbg_info:
+            return dbg_info
+
+    dbg_info = _extract_dbg_info(file_path)
+    if cache is not None and dbg_info:
+        cache.set_dbg_info(file_path, dbg_info)
+    return dbg_info
+
+
+def _extract_dbg_info(file_path: PathLike) -> Optional[Tuple[str, str]]:
+    """Extract debugging information by parsing the pe file.
+
+    :param file_path: Path to the pefile
+    :return: A tuple containing debugging informations if available, else None
+    :raise:
+        :InvalidPEFile: Invalid pe file (ex: exe or dll)
+    """
+    # Try to consider it as pe file by reading the headers and the CodeView record only
+    try:
+        header = peheader.PEHeader(file_path, debug_info=True)
+    except ParseFileError:
+        # Malformed headers, so let pefile decide
+        return _extract_dbg_info_pefile(file_path)
+
+    if header.codeview_signature is None:
+        PDBStoreOutput().warning(f"{os.path.basename(file_path)} doesn't have symbol information")
+        return None
+
+    if header.codeview_signature != b"RSDS":
+        PDBStoreOutput().error(f"{header.codeview_signature!r} unsupported symbol type")
+        return None
+
+    return header.debug_info
+
+
+def _extract_dbg_info_pefile(file_path: PathLike) -> Optional[Tuple[str, str]]:
+    """Extract debugging information from a pe file using :mod:`pefile` module.
+
+    :param file_path: Path to the pefile
+    :return: A tuple containing debugging informations if available, else None
+    :raise:
+        :InvalidPEFile: Invalid pe file (ex: exe or dll)
+    """
     try:
         # pylint: disable=no-member
         pefile = pe.PE(file_path, fast_load=True)
@@ -0,0 +1,17 @@
+""" Define list of supported file types.
+"""
+
+from enum import Enum
+
+__all__ = ["FileType"]
+
+
+class FileType(Enum):
+    """List of file types supported by the symbol store."""
+
+    PE = "pe"
+    """Portable Executable file (ex: exe or dll)"""
+    PDB = "pdb"
+    """ Native PDB file (MSF 7.00 format)"""
+    PORTABLE_PDB = "portable-pdb"
+    """ Portable PDB file (ECMA-335 metadata format)"""
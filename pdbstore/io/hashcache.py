@@ -0,0 +1,254 @@
+""" Manage the optional persistent file identity cache.
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from pdbstore import util
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.typing import Any, Optional, PathLike, Tuple
+
+__all__ = ["HashCache", "activate", "deactivate", "get_active"]
+
+# Separator between pdb file name and identifier for debugging information
+_DBG_INFO_SEPARATOR = "\\"
+
+
+class HashCache:
+    """Persistent cache of file identities.
+
+    Each file is identified by its real path, size, modification time and inode
+    number. Only the most recently used entries are preserved, so the cache file
+    doesn't grow indefinitely.
+
+    The cache can be shared between several threads.
+    """
+
+    # Version of the database layout
+    SCHEMA_VERSION: str = "1"
+
+    # Default maximum number of cached files
+    DEFAULT_MAX_ENTRIES: int = 100000
+
+    def __init__(self, file_path: PathLike, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Open or create a cache file
+
+        :param file_path: Path to the cache file
+        :param max_entries: Maximum number of cached files
+        :raise:
+            :sqlite3.Error: Failed to open the cache file
+        """
+        self.file_path: Path = util.str_to_path(file_path)
+        self.max_entries: int = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._clock: int = 0
+        self._count: int = 0
+
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection: Optional[sqlite3.Connection] = sqlite3.connect(
+            os.fspath(self.file_path), check_same_thread=False
+        )
+        self._connection.execute("PRAGMA synchronous = OFF")
+        with self._connection:
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ino INTEGER,
+                    hash_key TEXT, dbg_info TEXT, last_used INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS files_last_used ON files (last_used);
+                """
+            )
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if not row or row[0] != self.SCHEMA_VERSION:
+                self._connection.execute("DELETE FROM files")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (self.SCHEMA_VERSION,),
+                )
+            row = self._connection.execute("SELECT MAX(last_used), COUNT(*) FROM files").fetchone()
+            self._clock = int(row[0] or 0)
+            self._count = int(row[1])
+
+    @staticmethod
+    def _identity(file_path: PathLike) -> Optional[Tuple[str, int, int, int]]:
+        """Compute the identity of a file
+
+        :param file_path: Path to the file
+        :return: Tuple containing real path, size, modification time and inode number,
+            or None if the file cannot be accessed
+        """
+        try:
+            real_path = os.path.realpath(file_path)
+            stat_info = os.stat(real_path)
+        except (OSError, ValueError):
+            return None
+        return real_path, stat_info.st_size, stat_info.st_mtime_ns, stat_info.st_ino
+
+    def _get(self, file_path: PathLike, column: str) -> Optional[str]:
+        """Retrieve a cached value
+
+        :param file_path: Path to the file
+        :param column: The required column name
+        :return: The cached value if the file is unchanged, else None
+        """
+        identity = self._identity(file_path)
+        if identity is None or self._connection is None:
+            return None
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    f"SELECT {column} FROM files "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND ino = ?",
+                    identity,
+                ).fetchone()
+                if not row or row[0] is None:
+                    return None
+                self._clock += 1
+                with self._connection:
+                    self._connection.execute(
+                        "UPDATE files SET last_used = ? WHERE path = ?",
+                        (self._clock, identity[0]),
+                    )
+            except sqlite3.Error as exc:
+                PDBStoreOutput().debug(f"{self.file_path}: {exc}")
+                return None
+        return str(row[0])
+
+    def _set(self, file_path: PathLike, column: str, value: str) -> None:
+        """Store a computed value
+
+        :param file_path: Path to the file
+        :param column: The column name
+        :param value: The computed value
+        """
+        identity = self._identity(file_path)
+        if identity is None or self._connection is None:
+            return
+        with self._lock:
+            self._clock += 1
+            try:
+                with self._connection:
+                    # Forget values computed for an older version of the file
+                    self._count -= self._connection.execute(
+                        "DELETE FROM files WHERE path = ? "
+                        "AND (size != ? OR mtime_ns != ? OR ino != ?)",
+                        identity,
+                    ).rowcount
+                    self._count += self._connection.execute(
+                        "INSERT OR IGNORE INTO files (path, size, mtime_ns, ino) "
+                        "VALUES (?, ?, ?, ?)",
+                        identity,
+                    ).rowcount
+                    self._connection.execute(
+                        f"UPDATE files SET {column} = ?, last_used = ? WHERE path = ?",
+                        (value, self._clock, identity[0]),
+                    )
+                    self._evict()
+            except sqlite3.Error as exc:
+                PDBStoreOutput().debug(f"{self.file_path}: {exc}")
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries if the cache is full"""
+        if self._connection is None or self._count <= self.max_entries:
+            return
+        # Free 10% of the cache at once to avoid evicting on each insertion
+        excess = self._count - self.max_entries + self.max_entries // 10
+        self._count -= self._connection.execute(
+            "DELETE FROM files WHERE path IN "
+            "(SELECT path FROM files ORDER BY last_used LIMIT ?)",
+            (excess,),
+        ).rowcount
+
+    def get_hash_key(self, file_path: PathLike) -> Optional[str]:
+        """Retrieve the cached hash key of a file
+
+        :param file_path: Path to the file
+        :return: The hash key if cached and the file is unchanged, else None
+        """
+        return self._get(file_path, "hash_key")
+
+    def set_hash_key(self, file_path: PathLike, hash_key: str) -> None:
+        """Store the hash key of a file
+
+        :param file_path: Path to the file
+        :param hash_key: The computed hash key
+        """
+        self._set(file_path, "hash_key", hash_key)
+
+    def get_dbg_info(self, file_path: PathLike) -> Optional[Tuple[str, str]]:
+        """Retrieve the cached debugging information of a pe file
+
+        :param file_path: Path to the file
+        :return: A tuple containing the pdb file name and the unique pdb file
+            identifier if cached and the file is unchanged, else None
+        """
+        value = self._get(file_path, "dbg_info")
+        if value is None:
+            return None
+        pdb_name, _, pdb_id = value.rpartition(_DBG_INFO_SEPARATOR)
+        return pdb_name, pdb_id
+
+    def set_dbg_info(self, file_path: PathLike, dbg_info: Tuple[str, str]) -> None:
+        """Store the debugging information of a pe file
+
+        :param file_path: Path to the file
+        :param dbg_info: A tuple containing the pdb file name and the unique pdb
+            file identifier
+        """
+        self._set(file_path, "dbg_info", _DBG_INFO_SEPARATOR.join(dbg_info))
+
+    def __len__(self) -> int:
+        """Retrieve the number of cached files"""
+        return self._count
+
+    def close(self) -> None:
+        """Close the cache file"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_active: Optional[HashCache] = None  # pylint: disable=invalid-name
+
+
+def activate(file_path: Optional[PathLike], **kwargs: Any) -> Optional[HashCache]:
+    """Use a cache file for all following file identifications
+
+    A previously activated cache is closed.
+
+    :param file_path: Path to the cache file. If None, no cache is used.
+    :param kwargs: Extra arguments given to :class:`HashCache`
+    :return: The activated cache if any, else None
+    """
+    global _active  # pylint: disable=global-statement
+    deactivate()
+    if not file_path:
+        return None
+    try:
+        _active = HashCache(file_path, **kwargs)
+    except (OSError, sqlite3.Error) as exc:
+        PDBStoreOutput().warning(f"{file_path}: cannot use hash cache ({exc})")
+    return _active
+
+
+def deactivate() -> None:
+    """Close the active cache if any"""
+    global _active  # pylint: disable=global-statement
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def get_active() -> Optional[HashCache]:
+    """Retrieve the active cache
+
+    :return: The active :class:`HashCache` object if any, else None
+    """
+    return _active
@@ -1,5 +1,7 @@
 import binascii
+import contextlib
 import math
+import mmap
 import os
 import struct
 
@@ -10,9 +12,21 @@ from pdbstore.exceptions import (
     PDBInvalidStreamIndexError,
     PDBSignatureNotFoundError,
 )
-from pdbstore.typing import Any, IO, Optional, PathLike, Tuple, Union
+from pdbstore.typing import (
+    Any,
+    Generator,
+    IO,
+    List,
+    Optional,
+    PathLike,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 PDB_HEADER_SIGNATURE = b"Microsoft C/C++ MSF 7.00\r\n\x1ADS\0\0\0"
+# Stream size used to mark an unused stream
+PDB_NIL_STREAM_SIZE = 0xFFFFFFFF
 PDB_STREAM_INDEX = 1
 DBI_STREAM_INDEX = 3
 
@@ -20,26 +34,43 @@ DBI_STREAM_INDEX = 3
 class RootStream:
     """A Root stream representation.
     This class provides access to api to properly extract all required information
-    from PDB stream
+    from PDB stream.
+
+    If a memory mapped view of the file is given, pages are gathered by slicing the
+    view, else by reading the file object.
     """
 
-    def __init__(self, fps: IO[Any], page_size: int, stream_size: int):
+    def __init__(
+        self,
+        fps: IO[Any],
+        page_size: int,
+        stream_size: int,
+        data: Optional[memoryview] = None,
+    ):
         """Class initialization.
 
         :param fps: File object to the previously opened file
         :param page_size: The current page size
         :param stream_size: The root stream size
+        :param data: Optional memory mapped view of the whole file
         """
         self.fps: IO[Any] = fps
+        self.data: Optional[memoryview] = data
         self.page_size: int = page_size
         self.stream_size: int = stream_size
         self.streams_count: int = 0
+        self.streams_sizes: Tuple[int, ...] = ()
+        self.streams_pages: List[Tuple[int, ...]] = []
 
         # Build the list of available streams
         self.page_indexes: Any = self._load_streams()
 
-        # Determine the total number of streams
-        self.streams_count = struct.unpack("<I", self._read(0, 4))[0]
+        # Parse the whole stream directory at once
+        self._load_directory()
+
+    def release(self) -> None:
+        """Drop the reference to the memory mapped view, so it can be closed"""
+        self.data = None
 
     def _round(self, bytes_count: int) -> int:
         """Compute the total number of pages required to store the specified
@@ -50,66 +81,91 @@ class RootStream:
         """
         return int(math.ceil(float(bytes_count) / self.page_size))
 
+    def _read_at(self, offset: int, length: int) -> Union[bytes, memoryview]:
+        """Read bytes given an absolute file offset.
+
+        :param offset: the absolute file offset where to read
+        :param length: number of bytes to read
+        :return: A view on the mapped file if available, else a bytes array
+        """
+        if self.data is not None:
+            return self.data[offset : offset + length]
+        self.fps.seek(offset)
+        content: bytes = self.fps.read(length)
+        return content
+
+    def _read_pages(self, pages: Sequence[int], start_byte: int, length: int) -> Any:
+        """Gather bytes from a list of pages.
+
+        :param pages: the page numbers to read, in order
+        :param start_byte: the number of bytes to skip from the first page
+        :param length: number of bytes to read
+        :return: A bytes-like object. No copy is made if the bytes are located
+            in a single page of the mapped file.
+        """
+        chunks = []
+        for page in pages:
+            if length <= 0:
+                break
+            partial_size = min(length, self.page_size - start_byte)
+            chunks.append(self._read_at(page * self.page_size + start_byte, partial_size))
+            length -= partial_size
+            start_byte = 0
+        if len(chunks) == 1:
+            return chunks[0]
+        return b"".join(chunks)
+
     def _load_streams(self) -> Tuple[Any, ...]:
         """Build the list of page index for each available streams"""
         num_pages = self._round(self.stream_size)
 
-        # Move to the beginning of the root stream
-        # PDB Version 7 has 5 fields of 4 bytes, so we skip it to be sure
-        # that we are on the page number list byte
-        self.fps.seek(len(PDB_HEADER_SIGNATURE) + 4 * 5)
-
         # 4 bytes per page number
         num_root_index_pages = self._round(num_pages * 4)
 
         # Read the page number list
-        # pylint: disable=consider-using-f-string
-        page_number_list = struct.unpack(
-            "<%sI" % num_root_index_pages,
-            self.fps.read(4 * num_root_index_pages),
+        # PDB Version 7 has 5 fields of 4 bytes, so we skip it to be sure
+        # that we are on the page number list byte
+        page_number_list = struct.unpack_from(
+            f"<{num_root_index_pages}I",
+            self._read_at(len(PDB_HEADER_SIGNATURE) + 4 * 5, 4 * num_root_index_pages),
         )
 
-        page_list_data = b""
-        for index in page_number_list:
-            self.fps.seek(index * self.page_size)
-            page_list_data += self.fps.read(self.page_size)
+        page_list_data = self._read_pages(page_number_list, 0, num_pages * 4)
+        return struct.unpack_from(f"<{num_pages}I", page_list_data)
 
-        page_list_fmt = "<" + (f"{num_pages}I")
-        return struct.unpack(page_list_fmt, page_list_data[: num_pages * 4])
+    def _load_directory(self) -> None:
+        """Parse the stream directory to build the size and the page indexes of
+        each available stream.
 
-    def _seek(self, page_index: int, offset: int) -> None:
-        """Move to a specific page.
-
-        :param page_index: the required page zero-based index
-        :param offset: the number of bytes to offset from the beginning of the page
+        The directory is read in a single pass, so looking up a stream doesn't
+        require any additional read operation.
         """
-        self.fps.seek(self.page_indexes[page_index] * self.page_size + offset)
+        directory = self._read(0, self.stream_size)
+
+        # Determine the total number of streams
+        self.streams_count = struct.unpack_from("<I", directory, 0)[0]
+
+        # 4 : number of streams
+        # 4 * num_streams: size for each stream
+        self.streams_sizes = struct.unpack_from(f"<{self.streams_count}I", directory, 4)
+
+        page_offset = 4 + 4 * self.streams_count
+        self.streams_pages = []
+        for stream_size in self.streams_sizes:
+            num_pages = 0 if stream_size == PDB_NIL_STREAM_SIZE else self._round(stream_size)
+            self.streams_pages.append(struct.unpack_from(f"<{num_pages}I", directory, page_offset))
+            page_offset += num_pages * 4
 
     def _read(self, start: int, length: int) -> Any:
-        """Read bytes given a position and length.
+        """Read bytes from the root stream given a position and length.
 
-        :param start: the global offset where to read
+        :param start: the offset from the beginning of the root stream
         :param length: number of bytes to read
-        :return: A bytes array
+        :return: A bytes-like object
         """
-        # Compute page index and offset value
         start_page = start // self.page_size
         start_byte = start % self.page_size
-
-        # Move to the required position
-        self._seek(start_page, start_byte)
-
-        # Read the required bytes
-        partial_size = min(length, self.page_size - start_byte)
-        result = self.fps.read(partial_size)
-        length -= partial_size
-        while length > 0:
-            start_page += 1
-            self._seek(start_page, 0)
-            partial_size = min(self.page_size, length)
-            result += self.fps.read(partial_size)
-            length -= partial_size
-        return result
+        return self._read_pages(self.page_indexes[start_page:], start_byte, length)
 
     def _get_stream_size(self, stream_index: int) -> int:
         """Get the size in bytes for a specific stream
@@ -122,11 +178,9 @@ class RootStream:
         if stream_index >= self.streams_count:
             raise PDBInvalidStreamIndexError(stream_index)
 
-        # 4 : number of streams
-        # 4 * num_streams: size for each stream
-        return int(struct.unpack("<I", self._read(stream_index * 4 + 4, 4))[0])
+        return self.streams_sizes[stream_index]
 
-    def _get_stream_page_indexes(self, stream_index: int) -> Any:
+    def _get_stream_page_indexes(self, stream_index: int) -> Tuple[int, ...]:
         """Get stream-s page indexes given by stream index
 
         :param stream_index: The stream zero-based index
@@ -137,16 +191,7 @@ class RootStream:
         if stream_index >= self.streams_count:
             raise PDBInvalidStreamIndexError(stream_index)
 
-        # 4 : number of streams
-        # 4 * num_streams: size for each stream
-        page_offset = 4 + 4 * self.streams_count
-
-        for index in range(stream_index):
-            page_offset += self._round(self._get_stream_size(index)) * 4
-
-        num_pages = self._round(self._get_stream_size(stream_index))
-
-        return struct.unpack(f"<{num_pages}I", self._read(page_offset, 4 * num_pages))
+        return self.streams_pages[stream_index]
 
     def parse_guid(self) -> str:
         """Extract GUID from PDB stream (stream 1)
@@ -154,11 +199,10 @@ class RootStream:
         :return: The parsed GUID as a string
         """
         pdb_stream_pages = self._get_stream_page_indexes(PDB_STREAM_INDEX)
-        self.fps.seek(pdb_stream_pages[0] * self.page_size + 3 * 4)
-        pdb_stream_data = self.fps.read(4 + 2 * 2 + 8)
+        pdb_stream_data = self._read_at(pdb_stream_pages[0] * self.page_size + 3 * 4, 4 + 2 * 2 + 8)
 
         # pylint: disable=consider-using-f-string
-        guid_data = struct.unpack("<IHH8s", pdb_stream_data)
+        guid_data = struct.unpack_from("<IHH8s", pdb_stream_data)
         return "%.8X%.4X%.4X%s" % (
             guid_data[0],
             guid_data[1],
@@ -175,14 +219,39 @@ class RootStream:
         if len(dbi_stream_pages) <= 0:
             return None
 
-        self.fps.seek(dbi_stream_pages[0] * self.page_size + 2 * 4)
-        dbi_stream_data = self.fps.read(4)
+        dbi_stream_data = self._read_at(dbi_stream_pages[0] * self.page_size + 2 * 4, 4)
 
-        age: Any = struct.unpack("<I", dbi_stream_data)
+        age: Any = struct.unpack_from("<I", dbi_stream_data)
 
         return int(age[0])
 
 
+@contextlib.contextmanager
+def _map_file(fps: IO[Any]) -> Generator[Optional[memoryview], None, None]:
+    """Map a file object into memory if supported.
+
+    :param fps: File object to the previously opened file
+    :return: A read-only view on the whole file, or None if the file object
+        cannot be mapped (ex: in-memory stream)
+    """
+    try:
+        mapping = mmap.mmap(fps.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        yield None
+        return
+
+    view = memoryview(mapping)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mapping.close()
+        except BufferError:  # pragma: no cover
+            # Some slices are still referenced, let the garbage collector close it
+            pass
+
+
 class PDB:
     """A Program Database (PDB) representation.
     This class provides access to :
@@ -216,11 +285,14 @@ class PDB:
             try:
                 # Parse header to fetch root stream information
                 page_size, _, _, root_stream_size = struct.unpack("<IIII", fppdb.read(4 * 4))
-                self._root = RootStream(fppdb, page_size, root_stream_size)
-
-                # Extract GUID and age
-                self._guid = self._root.parse_guid()
-                self._age = self._root.parse_age()
+                with _map_file(fppdb) as data:
+                    self._root = RootStream(fppdb, page_size, root_stream_size, data)
+                    try:
+                        # Extract GUID and age
+                        self._guid = self._root.parse_guid()
+                        self._age = self._root.parse_age()
+                    finally:
+                        self._root.release()
             except Exception as exf:
                 raise ParseFileError(file_path) from exf
 
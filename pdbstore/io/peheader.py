@@ -0,0 +1,264 @@
+import binascii
+import ntpath
+import struct
+
+from pdbstore import util
+from pdbstore.exceptions import FileNotExistsError, InvalidPEFile, ParseFileError
+from pdbstore.typing import Any, IO, Optional, PathLike, Tuple
+
+PE_DOS_SIGNATURE = b"MZ"
+PE_NT_SIGNATURE = b"PE\0\0"
+# Offset of e_lfanew field from the DOS header
+PE_LFANEW_OFFSET = 0x3C
+# Size of the DOS header
+PE_DOS_HEADER_SIZE = 64
+# Size of the COFF file header
+PE_FILE_HEADER_SIZE = 20
+# Offset of SizeOfImage field from the optional header (same for PE32 and PE32+)
+PE_SIZE_OF_IMAGE_OFFSET = 56
+# Optional header magic values
+PE_OPTIONAL_MAGIC_PE32 = 0x10B
+PE_OPTIONAL_MAGIC_PE32_PLUS = 0x20B
+# Offset of NumberOfRvaAndSizes field from the optional header
+PE_RVA_COUNT_OFFSET = {PE_OPTIONAL_MAGIC_PE32: 92, PE_OPTIONAL_MAGIC_PE32_PLUS: 108}
+# Index of the debug directory from the data directories
+PE_DEBUG_DIRECTORY_INDEX = 6
+# Size of a section header
+PE_SECTION_HEADER_SIZE = 40
+# Size of a debug directory entry
+PE_DEBUG_ENTRY_SIZE = 28
+# CodeView debug directory type
+PE_DEBUG_TYPE_CODEVIEW = 2
+# Size of CodeView PDB 7.0 record without the PDB file name
+PE_CV_PDB70_SIZE = 24
+
+
+class PEHeader:
+    """A minimal Portable Executable (PE) header representation.
+
+    This class only reads the DOS header, the COFF file header and the optional
+    header, so a few hundred bytes, instead of loading the whole image.
+    It provides access to:
+
+    - PE file's timestamp through ``timestamp`` data member as an integer.
+    - PE file's image size through ``size_of_image`` data member as an integer.
+
+    If requested, it also locates the CodeView entry from the debug directory
+    through the section table and provides access to:
+
+    - CodeView record signature through ``codeview_signature`` data member.
+    - PDB file's name through ``pdb_name`` data member as a string.
+    - PDB file's GUID through ``guid`` data member as a string.
+    - PDB file's age through ``age`` data member as an integer.
+    """
+
+    _timestamp: int
+    _size_of_image: int
+    _codeview_signature: Optional[bytes] = None
+    _pdb_name: Optional[str] = None
+    _guid: Optional[str] = None
+    _age: Optional[int] = None
+
+    def __init__(self, file_path: PathLike, debug_info: bool = False):
+        """Initialize PEHeader given a file path
+
+        :param file_path: Path to the pe file
+        :param debug_info: True to also read the CodeView entry, else False
+        :raise:
+            :FileNotExistsError: the specified file does not exists
+            :InvalidPEFile: the specified file is not a pe file
+            :ParseFileError: the pe headers cannot be parsed
+        """
+        pe_path = util.str_to_path(file_path)
+        if not pe_path or not pe_path.is_file():
+            raise FileNotExistsError(f"{file_path} : invalid pe file path")
+
+        with pe_path.open("rb") as fppe:
+            dos_header = fppe.read(PE_DOS_HEADER_SIZE)
+            if dos_header[:2] != PE_DOS_SIGNATURE:
+                raise InvalidPEFile(str(file_path))
+
+            try:
+                self._parse(fppe, dos_header, debug_info)
+            except Exception as exf:
+                raise ParseFileError(file_path) from exf
+
+    def _parse(self, fppe: IO[Any], dos_header: bytes, debug_info: bool) -> None:
+        """Parse COFF file header and optional header.
+
+        :param fppe: File object to the previously opened file
+        :param dos_header: The DOS header content
+        :param debug_info: True to also read the CodeView entry, else False
+        :raise:
+            :struct.error: truncated headers
+            :ValueError: invalid headers content
+        """
+        (e_lfanew,) = struct.unpack_from("<I", dos_header, PE_LFANEW_OFFSET)
+        fppe.seek(e_lfanew)
+        nt_headers = fppe.read(len(PE_NT_SIGNATURE) + PE_FILE_HEADER_SIZE)
+        if nt_headers[: len(PE_NT_SIGNATURE)] != PE_NT_SIGNATURE:
+            raise ValueError("NT headers signature not found")
+
+        # Machine, NumberOfSections, TimeDateStamp, PointerToSymbolTable,
+        # NumberOfSymbols, SizeOfOptionalHeader, Characteristics
+        _, sections_count, timestamp, _, _, optional_size, _ = struct.unpack_from(
+            "<HHIIIHH", nt_headers, len(PE_NT_SIGNATURE)
+        )
+        if optional_size < PE_SIZE_OF_IMAGE_OFFSET + 4:
+            raise ValueError(f"{optional_size} : invalid optional header size")
+
+        optional_header = fppe.read(optional_size)
+        (size_of_image,) = struct.unpack_from("<I", optional_header, PE_SIZE_OF_IMAGE_OFFSET)
+
+        self._timestamp = timestamp
+        self._size_of_image = size_of_image
+
+        if debug_info:
+            # Section table is located right after the optional header
+            fppe.seek(e_lfanew + len(nt_headers) + optional_size)
+            sections = fppe.read(sections_count * PE_SECTION_HEADER_SIZE)
+            self._parse_debug_directory(fppe, optional_header, sections)
+
+    @staticmethod
+    def _rva_to_offset(rva: int, sections: bytes) -> int:
+        """Convert a relative virtual address into a file offset.
+
+        :param rva: The relative virtual address
+        :param sections: The section table content
+        :return: The associated file offset
+        :raise:
+            :ValueError: No section contains the address
+        """
+        for offset in range(0, len(sections) - PE_SECTION_HEADER_SIZE + 1, PE_SECTION_HEADER_SIZE):
+            # VirtualSize, VirtualAddress, SizeOfRawData, PointerToRawData
+            virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from(
+                "<IIII", sections, offset + 8
+            )
+            if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+                offset_in_file: int = rva - virtual_address + raw_pointer
+                return offset_in_file
+        raise ValueError(f"{rva:#x} : address not found from section table")
+
+    def _parse_debug_directory(
+        self, fppe: IO[Any], optional_header: bytes, sections: bytes
+    ) -> None:
+        """Read CodeView entry from the debug directory.
+
+        :param fppe: File object to the previously opened file
+        :param optional_header: The optional header content
+        :param sections: The section table content
+        :raise:
+            :struct.error: truncated headers
+            :ValueError: invalid headers content
+        """
+        (magic,) = struct.unpack_from("<H", optional_header, 0)
+        if magic not in PE_RVA_COUNT_OFFSET:
+            raise ValueError(f"{magic:#x} : unknown optional header magic")
+        rva_count_offset = PE_RVA_COUNT_OFFSET[magic]
+        (rva_count,) = struct.unpack_from("<I", optional_header, rva_count_offset)
+        if rva_count <= PE_DEBUG_DIRECTORY_INDEX:
+            return  # No debug directory
+        debug_rva, debug_size = struct.unpack_from(
+            "<II", optional_header, rva_count_offset + 4 + PE_DEBUG_DIRECTORY_INDEX * 8
+        )
+        if debug_rva == 0 or debug_size == 0:
+            return  # No debug directory
+
+        fppe.seek(self._rva_to_offset(debug_rva, sections))
+        debug_entries = fppe.read(debug_size)
+        for offset in range(0, len(debug_entries) - PE_DEBUG_ENTRY_SIZE + 1, PE_DEBUG_ENTRY_SIZE):
+            # Characteristics, TimeDateStamp, MajorVersion, MinorVersion, Type,
+            # SizeOfData, AddressOfRawData, PointerToRawData
+            _, _, _, _, debug_type, data_size, _, data_pointer = struct.unpack_from(
+                "<IIHHIIII", debug_entries, offset
+            )
+            if debug_type == PE_DEBUG_TYPE_CODEVIEW:
+                fppe.seek(data_pointer)
+                self._parse_codeview(fppe.read(data_size))
+                return
+
+    def _parse_codeview(self, codeview: bytes) -> None:
+        """Parse CodeView record.
+
+        :param codeview: The CodeView record content
+        :raise:
+            :struct.error: truncated record
+        """
+        self._codeview_signature = codeview[:4]
+        if self._codeview_signature != b"RSDS":
+            return
+
+        guid_data = struct.unpack_from("<IHH8s", codeview, 4)
+        (self._age,) = struct.unpack_from("<I", codeview, 20)
+        # pylint: disable=consider-using-f-string
+        self._guid = "%.8X%.4X%.4X%s" % (
+            guid_data[0],
+            guid_data[1],
+            guid_data[2],
+            binascii.hexlify(guid_data[3]).decode("utf-8").upper(),
+        )
+
+        pdb_name = codeview[PE_CV_PDB70_SIZE:]
+        if pdb_name and pdb_name[-1] == 0x0:
+            pdb_name = pdb_name[:-1]
+        if pdb_name:
+            self._pdb_name = ntpath.basename(pdb_name.decode("utf-8"))
+
+    @property
+    def timestamp(self) -> int:
+        """Retrieve PE file's timestamp
+
+        :return: The TimeDateStamp field from the COFF file header.
+        """
+        return self._timestamp
+
+    @property
+    def size_of_image(self) -> int:
+        """Retrieve PE file's image size.
+
+        :return: The SizeOfImage field from the optional header.
+        """
+        return self._size_of_image
+
+    @property
+    def codeview_signature(self) -> Optional[bytes]:
+        """Retrieve the CodeView record signature.
+
+        :return: The CodeView record signature if a CodeView entry was found, else None.
+        """
+        return self._codeview_signature
+
+    @property
+    def pdb_name(self) -> Optional[str]:
+        """Retrieve PDB file's name from the CodeView record.
+
+        :return: The PDB file name without directory if available, else None.
+        """
+        return self._pdb_name
+
+    @property
+    def guid(self) -> Optional[str]:
+        """Retrieve PDB file's GUID from the CodeView record.
+
+        :return: A string containing the PDB file's GUID if available, else None.
+        """
+        return self._guid
+
+    @property
+    def age(self) -> Optional[int]:
+        """Retrieve PDB file's age from the CodeView record.
+
+        :return: The PDB file's age if available, else None.
+        """
+        return self._age
+
+    @property
+    def debug_info(self) -> Optional[Tuple[str, str]]:
+        """Retrieve debugging information from the CodeView record.
+
+        :return: A tuple containing the pdb file name and the unique pdb file
+            identifier if available, else None.
+        """
+        if self._pdb_name is None or self._guid is None or self._age is None:
+            return None
+        return self._pdb_name, f"{self._guid}{self._age:X}"
@@ -7,12 +7,14 @@ from pdbstore.exceptions import (
     ParseFileError,
     PDBSignatureNotFoundError,
 )
-from pdbstore.typing import Any, IO, List, Optional, PathLike, Tuple
+from pdbstore.typing import Any, Dict, IO, Optional, PathLike, Tuple
 
 PDB_HEADER_SIGNATURE = b"BSJB"
 PDB_STREAM_INDEX = 1
 DBI_STREAM_INDEX = 3
 STREAM_PDB = "#Pdb"
+# Number of bytes read at once to parse the metadata root header
+HEADER_READ_SIZE = 1024
 
 
 class StreamHeader:
@@ -58,36 +60,74 @@ class RootStream:
         """
         self.fps: IO[Any] = fps
         self.versions: Tuple[int, int] = (0, 0)
+        self.header: bytes = b""
 
         # Build the list of available streams
-        self.streams: List[StreamHeader] = self._load_streams()
+        self.streams: Dict[str, StreamHeader] = self._load_streams()
 
-    def _load_streams(self) -> List[StreamHeader]:
-        """Build the list of available streams"""
+    def _read_header(self, length: int) -> None:
+        """Make sure that the metadata root header buffer contains at least
+        the specified number of bytes.
 
-        self.fps.seek(0)
+        :param length: The required number of bytes from beginning of file
+        :raise:
+            :struct.error: the file is too small
+        """
+        if length <= len(self.header):
+            return
+        self.fps.seek(len(self.header))
+        self.header += self.fps.read(max(length - len(self.header), HEADER_READ_SIZE))
+        if length > len(self.header):
+            raise struct.error(f"{length} : metadata root header truncated")
+
+    def _load_streams(self) -> Dict[str, StreamHeader]:
+        """Build the list of available streams given by their names"""
+
+        # Read the whole metadata root header at once in most cases
+        offset = 4 + 2 + 2 + 4 + 4
+        self._read_header(offset)
 
         # We assume that magic key is already checked
-        _, major, minor, _, version_len = struct.unpack("<IHHII", self.fps.read(4 + 2 + 2 + 4 + 4))
+        _, major, minor, _, version_len = struct.unpack_from("<IHHII", self.header, 0)
         self.versions = (major, minor)
-        self.version_name = struct.unpack(f"<{version_len}c", self.fps.read(version_len))
-        _, stream_count = struct.unpack("<HH", self.fps.read(2 + 2))
-        streams: List[StreamHeader] = []
+        self._read_header(offset + version_len + 2 + 2)
+        self.version_name = struct.unpack_from(f"<{version_len}c", self.header, offset)
+        offset += version_len
+        _, stream_count = struct.unpack_from("<HH", self.header, offset)
+        offset += 2 + 2
+
+        streams: Dict[str, StreamHeader] = {}
         for _ in range(0, stream_count):
-            offset, size = struct.unpack("<II", self.fps.read(4 + 4))
-            chars: Any = []
-            while True:
-                utf8_ch = struct.unpack("<BBBB", self.fps.read(4))
-                if utf8_ch[3] == 0:
-                    name = bytes(chars).decode("utf-8")
-                    streams.append(StreamHeader(name, offset, size))
-                    break
-                chars += utf8_ch
+            self._read_header(offset + 4 + 4)
+            stream_offset, size = struct.unpack_from("<II", self.header, offset)
+            offset += 4 + 4
+
+            # Name is null terminated and padded to the next 4-byte boundary
+            end = self.header.find(b"\0", offset)
+            while end < 0:
+                self._read_header(len(self.header) + 1)
+                end = self.header.find(b"\0", offset)
+            name = self.header[offset:end].decode("utf-8")
+            streams[name] = StreamHeader(name, stream_offset, size)
+            offset = (end + 4) & ~3
         return streams
 
     def _get_stream_by_name(self, name: str) -> StreamHeader:
         """Retrieve a stream given by its name"""
-        return list(filter(lambda s: s.name == name, self.streams))[0]
+        return self.streams[name]
+
+    def _read(self, offset: int, length: int) -> bytes:
+        """Read bytes given an absolute file offset.
+
+        :param offset: the absolute file offset where to read
+        :param length: number of bytes to read
+        :return: A bytes array
+        """
+        if offset + length <= len(self.header):
+            return self.header[offset : offset + length]
+        self.fps.seek(offset)
+        content: bytes = self.fps.read(length)
+        return content
 
     def parse_guid(self) -> str:
         """Extract GUID from #Pdb stream
@@ -95,10 +135,9 @@ class RootStream:
         :return: The parsed GUID as a string
         """
         stream: StreamHeader = self._get_stream_by_name(STREAM_PDB)
-        self.fps.seek(stream.offset)
 
         # pylint: disable=consider-using-f-string
-        guid_data = struct.unpack("<IHH8s", self.fps.read(16))
+        guid_data = struct.unpack("<IHH8s", self._read(stream.offset, 16))
         return "%.8X%.4X%.4X%s" % (
             guid_data[0],
             guid_data[1],
@@ -1,9 +1,12 @@
 from pdbstore.report.base import BaseEntryStatistics, BaseStatistics, Statistics
 from pdbstore.report.generator import ReportGenerator
+from pdbstore.report.snapshot import ReportSnapshot, TransactionRecord
 
 __all__ = [
     "BaseStatistics",
     "BaseEntryStatistics",
     "ReportGenerator",
+    "ReportSnapshot",
     "Statistics",
+    "TransactionRecord",
 ]
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 
-from pdbstore.store import Store
-from pdbstore.typing import List, Mapping, Tuple
+from pdbstore.report.snapshot import ReportSnapshot, TransactionRecord
+from pdbstore.store import Store, StoreSizes
+from pdbstore.typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 
 class BaseEntryStatistics(ABC):
@@ -26,10 +27,8 @@ Statistics = Mapping[Tuple[str, str], BaseEntryStatistics]
 class BaseStatistics(ABC):
     """Base class form managing statistics."""
 
-    @property
-    @abstractmethod
-    def statistics(self) -> Statistics:
-        """The data member containing all generated statistics."""
+    statistics: Statistics
+    """The data member containing all generated statistics, initialized by each instance."""
 
     @property
     @abstractmethod
@@ -51,11 +50,30 @@ class BaseStatistics(ABC):
     def value2(self) -> str:
         """The second collected data"""
 
-    @abstractmethod
-    def build(self, store: Store) -> bool:
+    def build(self, store: Store, sizes: Optional[StoreSizes] = None) -> bool:
         """Build required statistics dictonary
 
         :param store: The symbol store to analyze
+        :param sizes: Optional size map of the stored files. If None, a new map is
+            built from the store tree.
+        :return: True if successful, else False
+        """
+        records: Dict[str, TransactionRecord] = {}
+        ReportSnapshot.collect(
+            store.history.transactions,
+            records,
+            {},
+            sizes if sizes is not None else StoreSizes(store),
+        )
+        return self.build_from_records(records.values())
+
+    @abstractmethod
+    def build_from_records(self, records: Iterable[TransactionRecord]) -> bool:
+        """Build required statistics dictonary from a report snapshot
+
+        :param records: The :class:`TransactionRecord
+            <pdbstore.report.snapshot.TransactionRecord>` objects in chronological
+            order
         :return: True if successful, else False
         """
         return False
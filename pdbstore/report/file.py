@@ -1,6 +1,7 @@
 from pdbstore.report.base import BaseEntryStatistics, BaseStatistics
-from pdbstore.store import Store, Transaction
-from pdbstore.typing import Dict, List, Tuple
+from pdbstore.report.snapshot import TransactionRecord
+from pdbstore.store import Transaction
+from pdbstore.typing import Dict, Iterable, List, Set, Tuple, Union
 
 __all__ = ["FileStatistics"]
 
@@ -23,7 +24,7 @@ class FileEntryStatistics(BaseEntryStatistics):
         """Retrieve the assocaited file size."""
         return self.file_size
 
-    def update(self, transaction: Transaction) -> None:
+    def update(self, transaction: Union[Transaction, TransactionRecord]) -> None:
         """Update list of registered product for a given transaction"""
         if not transaction.product:
             return
@@ -41,31 +42,37 @@ class FileStatistics(BaseStatistics):
     key2: str = "File hash"
     value1: str = "File count"
     value2: str = "Disk space"
-    statistics: Dict[Tuple[str, str], FileEntryStatistics] = {}
+    statistics: Dict[Tuple[str, str], FileEntryStatistics]
 
-    def build(self, store: Store) -> bool:
-        """Build required statistics dictonary
+    def __init__(self) -> None:
+        self.statistics = {}
 
-        :param store: The symbol store to analyze
+    def build_from_records(self, records: Iterable[TransactionRecord]) -> bool:
+        """Build required statistics dictonary from a report snapshot
+
+        All active transactions are walked once, each file being registered with
+        its size when it is found for the first time.
+
+        :param records: The :class:`TransactionRecord
+            <pdbstore.report.snapshot.TransactionRecord>` objects in chronological
+            order
         :return: True if successful, else False
         """
-        file_usage = store.transactions.get_files_usage()
-        if not file_usage:
-            return True  # Empty store
-
-        prev_key = None
-        for file_key, tids in sorted(file_usage.entries.items(), key=lambda k: k[0]):
-            if prev_key is None or prev_key != file_key:
-                fes = FileEntryStatistics(0)
-                prev_key = file_key
-                self.statistics[file_key] = fes
-
-            for trans_id in tids:
-                transaction = store.transactions.find(trans_id)
-                if transaction and not transaction.is_deleted():
-                    if fes.get_file_size() == 0:
-                        entry = transaction.find_entry(file_key[0], file_key[1])
-                        if entry:
-                            fes.file_size = entry.get_disk_usage()
-                    fes.update(transaction)
+        statistics: Dict[Tuple[str, str], FileEntryStatistics] = {}
+        for record in records:
+            if record.deleted:
+                continue
+            files_reported: Set[Tuple[str, str]] = set()
+            for file_name, file_hash, _, file_size in record.files:
+                file_key = (file_name, file_hash)
+                if file_key in files_reported:
+                    continue
+                files_reported.add(file_key)
+                fes = statistics.get(file_key)
+                if fes is None:
+                    fes = FileEntryStatistics(file_size)
+                    statistics[file_key] = fes
+                fes.update(record)
+
+        self.statistics = dict(sorted(statistics.items(), key=lambda k: k[0]))
         return True
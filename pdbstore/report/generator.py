@@ -4,8 +4,9 @@ from pdbstore.io.output import PDBStoreOutput
 from pdbstore.report.base import BaseStatistics
 from pdbstore.report.file import FileStatistics
 from pdbstore.report.product import ProductStatistics
+from pdbstore.report.snapshot import ReportSnapshot, TransactionRecord
 from pdbstore.report.transaction import TransactionStatistics
-from pdbstore.store import Store
+from pdbstore.store import Store, StoreSizes
 from pdbstore.typing import Dict, List, Optional
 
 __all__ = ["ReportGenerator"]
@@ -18,8 +19,29 @@ class ReportGenerator:
     FILES = "files"
     TRANSACTIONS = "transactions"
 
-    def __init__(self, store: Store) -> None:
+    def __init__(
+        self,
+        store: Store,
+        sizes: Optional[StoreSizes] = None,
+        snapshot: bool = True,
+        rebuild: bool = False,
+    ) -> None:
+        """Initialize the report generator
+
+        :param store: The symbol store to analyze
+        :param sizes: Optional size map of the stored files, shared by all generated
+            reports. If None, the store tree is walked on first use.
+        :param snapshot: True to update and use the report snapshot saved in the
+            store, so only new transactions are analyzed, else False to analyze the
+            whole history without saving anything.
+        :param rebuild: True to rebuild the report snapshot from the whole history,
+            else False
+        """
         self.store: Store = store
+        self.sizes: StoreSizes = sizes if sizes is not None else StoreSizes(store)
+        self.snapshot: Optional[ReportSnapshot] = ReportSnapshot(store) if snapshot else None
+        self.rebuild: bool = rebuild
+        self._records: Optional[Dict[str, TransactionRecord]] = None
         self.mapping: Dict[str, Callable[[], BaseStatistics]] = {
             self.PRODUCTS: ProductStatistics,
             self.FILES: FileStatistics,
@@ -38,10 +60,28 @@ class ReportGenerator:
             return None
 
         data = self.mapping[report_type]()
-        if not data.build(self.store):
+        if not data.build_from_records(self._load_records().values()):
             return None  # pragma: no cover
         return data
 
+    def _load_records(self) -> Dict[str, TransactionRecord]:
+        """Collect the data required to generate reports if not done yet
+
+        :return: Dictionary of :class:`TransactionRecord
+            <pdbstore.report.snapshot.TransactionRecord>` objects given by their id
+        """
+        if self._records is None:
+            if self.snapshot is not None:
+                count = self.snapshot.update(self.sizes, self.rebuild)
+                PDBStoreOutput().debug(f"{count} transaction(s) added to report snapshot")
+                self._records = self.snapshot.records
+            else:
+                self._records = {}
+                ReportSnapshot.collect(
+                    self.store.history.transactions, self._records, {}, self.sizes
+                )
+        return self._records
+
     def supported_list(self) -> List[str]:
         """Retrieve the list of supported report types"""
         return list(self.mapping.keys())
@@ -1,8 +1,8 @@
 from collections import OrderedDict
 
 from pdbstore.report.base import BaseEntryStatistics, BaseStatistics
-from pdbstore.store import Store, Transaction
-from pdbstore.typing import Dict, List, Optional, Tuple
+from pdbstore.report.snapshot import TransactionRecord
+from pdbstore.typing import Dict, Iterable, List, Optional, Set, Tuple
 
 __all__ = ["ProductStatistics"]
 
@@ -41,27 +41,32 @@ class ProductStatistics(BaseStatistics):
     key2: str = "Product version"
     value1: str = "File count"
     value2: str = "Disk space"
-    statistics: Dict[Tuple[str, str], ProductEntryStatistics] = {}
+    statistics: Dict[Tuple[str, str], ProductEntryStatistics]
 
-    def build(self, store: Store) -> bool:
-        """Build required statistics dictonary
+    def __init__(self) -> None:
+        self.statistics = {}
 
-        :param store: The symbol store to analyze
+    def build_from_records(self, records: Iterable[TransactionRecord]) -> bool:
+        """Build required statistics dictonary from a report snapshot
+
+        :param records: The :class:`TransactionRecord
+            <pdbstore.report.snapshot.TransactionRecord>` objects in chronological
+            order
         :return: True if successful, else False
         """
-        files_reported: List[Tuple[str, str]] = []
-        for transaction in store.transactions.transactions.values():
-            if transaction.product and not transaction.is_deleted():
+        files_reported: Set[Tuple[str, str]] = set()
+        for record in records:
+            if record.product and not record.deleted:
                 disk_space = 0
                 shared_space = 0
-                for entry in transaction.entries:
-                    key = (entry.file_name, entry.file_hash)
+                for file_name, file_hash, _, file_size in record.files:
+                    key = (file_name, file_hash)
                     if key not in files_reported:
-                        files_reported.append(key)
-                        disk_space += entry.get_disk_usage()
+                        files_reported.add(key)
+                        disk_space += file_size
                     else:
-                        shared_space += entry.get_disk_usage()
-                self._add(transaction, disk_space, shared_space)
+                        shared_space += file_size
+                self._add(record, disk_space, shared_space)
         self.statistics = OrderedDict(
             (key, value)
             for key, value in sorted(
@@ -72,7 +77,7 @@ class ProductStatistics(BaseStatistics):
 
     def _add(
         self,
-        transaction: Transaction,
+        transaction: TransactionRecord,
         disk_usage: int,
         shared_space: int,
     ) -> None:
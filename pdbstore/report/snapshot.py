@@ -0,0 +1,307 @@
+""" Manage the persistent report snapshot.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.store import Store, StoreSizes, Transaction
+from pdbstore.typing import Dict, Iterable, List, Optional, Set, Tuple
+
+__all__ = ["ReportSnapshot", "TransactionRecord"]
+
+# Key identifying a stored file: file name and file hash
+FileKey = Tuple[str, str]
+
+# Stored file referenced by a transaction: file name, file hash and source path
+EntryRecord = Tuple[str, str, str]
+
+# Stored file with its size: file name, file hash, source path and size
+FileRecord = Tuple[str, str, str, int]
+
+
+class TransactionRecord:
+    """Data collected from an 'add' transaction to build reports."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        transaction_id: str,
+        product: Optional[str],
+        version: Optional[str],
+        deleted: bool = False,
+        entries: Optional[List[EntryRecord]] = None,
+        file_sizes: Optional[Dict[FileKey, int]] = None,
+    ) -> None:
+        self.id: str = transaction_id  # pylint: disable=invalid-name
+        self.product: Optional[str] = product
+        self.version: Optional[str] = version
+        self.deleted: bool = deleted
+        self.entries: List[EntryRecord] = entries or []
+        # Size of the stored files, shared by all records
+        self.file_sizes: Dict[FileKey, int] = file_sizes if file_sizes is not None else {}
+
+    @property
+    def files(self) -> List[FileRecord]:
+        """Retrieve the associated files with their current size."""
+        return [
+            (file_name, file_hash, path, self.file_sizes.get((file_name, file_hash), 0))
+            for file_name, file_hash, path in self.entries
+        ]
+
+    @property
+    def count(self) -> int:
+        """Retrieve the total number of associated files."""
+        return len(self.entries)
+
+    @property
+    def status(self) -> str:
+        """Retrieve the transaction status."""
+        return "deleted" if self.deleted else "active"
+
+
+class ReportSnapshot:
+    """Persistent snapshot of the data used to build reports.
+
+    The snapshot records the product, the status and the stored files of each
+    'add' transaction, the size of each stored file, along with the id of the
+    last transaction read from the history file. Updating the snapshot only reads
+    the transactions registered since then, so only the files referenced by these
+    transactions are accessed.
+
+    Sizes are kept by file name and hash, so a stored file rewritten by a newer
+    transaction, such as a file compressed when added again, is reported with its
+    current size by all transactions referencing it.
+
+    Statistics are aggregated from the snapshot each time a report is generated,
+    since deleting a transaction moves the disk space shared with newer
+    transactions.
+    """
+
+    # Version of the database layout
+    SCHEMA_VERSION: str = "2"
+
+    def __init__(self, store: Store) -> None:
+        self.store: Store = store
+        self.records: Dict[str, TransactionRecord] = {}
+        self.file_sizes: Dict[FileKey, int] = {}
+        self.last_id: Optional[str] = None
+
+    @property
+    def file_path(self) -> Path:
+        """Retrieve the full path name of the snapshot file"""
+        return self.store.report_file_path
+
+    @staticmethod
+    def collect(
+        transactions: Iterable[Transaction],
+        records: Dict[str, TransactionRecord],
+        file_sizes: Dict[FileKey, int],
+        sizes: Optional[StoreSizes] = None,
+    ) -> Tuple[Set[str], Set[FileKey]]:
+        """Apply transactions read from the history file to a set of records
+
+        The size of the files referenced by each new 'add' transaction is read
+        again, since the transaction may have rewritten them.
+
+        :param transactions: The transactions to apply, in chronological order
+        :param records: Dictionary of :class:`TransactionRecord` objects given by
+            their id, updated in place
+        :param file_sizes: Size of the stored files given by their name and hash,
+            updated in place
+        :param sizes: Optional size map of the stored files. If None, each
+            referenced file is stat'ed.
+        :return: The ids of the new or updated records and the keys of the updated
+            file sizes
+        :raise:
+            :ReadFileError: Failed to read a transaction file
+        """
+        changed: Set[str] = set()
+        changed_files: Set[FileKey] = set()
+        for transaction in transactions:
+            if transaction.is_delete_operation():
+                record = records.get(transaction.deleted_id or "")
+                if record and not record.deleted:
+                    record.deleted = True
+                    record.entries = []
+                    changed.add(record.id)
+                continue
+
+            deleted = transaction.is_deleted()
+            entries: List[EntryRecord] = []
+            for entry in [] if deleted else transaction.entries:
+                file_key = (entry.file_name, entry.file_hash)
+                if file_key not in changed_files:
+                    file_sizes[file_key] = (
+                        sizes.disk_usage(entry) if sizes is not None else entry.get_disk_usage()
+                    )
+                    changed_files.add(file_key)
+                entries.append((entry.file_name, entry.file_hash, str(entry.file_path)))
+            records[transaction.id] = TransactionRecord(
+                transaction.id,
+                transaction.product,
+                transaction.version,
+                deleted,
+                entries,
+                file_sizes,
+            )
+            changed.add(transaction.id)
+        return changed, changed_files
+
+    def load(self) -> bool:
+        """Load the snapshot file
+
+        :return: True if the snapshot file was loaded, else False
+        """
+        self.records = {}
+        self.file_sizes = {}
+        self.last_id = None
+        if not self.file_path.is_file():
+            return False
+        try:
+            connection = sqlite3.connect(os.fspath(self.file_path))
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+                if meta.get("version") != self.SCHEMA_VERSION:
+                    PDBStoreOutput().verbose(f"{self.file_path} is out of date, so ignore it")
+                    return False
+                for trans_id, product, version, deleted in connection.execute(
+                    "SELECT id, product, version, deleted FROM transactions ORDER BY id"
+                ):
+                    self.records[trans_id] = TransactionRecord(
+                        trans_id, product, version, bool(deleted), file_sizes=self.file_sizes
+                    )
+                for trans_id, file_name, file_hash, path in connection.execute(
+                    "SELECT transaction_id, file_name, file_hash, path FROM entries "
+                    "ORDER BY rowid"
+                ):
+                    record = self.records.get(trans_id)
+                    if record:
+                        record.entries.append((file_name, file_hash, path))
+                for file_name, file_hash, size in connection.execute(
+                    "SELECT file_name, file_hash, size FROM files"
+                ):
+                    self.file_sizes[(file_name, file_hash)] = size
+            finally:
+                connection.close()
+        except sqlite3.Error as exc:
+            PDBStoreOutput().debug(f"{self.file_path}: {exc}")
+            self.records = {}
+            self.file_sizes = {}
+            return False
+        self.last_id = meta.get("last_id")
+        return True
+
+    def _is_stale(self) -> bool:
+        """Determine whether the loaded snapshot belongs to an older history file
+
+        :return: True if the history file doesn't contain the last processed
+            transaction anymore, else False
+        """
+        if self.last_id is None:
+            return False
+        last_transactions = self.store.history.tail(1)
+        return not last_transactions or int(last_transactions[0].id) < int(self.last_id)
+
+    def update(self, sizes: Optional[StoreSizes] = None, rebuild: bool = False) -> int:
+        """Bring the snapshot up to date with the history file and save it
+
+        :param sizes: Optional size map of the stored files, only used for a full
+            rebuild. If None, the store tree is walked if a full rebuild is needed.
+        :param rebuild: True to ignore the snapshot file and process the whole
+            history, else False
+        :return: The number of processed transactions
+        :raise:
+            :ReadFileError: Failed to read history or transaction file
+        """
+        full = rebuild or not self.load() or self._is_stale()
+        if full:
+            self.records = {}
+            self.file_sizes = {}
+            self.last_id = None
+            transactions = self.store.history.transactions
+            changed, changed_files = self.collect(
+                transactions,
+                self.records,
+                self.file_sizes,
+                sizes if sizes is not None else StoreSizes(self.store),
+            )
+        else:
+            transactions = (
+                self.store.history.since(self.last_id)
+                if self.last_id is not None
+                else self.store.history.transactions
+            )
+            changed, changed_files = self.collect(transactions, self.records, self.file_sizes)
+
+        if transactions:
+            self.last_id = transactions[-1].id
+        if full or transactions:
+            self._save(changed, changed_files, full)
+        return len(transactions)
+
+    def _save(self, changed: Set[str], changed_files: Set[FileKey], full: bool) -> None:
+        """Write the updated records into the snapshot file
+
+        Failing to write the snapshot file is not fatal, the report can still be
+        generated from the records in memory.
+
+        :param changed: The ids of the new or updated records
+        :param changed_files: The keys of the updated file sizes
+        :param full: True to recreate the snapshot file, else False
+        """
+        if not self.store.admin_dir.is_dir():
+            return  # Empty store
+        try:
+            if full:
+                self.file_path.unlink(missing_ok=True)
+            connection = sqlite3.connect(os.fspath(self.file_path))
+            try:
+                with connection:
+                    connection.executescript(
+                        """
+                        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                        CREATE TABLE IF NOT EXISTS transactions (
+                            id TEXT PRIMARY KEY, product TEXT, version TEXT, deleted INTEGER
+                        );
+                        CREATE TABLE IF NOT EXISTS entries (
+                            transaction_id TEXT, file_name TEXT, file_hash TEXT, path TEXT
+                        );
+                        CREATE INDEX IF NOT EXISTS entries_transaction
+                            ON entries (transaction_id);
+                        CREATE TABLE IF NOT EXISTS files (
+                            file_name TEXT, file_hash TEXT, size INTEGER,
+                            PRIMARY KEY (file_name, file_hash)
+                        );
+                        """
+                    )
+                    for trans_id in sorted(changed):
+                        record = self.records[trans_id]
+                        connection.execute(
+                            "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?)",
+                            (record.id, record.product, record.version, int(record.deleted)),
+                        )
+                        connection.execute(
+                            "DELETE FROM entries WHERE transaction_id = ?", (record.id,)
+                        )
+                        connection.executemany(
+                            "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                            [(record.id, *entry_record) for entry_record in record.entries],
+                        )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                        [
+                            (file_name, file_hash, self.file_sizes[(file_name, file_hash)])
+                            for file_name, file_hash in sorted(changed_files)
+                        ],
+                    )
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                        [("version", self.SCHEMA_VERSION), ("last_id", self.last_id)],
+                    )
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error) as exc:
+            PDBStoreOutput().warning(f"{self.file_path}: cannot save report snapshot ({exc})")
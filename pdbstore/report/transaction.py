@@ -1,6 +1,6 @@
 from pdbstore.report.base import BaseEntryStatistics, BaseStatistics
-from pdbstore.store import Store, Transaction
-from pdbstore.typing import Dict, List, Optional, Tuple, Union
+from pdbstore.report.snapshot import TransactionRecord
+from pdbstore.typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 __all__ = ["TransactionStatistics"]
 
@@ -59,49 +59,47 @@ class TransactionStatistics(BaseStatistics):
     key2: str = "Transaction count"
     value1: str = "File count"
     value2: str = "Disk space"
-    statistics: Dict[Tuple[str, str], TransactionEntryStatistics] = {}
+    statistics: Dict[Tuple[str, str], TransactionEntryStatistics]
 
-    def build(self, store: Store) -> bool:
-        """Build required statistics dictonary
+    def __init__(self) -> None:
+        self.statistics = {}
 
-        :param store: The symbol store to analyze
+    def build_from_records(self, records: Iterable[TransactionRecord]) -> bool:
+        """Build required statistics dictonary from a report snapshot
+
+        :param records: The :class:`TransactionRecord
+            <pdbstore.report.snapshot.TransactionRecord>` objects in chronological
+            order
         :return: True if successful, else False
         """
-        files_reported: List[Tuple[str, str]] = []
-        for transaction in store.history.transactions:
+        files_reported: Set[Tuple[str, str]] = set()
+        for record in records:
             disk_space = 0
             shared_space = 0
             files: List[Dict[str, Union[str, int, bool]]] = []
-            if transaction.product and not transaction.is_deleted():
-                for entry in transaction.entries:
-                    key = (entry.file_name, entry.file_hash)
-                    file_size = entry.get_disk_usage()
-                    files.append(
-                        {
-                            "path": str(entry.file_path),
-                            "shared": key not in files_reported,
-                            "size": file_size,
-                        }
-                    )
+            if record.product and not record.deleted:
+                for file_name, file_hash, file_path, file_size in record.files:
+                    key = (file_name, file_hash)
+                    first_seen = key not in files_reported
+                    if first_seen:
+                        files_reported.add(key)
+                        disk_space += file_size
+                    else:
+                        shared_space += file_size
                     files.append(
                         {
-                            "path": str(entry.file_path),
-                            "shared": key not in files_reported,
+                            "path": file_path,
+                            "shared": first_seen,
                             "size": file_size,
                         }
                     )
-                    if key not in files_reported:
-                        files_reported.append(key)
-                        disk_space += file_size
-                    else:
-                        shared_space += file_size
 
-            self._add(transaction, disk_space, shared_space, files)
+            self._add(record, disk_space, shared_space, files)
         return True
 
     def _add(
         self,
-        transaction: Transaction,
+        transaction: TransactionRecord,
         disk_usage: int,
         shared_space: int,
         files: List[Dict[str, Union[str, int, bool]]],
@@ -109,8 +107,6 @@ class TransactionStatistics(BaseStatistics):
         """Register a new entry given by a key with the associated disk space"""
         key = (transaction.id, str(transaction.count))
         entry: Optional[TransactionEntryStatistics] = self.statistics.get(key)
-        if transaction.is_delete_operation():
-            return
         if entry:
             entry.trans_count += 1
             entry.files_count += transaction.count
@@ -123,6 +119,6 @@ class TransactionStatistics(BaseStatistics):
                 transaction.count,
                 disk_usage,
                 shared_space,
-                "deleted" if transaction.is_deleted() else "active",
+                transaction.status,
                 files,
             )
@@ -1,5 +1,9 @@
+from pdbstore.store.compression import CompressionPolicy
 from pdbstore.store.entry import TransactionEntry
 from pdbstore.store.history import History
+from pdbstore.store.index import StoreIndex
+from pdbstore.store.sizes import StoreSizes
+from pdbstore.store.status import StoreStatus
 from pdbstore.store.store import Store
 from pdbstore.store.summary import OpStatus, Summary
 from pdbstore.store.transaction import Transaction
@@ -7,9 +11,13 @@ from pdbstore.store.transaction_type import TransactionType
 from pdbstore.store.transactions import Transactions
 
 __all__ = [
+    "CompressionPolicy",
     "History",
     "OpStatus",
     "Store",
+    "StoreIndex",
+    "StoreSizes",
+    "StoreStatus",
     "Summary",
     "Transaction",
     "TransactionEntry",
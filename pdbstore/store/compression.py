@@ -0,0 +1,110 @@
+""" Decide how files are compressed when they are stored.
+"""
+
+import os
+import zlib
+
+from pdbstore.typing import Optional, PathLike, Tuple
+
+__all__ = ["CompressionPolicy"]
+
+# Size of the blocks compressed independently, as done for cabinet files
+_SAMPLE_BLOCK_SIZE = 0x8000
+
+
+class CompressionPolicy:
+    """Compression settings and heuristics used to store compressed files.
+
+    A file requested to be compressed is stored without compression if:
+
+    - its size is lower than ``min_size`` bytes,
+    - or compressing a sample of its content saves less than ``min_ratio``
+      of its size.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    # Default number of bytes compressed to estimate the compression ratio
+    DEFAULT_SAMPLE_SIZE: int = 256 * 1024
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        min_size: int = 0,
+        min_ratio: float = 0.0,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        """Initialize compression settings
+
+        :param workers: Maximum number of files compressed simultaneously. If None,
+            the default number of workers is used.
+        :param level: The compression level from 1 (fastest) to 9 (smallest), or -1
+            for the default compromise
+        :param min_size: Minimum file size in bytes to compress a file
+        :param min_ratio: Minimum saved space, from 0.0 to 1.0, estimated from a sample
+            to compress a file. If 0.0, no sample is compressed.
+        :param sample_size: Number of bytes compressed to estimate the saved space
+        """
+        self.workers: Optional[int] = workers or None
+        self.level: int = level
+        self.min_size: int = min_size
+        self.min_ratio: float = min_ratio
+        self.sample_size: int = sample_size
+
+    def _sampled_ratio(self, file_path: PathLike, file_size: int) -> float:
+        """Estimate the saved space by compressing a sample of a file.
+
+        Half of the sample is read from the beginning of the file and the other
+        half from the middle of the file. Each block is compressed independently,
+        as done when writing the cabinet file.
+
+        :param file_path: Path to the file
+        :param file_size: The file size
+        :return: The estimated saved space ratio
+        """
+        half = max(self.sample_size // 2, 1)
+        offsets = [0] if file_size <= self.sample_size else [0, file_size // 2]
+        raw_size = 0
+        compressed_size = 0
+        with open(file_path, "rb") as fsrc:
+            for offset in offsets:
+                fsrc.seek(offset)
+                remaining = half if len(offsets) > 1 else self.sample_size
+                while remaining > 0:
+                    block = fsrc.read(min(_SAMPLE_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+                    compressed_size += len(compressor.compress(block) + compressor.flush())
+                    raw_size += len(block)
+                    remaining -= len(block)
+        if raw_size == 0:
+            return 0.0
+        return 1.0 - float(compressed_size) / raw_size
+
+    def decide(self, file_path: PathLike) -> Tuple[bool, str]:
+        """Decide whether a file should be compressed or not
+
+        :param file_path: Path to the file
+        :return: A tuple containing True if the file should be compressed, else
+            False, and the decision description
+        """
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            # Let the store operation report the error
+            return True, "compressed"
+
+        if file_size < self.min_size:
+            return False, f"stored raw (size {file_size} < {self.min_size})"
+
+        if self.min_ratio > 0.0:
+            try:
+                ratio = self._sampled_ratio(file_path, file_size)
+            except OSError:
+                return True, "compressed"
+            if ratio < self.min_ratio:
+                return False, f"stored raw (ratio {ratio:.1%} < {self.min_ratio:.1%})"
+
+        return True, "compressed"
@@ -1,8 +1,9 @@
 import os
-import shutil
+import stat
 from pathlib import Path
 
 from pdbstore import exceptions, io, util
+from pdbstore.io.copy import copy_file, link_file, LinkMode
 from pdbstore.io.output import PDBStoreOutput
 from pdbstore.typing import Optional, PathLike
 
@@ -33,6 +34,8 @@ class TransactionEntry:
         self.source_file: Path = util.str_to_path(source_file)
         # Flag indicating if the stored file is compressed or not
         self.compressed: bool = compressed
+        # Method used to store the file when promoted from another store
+        self.link_method: Optional[LinkMode] = None
 
     def _stored_dir(self) -> Path:
         """Retrieve the full path of the associated directory from associated store.
@@ -90,6 +93,8 @@ class TransactionEntry:
         force: Optional[bool] = False,
         store: Optional["Store"] = None,  # type: ignore[name-defined] # noqa F821,
         skip_if_exists: Optional[bool] = False,
+        compress_level: Optional[int] = None,
+        link_mode: LinkMode = LinkMode.COPY,
     ) -> bool:
         """Commit transaction entry by storing the required filse into the symbol store.
 
@@ -102,6 +107,11 @@ class TransactionEntry:
         :param store: Optional :class:`Store <pdbstore.store.store.Store>` object.
         :param skip_if_exists: `True` to skip entry creation if the file already exists
             in the store, else `False`
+        :param compress_level: Optional compression level used by the built-in
+            cabinet writer.
+        :param link_mode: The :class:`LinkMode <pdbstore.io.copy.LinkMode>` used to
+            store the file when promoting it from ``store``. The method which was
+            really used is available from ``link_method`` data member.
         :return: `True` if the file is stored successfully, else `False` if the file was
                  alredy present.
         :raise:
@@ -114,6 +124,10 @@ class TransactionEntry:
                 return False
             if not force:
                 return True
+            if store is None:
+                # Never write through the existing file since it may be hard linked
+                # from another store
+                self.stored_path.unlink()
 
         dest_dir = self._stored_dir()
 
@@ -127,10 +141,7 @@ class TransactionEntry:
             PDBStoreOutput().debug(
                 f"Promoting {self.stored_path} from {stored_path}",
             )
-            try:
-                shutil.copy(stored_path, dest_dir)
-            except Exception as exc:  # pragma: no cover
-                raise exceptions.CopyFileError(stored_path, dest_dir) from exc
+            self.link_method = link_file(stored_path, dest_dir / stored_path.name, link_mode)
 
             return True
 
@@ -147,15 +158,23 @@ class TransactionEntry:
             PDBStoreOutput().debug(
                 f"Compressing {self.source_file} to {str(dest_dir / (self.file_name[:-1] + '_'))}"
             )
-            io.cab.compress(
-                self.source_file, dest_dir / (self.file_name[:-1] + "_")
-            )  # type: ignore[misc]
+            # Make local import to avoid unwanted search operation
+            from pdbstore.io import cab  # pylint: disable=import-outside-toplevel
+
+            if compress_level is None:
+                cab.compress(
+                    self.source_file, dest_dir / (self.file_name[:-1] + "_")
+                )  # type: ignore[misc]
+            else:
+                cab.compress(
+                    self.source_file, dest_dir / (self.file_name[:-1] + "_"), compress_level
+                )  # type: ignore[misc]
         else:
             PDBStoreOutput().debug(
                 f"Copying {self.source_file} to {str(dest_dir / self.file_name)}",
             )
             try:
-                shutil.copy(self.source_file, dest_dir)
+                copy_file(self.source_file, dest_dir / self.file_name)
             except Exception as exc:  # pragma: no cover
                 raise exceptions.CopyFileError(self.source_file, dest_dir) from exc
 
@@ -173,16 +192,19 @@ class TransactionEntry:
             :CopyFileError: if an error occurs during file storage without compression
         """
         if self.compressed:
-            if io.cab.decompress is None:
+            # Make local import to avoid unwanted search operation
+            from pdbstore.io import cab  # pylint: disable=import-outside-toplevel
+
+            if cab.decompress is None:
                 raise exceptions.DecompressionNotSupportedError()
             PDBStoreOutput().debug(
                 f"Decompressing {str(self.file_name[:-1] + '_')} into {dest_dir}"
             )
-            io.cab.decompress(self.stored_path, dest_dir)
+            cab.decompress(self.stored_path, dest_dir)
         else:
             PDBStoreOutput().debug(f"Copying {str(self.file_name)} into {dest_dir}")
             try:
-                shutil.copy(self.stored_path, dest_dir)
+                copy_file(self.stored_path, os.path.join(dest_dir, self.file_name))
             except Exception as exc:
                 raise exceptions.CopyFileError(self.source_file, dest_dir) from exc
 
@@ -255,14 +277,11 @@ class TransactionEntry:
 
         :return: The disk space usage in bytes.
         """
-        disk_usage = 0
-        file_path = self.stored_path
-        if file_path.is_file():
-            try:
-                disk_usage = file_path.stat().st_size
-            except OSError:  # pragma: no cover
-                PDBStoreOutput().error(f"failed to get file size for {str(file_path)}")
-        return disk_usage
+        try:
+            stat_info = self.stored_path.stat()
+        except OSError:
+            return 0
+        return stat_info.st_size if stat.S_ISREG(stat_info.st_mode) else 0
 
     def clone(
         self,
@@ -280,5 +299,5 @@ class TransactionEntry:
             self.file_name,
             self.file_hash,
             self.stored_path if promoted else self.source_file,
-            False if promoted else self.compressed,
+            self.compressed,
         )
@@ -1,12 +1,15 @@
 import os
-from typing import List, Optional
+from typing import Generator, List, Optional, Tuple
 
-from pdbstore.exceptions import WriteFileError
+from pdbstore.exceptions import ReadFileError, WriteFileError
 from pdbstore.io import file
 from pdbstore.io.output import PDBStoreOutput
 from pdbstore.store.transaction import Transaction
 from pdbstore.store.transaction_type import TransactionType
 
+# Size of the blocks read when reading the history file backwards
+HISTORY_BLOCK_SIZE = 64 * 1024
+
 
 class History:
     """Manage history.txt content"""
@@ -57,16 +60,31 @@ class History:
         :raise:
             :WriteFileError: Failed to update history file.
         """
-        self._write_line(f"{delete_id},del,{transaction.id}")
+        self.delete_many([(transaction, delete_id)])
+
+    def delete_many(self, deletions: List[Tuple[Transaction, str]]) -> None:
+        """Register several 'del' operations with a single write
+
+        :param deletions: List of tuple pairs containing the deleted transaction and
+            the transaction id associated to its new history entry.
+        :raise:
+            :WriteFileError: Failed to update history file.
+        """
+        if not deletions:
+            return
+        self._write_lines(
+            [f"{delete_id},del,{transaction.id}" for transaction, delete_id in deletions]
+        )
         if self.transactions_list is not None:
-            self.transactions.append(
-                Transaction(
-                    self.store,
-                    delete_id,
-                    TransactionType.DEL,
-                    deleted_id=transaction.id,
+            for transaction, delete_id in deletions:
+                self.transactions.append(
+                    Transaction(
+                        self.store,
+                        delete_id,
+                        TransactionType.DEL,
+                        deleted_id=transaction.id,
+                    )
                 )
-            )
 
     def _parse(self) -> List[Transaction]:
         """Parse history file.
@@ -80,19 +98,165 @@ class History:
             return []
         transactions = []
 
-        for line in file.read_text_file(self.store.history_file_path, True):
+        for line in file.iter_text_file(self.store.history_file_path):
             transaction = Transaction.parse_line(self.store, line)
             if transaction:
                 transactions.append(transaction)
 
         return transactions
 
+    def _parse_line(self, line: bytes) -> Optional[Transaction]:
+        """Parse a raw line read from the history file.
+        :param line: The line content, without its newline character
+        :return: The associated :class:`Transaction` object if the line is valid,
+            else None
+        """
+        return Transaction.parse_line(self.store, line.decode("utf-8").rstrip("\r"))
+
+    def _iter_reversed(self, stop: int = 0) -> Generator[Transaction, None, None]:
+        """Iterate over the transactions from the end of the history file.
+
+        The file is read backwards by blocks, so only the lines which are consumed
+        by the caller are read.
+
+        :param stop: Offset of the first byte to be read
+        :return: A generator of :class:`Transaction` objects, most recent first
+        :raise:
+            :ReadFileError: Failed to read history file
+        """
+        if not self.file_exists():
+            PDBStoreOutput().debug(f"{self.store.history_file_path} not found")
+            return
+        try:
+            with self.store.history_file_path.open("rb") as fph:
+                position = fph.seek(0, os.SEEK_END)
+                remainder = b""
+                while position > stop:
+                    size = min(HISTORY_BLOCK_SIZE, position - stop)
+                    position -= size
+                    fph.seek(position)
+                    lines = (fph.read(size) + remainder).split(b"\n")
+                    # First line may continue in the previous block
+                    remainder = lines[0]
+                    for line in reversed(lines[1:]):
+                        transaction = self._parse_line(line)
+                        if transaction:
+                            yield transaction
+                transaction = self._parse_line(remainder)
+                if transaction:
+                    yield transaction
+        except OSError as exc:
+            raise ReadFileError(self.store.history_file_path) from exc
+
+    def tail(self, count: int) -> List[Transaction]:
+        """Retrieve the most recent transactions.
+
+        Only the end of the history file is read if the whole history is not
+        loaded yet.
+
+        :param count: Maximum number of transactions to be retrieved
+        :return: List of the last `count` :class:`Transaction` objects, in
+            chronological order
+        :raise:
+            :ReadFileError: Failed to read history file
+        """
+        if count <= 0:
+            return []
+        if self.transactions_list is not None:
+            return self.transactions_list[-count:]
+        transactions: List[Transaction] = []
+        for transaction in self._iter_reversed():
+            transactions.append(transaction)
+            if len(transactions) >= count:
+                break
+        transactions.reverse()
+        return transactions
+
+    def since(self, transaction_id: str) -> List[Transaction]:
+        """Retrieve the transactions registered after a given transaction.
+
+        Transaction ids are always increasing, so the history file is read
+        backwards until `transaction_id` or an older transaction is found.
+
+        :param transaction_id: The transaction id, excluded from the result
+        :return: List of newer :class:`Transaction` objects, in chronological order
+        :raise:
+            :ReadFileError: Failed to read history file
+            :ValueError: `transaction_id` is not a valid transaction id
+        """
+        last_id = int(transaction_id)
+        if self.transactions_list is not None:
+            return [
+                transaction
+                for transaction in self.transactions_list
+                if int(transaction.id) > last_id
+            ]
+        transactions: List[Transaction] = []
+        for transaction in self._iter_reversed():
+            if int(transaction.id) <= last_id:
+                break
+            transactions.append(transaction)
+        transactions.reverse()
+        return transactions
+
+    def checkpoint(self) -> int:
+        """Retrieve a checkpoint identifying the current end of the history file.
+
+        The checkpoint can be given later to :meth:`read_from` to only retrieve
+        the transactions registered in the meantime.
+
+        :return: The history file size in bytes
+        """
+        try:
+            return os.stat(os.fspath(self.store.history_file_path)).st_size
+        except OSError:
+            return 0
+
+    def read_from(self, offset: int) -> Tuple[List[Transaction], int]:
+        """Retrieve the transactions registered after a checkpoint.
+
+        :param offset: A checkpoint previously returned by :meth:`checkpoint` or
+            by this function
+        :return: A tuple containing the list of new :class:`Transaction` objects,
+            in chronological order, and the checkpoint to be used for the next call
+        :raise:
+            :ReadFileError: Failed to read history file
+            :ValueError: The checkpoint is beyond the end of the history file
+        """
+        end = self.checkpoint()
+        if offset > end:
+            raise ValueError(f"{offset}: checkpoint beyond end of history file ({end})")
+        if offset == end:
+            return [], end
+        transactions: List[Transaction] = []
+        try:
+            with self.store.history_file_path.open(
+                "rb", buffering=file.TEXT_FILE_BUFFER_SIZE
+            ) as fph:
+                fph.seek(offset)
+                for line in fph:
+                    transaction = self._parse_line(line.rstrip(b"\n"))
+                    if transaction:
+                        transactions.append(transaction)
+                end = fph.tell()
+        except OSError as exc:
+            raise ReadFileError(self.store.history_file_path) from exc
+        return transactions, end
+
     def _write_line(self, new_line: str) -> None:
         """Write a new line into the history file.
         :param new_line: The line to be added.
         :raise:
             :WriteFileError: Failed to update history file
         """
+        self._write_lines([new_line])
+
+    def _write_lines(self, new_lines: List[str]) -> None:
+        """Write new lines into the history file at once.
+        :param new_lines: The lines to be added.
+        :raise:
+            :WriteFileError: Failed to update history file
+        """
         try:
             empty = True
             if (
@@ -110,7 +274,7 @@ class History:
                     fph.seek(-len(nls), os.SEEK_END)
                     if fph.read(len(nls)) != nls:
                         fph.write(nls)
-                fph.write(new_line.encode("utf-8"))
+                fph.write(os.linesep.join(new_lines).encode("utf-8"))
         except OSError as exc:
             raise WriteFileError(self.store.history_file_path) from exc
 
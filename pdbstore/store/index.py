@@ -0,0 +1,312 @@
+""" Manage the persistent entries index.
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from pdbstore.exceptions import ReadFileError, WriteFileError
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.store.entry import TransactionEntry
+from pdbstore.store.transaction import Transaction
+from pdbstore.store.transaction_type import TransactionType
+from pdbstore.typing import Dict, List, Optional
+
+__all__ = ["StoreIndex"]
+
+
+class StoreIndex:
+    """Persistent index of transactions and entries stored in the admin directory.
+
+    The index is optional: it is only used if the index file is present and if it
+    is synchronized with the server file. It is created or regenerated from the
+    text files by calling :meth:`rebuild`.
+    """
+
+    # Version of the database layout
+    SCHEMA_VERSION: str = "2"
+
+    def __init__(self, store: "Store"):  # type: ignore[name-defined] # noqa: F821
+        self.store: "Store" = store  # type: ignore[name-defined] # noqa: F821
+        self._connection: Optional[sqlite3.Connection] = None
+        self._valid: Optional[bool] = None
+
+    @property
+    def file_path(self) -> Path:
+        """Retrieve the full path name of the index file"""
+        file_path: Path = self.store.index_file_path
+        return file_path
+
+    def exists(self) -> bool:
+        """Determine whether the index file exists or not
+
+        :return: True if the file exists, else False
+        """
+        exists: bool = self.file_path.is_file()
+        return exists
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the index database if not done yet
+
+        :return: The database connection
+        """
+        if self._connection is None:
+            self._connection = sqlite3.connect(os.fspath(self.file_path))
+        return self._connection
+
+    def _server_signature(self) -> str:
+        """Compute the signature of the server file
+
+        :return: A string identifying the current server file content
+        """
+        try:
+            stat_info = os.stat(self.store.server_file_path)
+        except OSError:
+            return ""
+        return f"{stat_info.st_size}:{stat_info.st_mtime_ns}"
+
+    def _read_meta(self, key: str) -> Optional[str]:
+        """Read a value from the metadata table
+
+        :param key: The value name
+        :return: The associated value if defined, else None
+        """
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return str(row[0]) if row else None
+
+    def _write_signature(self, connection: sqlite3.Connection) -> None:
+        """Record the current server file signature
+
+        :param connection: The database connection to use
+        """
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('server', ?)",
+            (self._server_signature(),),
+        )
+
+    def is_valid(self) -> bool:
+        """Determine whether the index can be used or not
+
+        The index is valid if it exists and if it was generated from the current
+        server file.
+
+        :return: True if the index can be used, else False
+        """
+        if self._valid is None:
+            self._valid = False
+            if self.exists():
+                try:
+                    self._valid = (
+                        self._read_meta("version") == self.SCHEMA_VERSION
+                        and self._read_meta("server") == self._server_signature()
+                    )
+                except sqlite3.Error as exc:
+                    PDBStoreOutput().debug(f"{self.file_path}: {exc}")
+                if not self._valid:
+                    PDBStoreOutput().verbose(f"{self.file_path} is out of date, so ignore it")
+        return self._valid
+
+    def rebuild(self) -> int:
+        """Regenerate the index from the server and transaction files
+
+        :return: The total number of indexed transactions
+        :raise:
+            :ReadFileError: Failed to read server or transaction file
+            :WriteFileError: Failed to write the index file
+        """
+        # Force the transactions to be loaded from the text files
+        self.close()
+        self._valid = False
+        self.store.transactions.reset()
+
+        transactions = list(self.store.transactions.transactions.values())
+        try:
+            self.store.check_admin_dir()
+            connection = self._connect()
+            with connection:
+                connection.executescript(
+                    """
+                    DROP TABLE IF EXISTS meta;
+                    DROP TABLE IF EXISTS transactions;
+                    DROP TABLE IF EXISTS entries;
+                    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                    CREATE TABLE transactions (
+                        id TEXT PRIMARY KEY, ref TEXT, timestamp TEXT,
+                        product TEXT, version TEXT, comment TEXT
+                    );
+                    CREATE TABLE entries (
+                        transaction_id TEXT, file_name TEXT, file_hash TEXT,
+                        source TEXT
+                    );
+                    CREATE INDEX entries_file ON entries (file_name, file_hash);
+                    CREATE INDEX entries_transaction ON entries (transaction_id);
+                    """
+                )
+                connection.execute(
+                    "INSERT INTO meta (key, value) VALUES ('version', ?)", (self.SCHEMA_VERSION,)
+                )
+                for transaction in transactions:
+                    self._insert(connection, transaction)
+                self._write_signature(connection)
+        except sqlite3.Error as exc:
+            raise WriteFileError(self.file_path) from exc
+        self._valid = True
+        return len(transactions)
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection, transaction: Transaction) -> None:
+        """Insert a transaction and its entries
+
+        :param connection: The database connection to use
+        :param transaction: The transaction to be inserted
+        """
+        connection.execute(
+            "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                transaction.id,
+                transaction.ref,
+                transaction.timestamp.isoformat() if transaction.timestamp else None,
+                transaction.product,
+                transaction.version,
+                transaction.comment,
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO entries VALUES (?, ?, ?, ?)",
+            [
+                (
+                    transaction.id,
+                    entry.file_name,
+                    entry.file_hash,
+                    os.fspath(entry.source_file.absolute()),
+                )
+                for entry in transaction.entries
+            ],
+        )
+
+    def add(self, transaction: Transaction) -> None:
+        """Register a new transaction into the index
+
+        This function must be called once the server file is updated.
+
+        :param transaction: The committed transaction
+        :raise:
+            :WriteFileError: Failed to update the index file
+        """
+        if not self._valid:
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                self._insert(connection, transaction)
+                self._write_signature(connection)
+        except sqlite3.Error as exc:
+            self._valid = False
+            raise WriteFileError(self.file_path) from exc
+
+    def delete(self, transaction: Transaction) -> None:
+        """Unregister a deleted transaction from the index
+
+        This function must be called once the server file is updated.
+
+        :param transaction: The deleted transaction
+        :raise:
+            :WriteFileError: Failed to update the index file
+        """
+        if not self._valid:
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM entries WHERE transaction_id = ?", (transaction.id,)
+                )
+                connection.execute("DELETE FROM transactions WHERE id = ?", (transaction.id,))
+                self._write_signature(connection)
+        except sqlite3.Error as exc:
+            self._valid = False
+            raise WriteFileError(self.file_path) from exc
+
+    def find(self, file_name: str, file_hash: str) -> List[str]:
+        """Retrieve the list of transactions associated to a file
+
+        :param file_name: The file name to be found
+        :param file_hash: The required file hash associated to `file_name`
+        :return: List of transaction ids referencing the file, sorted by id
+        :raise:
+            :ReadFileError: Failed to read the index file
+        """
+        try:
+            rows = self._connect().execute(
+                "SELECT DISTINCT transaction_id FROM entries "
+                "WHERE file_name = ? AND file_hash = ? ORDER BY transaction_id",
+                (file_name, file_hash),
+            )
+            return [str(row[0]) for row in rows]
+        except sqlite3.Error as exc:
+            raise ReadFileError(self.file_path) from exc
+
+    def load_transactions(self) -> Dict[str, Transaction]:
+        """Load all registered transactions
+
+        :return: Dictionary containing the
+            :class:`Transaction <pdbstore.store.transaction.Transaction>` objects
+            given by their id
+        :raise:
+            :ReadFileError: Failed to read the index file
+        """
+        transactions: Dict[str, Transaction] = {}
+        try:
+            rows = self._connect().execute("SELECT * FROM transactions ORDER BY id")
+            for trans_id, ref, timestamp, product, version, comment in rows:
+                transactions[trans_id] = Transaction(
+                    self.store,
+                    trans_id,
+                    TransactionType.ADD,
+                    ref,
+                    datetime.fromisoformat(timestamp) if timestamp else None,
+                    product,
+                    version,
+                    comment,
+                )
+        except sqlite3.Error as exc:
+            raise ReadFileError(self.file_path) from exc
+        return transactions
+
+    def load_entries(self, transaction: Transaction) -> Optional[List[TransactionEntry]]:
+        """Load the entries associated to a transaction
+
+        As done when reading a transaction file, the compression state of each entry
+        is determined from the stored files, since they can be updated by newer
+        transactions.
+
+        :param transaction: The transaction object
+        :return: The list of associated entries if the transaction is indexed, else None
+        :raise:
+            :ReadFileError: Failed to read the index file
+        """
+        try:
+            connection = self._connect()
+            if not connection.execute(
+                "SELECT 1 FROM transactions WHERE id = ?", (transaction.id,)
+            ).fetchone():
+                return None
+            rows = connection.execute(
+                "SELECT file_name, file_hash, source FROM entries "
+                "WHERE transaction_id = ? ORDER BY rowid",
+                (transaction.id,),
+            )
+            return [
+                TransactionEntry.load(self.store, file_name, file_hash, source)
+                for file_name, file_hash, source in rows
+            ]
+        except sqlite3.Error as exc:
+            raise ReadFileError(self.file_path) from exc
+
+    def close(self) -> None:
+        """Close the index database and forget its validity state"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._valid = None
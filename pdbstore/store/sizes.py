@@ -0,0 +1,136 @@
+""" Collect the size of all files stored in a symbol store.
+"""
+
+import concurrent.futures as cf
+import os
+
+from pdbstore import const
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.store.entry import TransactionEntry
+from pdbstore.typing import Dict, Optional, Tuple
+
+__all__ = ["StoreSizes"]
+
+# Key identifying a stored file: file name and file hash
+FileKey = Tuple[str, str]
+
+
+class StoreSizes:
+    """Size map of all files stored in a symbol store.
+
+    The store tree is walked once, in parallel across the file name directories,
+    so each stored file is stat'ed only once whatever the number of transactions
+    referencing it. The map is built on first access.
+    """
+
+    def __init__(
+        self, store: "Store", jobs: Optional[int] = None  # type: ignore[name-defined] # noqa: F821
+    ):
+        """Initialize an empty size map
+
+        :param store: The symbol store to be scanned
+        :param jobs: Maximum number of directories scanned simultaneously. If None,
+            the default number of workers is used.
+        """
+        self.store: "Store" = store  # type: ignore[name-defined] # noqa: F821
+        self.jobs: Optional[int] = jobs or None
+        self._sizes: Optional[Dict[FileKey, Tuple[int, bool]]] = None
+
+    @staticmethod
+    def _scan_file_dir(dir_path: str, file_name: str) -> Dict[FileKey, Tuple[int, bool]]:
+        """Scan the directory associated to a file name
+
+        :param dir_path: Path to the file name directory
+        :param file_name: The file name
+        :return: Dictionary containing the stored size and the compression state
+            given by the file name and hash
+        """
+        sizes: Dict[FileKey, Tuple[int, bool]] = {}
+        compressed_name = file_name[:-1] + "_"
+        try:
+            with os.scandir(dir_path) as hash_dirs:
+                for hash_dir in hash_dirs:
+                    if not hash_dir.is_dir():
+                        continue
+                    with os.scandir(hash_dir.path) as stored_files:
+                        for stored_file in stored_files:
+                            if stored_file.name not in (file_name, compressed_name):
+                                continue
+                            if not stored_file.is_file():
+                                continue
+                            sizes[(file_name, hash_dir.name)] = (
+                                stored_file.stat().st_size,
+                                stored_file.name != file_name,
+                            )
+        except OSError as exc:
+            PDBStoreOutput().debug(f"{dir_path}: {exc}")
+        return sizes
+
+    def _scan(self) -> Dict[FileKey, Tuple[int, bool]]:
+        """Walk the store tree
+
+        :return: Dictionary containing the stored size and the compression state
+            given by the file name and hash
+        """
+        sizes: Dict[FileKey, Tuple[int, bool]] = {}
+        try:
+            with os.scandir(self.store.rootdir) as entries:
+                file_dirs = [
+                    entry
+                    for entry in entries
+                    if entry.name != const.ADMIN_DIRNAME and entry.is_dir()
+                ]
+        except OSError as exc:
+            PDBStoreOutput().debug(f"{self.store.rootdir}: {exc}")
+            return sizes
+
+        with cf.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for result in executor.map(
+                self._scan_file_dir,
+                [entry.path for entry in file_dirs],
+                [entry.name for entry in file_dirs],
+            ):
+                sizes.update(result)
+        return sizes
+
+    def _map(self) -> Dict[FileKey, Tuple[int, bool]]:
+        """Retrieve the size map, walking the store tree if not done yet"""
+        if self._sizes is None:
+            self._sizes = self._scan()
+        return self._sizes
+
+    def build(self) -> int:
+        """Walk the store tree and collect the size of all stored files
+
+        :return: The total number of stored files
+        """
+        self._sizes = self._scan()
+        return len(self._sizes)
+
+    def get(self, file_name: str, file_hash: str) -> Optional[Tuple[int, bool]]:
+        """Retrieve the size of a stored file
+
+        :param file_name: The file name
+        :param file_hash: The file hash
+        :return: A tuple containing the stored size and True if the file is stored
+            compressed, else False, or None if the file is not stored
+        """
+        return self._map().get((file_name, file_hash))
+
+    def disk_usage(self, entry: TransactionEntry) -> int:
+        """Retrieve the disk space used by a transaction entry
+
+        The stored file is only stat'ed if it was not found while walking the store
+        tree, such as a file stored after the map was built.
+
+        :param entry: The transaction entry
+        :return: The disk space usage in bytes
+        """
+        stored = self.get(entry.file_name, entry.file_hash)
+        if stored is None or stored[1] != entry.compressed:
+            return entry.get_disk_usage()
+        return stored[0]
+
+    def reset(self) -> None:
+        """Forget the size map, so the store tree is walked again"""
+        self._sizes = None
@@ -0,0 +1,97 @@
+""" Manage the status markers of the transactions.
+"""
+
+import os
+
+from pdbstore.io.output import PDBStoreOutput
+from pdbstore.typing import Optional, Set
+
+__all__ = ["StoreStatus"]
+
+
+class StoreStatus:
+    """Snapshot of the deleted and promoted transactions.
+
+    Deleted and promoted transactions are tagged by ``.deleted`` and ``.promoted``
+    marker files in the admin directory. Instead of checking the marker files of
+    each transaction, the admin directory is scanned once and the snapshot is
+    updated each time a transaction is marked from this store.
+
+    No snapshot is available if the admin directory cannot be scanned.
+    """
+
+    DELETED_SUFFIX: str = ".deleted"
+    PROMOTED_SUFFIX: str = ".promoted"
+
+    def __init__(self, store: "Store"):  # type: ignore[name-defined] # noqa: F821
+        self.store: "Store" = store  # type: ignore[name-defined] # noqa: F821
+        self._deleted: Optional[Set[str]] = None
+        self._promoted: Optional[Set[str]] = None
+
+    def _load(self) -> bool:
+        """Scan the admin directory if not done yet
+
+        :return: True if the snapshot is available, else False
+        """
+        if self._deleted is not None:
+            return True
+
+        deleted: Set[str] = set()
+        promoted: Set[str] = set()
+        try:
+            with os.scandir(self.store.admin_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.DELETED_SUFFIX):
+                        deleted.add(entry.name[: -len(self.DELETED_SUFFIX)])
+                    elif entry.name.endswith(self.PROMOTED_SUFFIX):
+                        promoted.add(entry.name[: -len(self.PROMOTED_SUFFIX)])
+        except OSError as exc:
+            PDBStoreOutput().debug(f"{self.store.admin_dir}: {exc}")
+            return False
+
+        self._deleted = deleted
+        self._promoted = promoted
+        return True
+
+    def is_deleted(self, transaction_id: str) -> Optional[bool]:
+        """Determine whether a transaction is tagged as deleted or not
+
+        :param transaction_id: The transaction id
+        :return: True if the transaction is tagged as deleted, False if not, or None
+            if no snapshot is available
+        """
+        if not self._load() or self._deleted is None:
+            return None
+        return transaction_id in self._deleted
+
+    def is_promoted(self, transaction_id: str) -> Optional[bool]:
+        """Determine whether a transaction is tagged as promoted or not
+
+        :param transaction_id: The transaction id
+        :return: True if the transaction is tagged as promoted, False if not, or None
+            if no snapshot is available
+        """
+        if not self._load() or self._promoted is None:
+            return None
+        return transaction_id in self._promoted
+
+    def set_deleted(self, transaction_id: str) -> None:
+        """Record a new deleted transaction into the snapshot
+
+        :param transaction_id: The transaction id
+        """
+        if self._deleted is not None:
+            self._deleted.add(transaction_id)
+
+    def set_promoted(self, transaction_id: str) -> None:
+        """Record a new promoted transaction into the snapshot
+
+        :param transaction_id: The transaction id
+        """
+        if self._promoted is not None:
+            self._promoted.add(transaction_id)
+
+    def reset(self) -> None:
+        """Forget the snapshot, so the admin directory is scanned again"""
+        self._deleted = None
+        self._promoted = None
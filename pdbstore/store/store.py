@@ -4,14 +4,29 @@ from pathlib import Path
 
 from pdbstore import const, exceptions, util
 from pdbstore.io import file
+from pdbstore.io.copy import LinkMode
 from pdbstore.io.output import PDBStoreOutput
+from pdbstore.store.compression import CompressionPolicy
 from pdbstore.store.entry import TransactionEntry
 from pdbstore.store.history import History
+from pdbstore.store.index import StoreIndex
+from pdbstore.store.status import StoreStatus
 from pdbstore.store.summary import OpStatus, Summary
 from pdbstore.store.transaction import Transaction
 from pdbstore.store.transaction_type import TransactionType
-from pdbstore.store.transactions import Transactions
-from pdbstore.typing import Callable, Generator, List, Optional, PathLike, Tuple, Union
+from pdbstore.store.transactions import FilesUsage, Transactions
+from pdbstore.typing import (
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    PathLike,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 __all__ = ["Store"]
 
@@ -23,6 +38,8 @@ class Store:
         self.rootdir: Path = util.str_to_path(store_path)
         self.transactions: Transactions = Transactions(self)
         self.history = History(self)
+        self.index: StoreIndex = StoreIndex(self)
+        self.status: StoreStatus = StoreStatus(self)
         self._next_transaction_id: Optional[str] = None
 
     @property
@@ -31,6 +48,11 @@ class Store:
         admin_dir_path = self.rootdir / const.ADMIN_DIRNAME
         return admin_dir_path
 
+    @property
+    def index_file_path(self) -> Path:
+        """Retrieve the full path name of the persistent index file"""
+        return self.admin_dir / const.INDEX_FILENAME
+
     @property
     def last_id_file_path(self) -> Path:
         """Retrieve the full path name of lastid.txt"""
@@ -41,6 +63,11 @@ class Store:
         """Retrieve the full path name of history.txt"""
         return self.admin_dir / const.HISTORY_FILENAME
 
+    @property
+    def report_file_path(self) -> Path:
+        """Retrieve the full path name of the report snapshot file"""
+        return self.rootdir / const.REPORT_FILENAME
+
     @property
     def server_file_path(self) -> Path:
         """Retrieve the full path name of server.txt"""
@@ -51,6 +78,19 @@ class Store:
         """Retrieve the full path name of pingme.txt"""
         return self.rootdir / const.PINGME_FILENAME
 
+    @property
+    def files_index(self) -> FilesUsage:
+        """Retrieve the index of transactions given by file name and hash.
+
+        The index is built from all registered transactions the first time it
+        is requested, then it is kept up to date each time a transaction is
+        committed or deleted.
+
+        :return: A :class:`FilesUsage <pdbstore.store.transactions.FilesUsage>` object
+        """
+        usage: FilesUsage = self.transactions.usage
+        return usage
+
     @property
     def next_transaction_id(self) -> str:
         """Generate next valid transaction id
@@ -148,25 +188,107 @@ class Store:
         """
         # Retrieve the Transition object assocaited the specified id
         transaction: Transaction = self.find_transaction(transaction_id, TransactionType.ADD)
+        return self._delete([transaction], dry_run)[0]
+
+    def delete_transactions(
+        self, transaction_ids: Sequence[Union[str, int]], dry_run: bool = False
+    ) -> Summary:
+        """Delete several existing transactions given by their id
+
+        Files usage is computed once, the server file is rewritten once and all
+        new entries are appended to the history file at once.
+
+        :param transaction_ids: The transaction ids to be deleted.
+        :param dry_run: True to just print the list of files to be deleted,
+                        else False to delete the requested transactions.
+        :return: A :class:`Summary <pdbstore.store.summary.Summary>` object for the
+            first transaction, linked to the summaries of the next ones. Transactions
+            which cannot be deleted are reported as failed, and repeated ids as
+            skipped.
+        :raise:
+            :WriteFileError: An error occurs when updating global file.
+        """
+        transactions: List[Transaction] = []
+        found_ids: Set[str] = set()
+        unprocessed: Dict[int, Summary] = {}
+        for pos, transaction_id in enumerate(transaction_ids):
+            try:
+                transaction = self.find_transaction(transaction_id, TransactionType.ADD)
+            except exceptions.PDBStoreException as exc:
+                PDBStoreOutput().error(str(exc))
+                unprocessed[pos] = Summary(
+                    str(transaction_id), OpStatus.FAILED, TransactionType.DEL, str(exc)
+                )
+                continue
+            if transaction.id in found_ids:
+                # Already deleted by this operation
+                PDBStoreOutput().warning(f"{transaction.id}: duplicate transaction id, skipped")
+                unprocessed[pos] = Summary(
+                    transaction.id,
+                    OpStatus.SKIPPED,
+                    TransactionType.DEL,
+                    f"duplicate transaction id {transaction_id}",
+                )
+                continue
+            found_ids.add(str(transaction.id))
+            transactions.append(transaction)
+
+        deleted = iter(self._delete(transactions, dry_run) if transactions else [])
+        head: Optional[Summary] = None
+        tail: Optional[Summary] = None
+        for pos in range(len(transaction_ids)):
+            summary = unprocessed[pos] if pos in unprocessed else next(deleted)
+            if tail:
+                tail.linked = summary
+            else:
+                head = summary
+            tail = summary
+
+        return head or Summary(None, OpStatus.SKIPPED, TransactionType.DEL)
+
+    def _delete(self, transactions: List[Transaction], dry_run: bool) -> List[Summary]:
+        """Delete several transactions
+
+        :param transactions: The transactions to be deleted.
+        :param dry_run: True to just print the list of files to be deleted,
+                        else False to delete the requested transactions.
+        :return: A :class:`Summary <pdbstore.store.summary.Summary>` object for each
+            transaction
+        :raise:
+            :WriteFileError: An error occurs when updating global file.
+        """
+        # Check the persistent index before updating the server file
+        self.index.is_valid()
+
+        # Remove the transitions from the server file
+        summaries = self.transactions.delete_many(transactions, dry_run)
+        if dry_run:
+            return summaries
+
+        first_id = int(self.next_transaction_id)
+        deletions = []
+        for pos, transaction in enumerate(transactions):
+            # Unregister the transaction from the persistent index
+            self.index.delete(transaction)
 
-        # Remove the transition from the history file
-        summary = self.transactions.delete(transaction, dry_run)
-        if not dry_run:
             # Tag the transition as deleted on the disk
             transaction.mark_deleted()
+            deletions.append((transaction, f"{first_id + pos:010}"))
 
-            # Add new del entry in the history file
-            next_transaction_id = self.next_transaction_id
-            self.history.delete(transaction, next_transaction_id)
+        # Add new del entries in the history file
+        self.history.delete_many(deletions)
 
-            self._update_global(next_transaction_id)
-        return summary
+        self._update_global(deletions[-1][1])
+        return summaries
 
     def commit(
         self,
         transaction: Transaction,
         force: Optional[bool] = False,
         store: Optional["Store"] = None,
+        *,
+        compression: Optional[CompressionPolicy] = None,
+        link_mode: LinkMode = LinkMode.COPY,
     ) -> Summary:
         """Commit a transaction on the disk.
 
@@ -181,6 +303,11 @@ class Store:
             file will be overwritten and the file will be associated to ``transaction``, else
             this function will only make the associated between the file and ``transaction``.
         :param store: Optional :class:`Store <pdbstore.store.store.Store>` object
+        :param compression: Optional
+            :class:`CompressionPolicy <pdbstore.store.compression.CompressionPolicy>`
+            object used to compress the files
+        :param link_mode: The :class:`LinkMode <pdbstore.io.copy.LinkMode>` used to
+            store the files promoted from ``store``
         :return: A :class:`Summary <pdbstore.store.summary.Summary>` object
         :raise:
             :UnexpectedError: Failed to create missing directories or update
@@ -200,13 +327,22 @@ class Store:
         # Commit the transaction on the disk
         now = round(time.time())
         summary = transaction.commit(
-            self.next_transaction_id, datetime.fromtimestamp(now), force, store
+            self.next_transaction_id,
+            datetime.fromtimestamp(now),
+            force,
+            store,
+            compression=compression,
+            link_mode=link_mode,
         )
         if summary.status == OpStatus.SUCCESS:
+            # Check the persistent index before updating the server file
+            self.index.is_valid()
             # Add the transaction into the server file
             self.transactions.add(transaction)
             # Add the transaction into the history file
             self.history.add(transaction)
+            # Register the transaction into the persistent index
+            self.index.add(transaction)
             # Update the last id and pingme files
             self._update_global(transaction.id)
 
@@ -233,13 +369,7 @@ class Store:
             return None
 
         # Search the first transaction where the file is referenced
-        for transaction in self.transactions.transactions.values():
-            for entry in transaction.entries:
-                if (entry.file_name, entry.file_hash) == dbg_info:
-                    return (transaction, entry)
-
-        # Not found
-        return None
+        return next(self._lookup(dbg_info[0], dbg_info[1]), None)
 
     def find_entries(
         self, file_path: PathLike, full: Optional[bool] = False
@@ -271,18 +401,33 @@ class Store:
 
         # Build the list of associated TransactionEntry object associated to
         # the specifie file path
-        for transaction in self.transactions.transactions.values():
-            for entry in transaction.entries:
-                if (entry.file_name, entry.file_hash) == (
-                    file_entry.file_name,
-                    file_entry.file_hash,
-                ):
-                    entries_list.append((transaction, entry))
-                    if not full:
-                        break
+        for transaction, entry in self._lookup(file_entry.file_name, file_entry.file_hash):
+            entries_list.append((transaction, entry))
+            if not full:
+                break
 
         return entries_list
 
+    def _lookup(
+        self, file_name: str, file_hash: str
+    ) -> Generator[Tuple[Transaction, TransactionEntry], None, None]:
+        """Iterate over all transaction entries associated to a file name and hash.
+
+        :param file_name: The file name to be found
+        :param file_hash: The required file hash associated to `file_name`
+        """
+        if self.index.is_valid():
+            trans_ids = self.index.find(file_name, file_hash)
+        else:
+            trans_ids = self.files_index.find(file_name, file_hash)
+        for trans_id in trans_ids:
+            transaction = self.transactions.find(trans_id)
+            if not transaction:
+                continue  # pragma: no cover
+            entry = transaction.find_entry(file_name, file_hash)
+            if entry:
+                yield (transaction, entry)
+
     def _update_global(self, transaction_id: str) -> None:
         """Update lastid and pingme files
 
@@ -346,29 +491,10 @@ class Store:
         self.next_transaction_id  # pylint: disable=pointless-statement
 
         # Need to delete some transactions
-        summary: Optional[Summary] = None
-        next_summary: Optional[Summary] = None
         transactions = transactions[:-keep]
-        for transaction in transactions:
-            try:
-                trans_summary = self.delete_transaction(int(transaction.id), dry_run)
-            except exceptions.TransactionNotFoundError:
-                PDBStoreOutput().warning(f"no transaction with id '{transaction.id}' found")
-                trans_summary = Summary(
-                    transaction.id,
-                    OpStatus.FAILED,
-                    TransactionType.DEL,
-                    f"no transaction with id '{transaction.id}' found",
-                )
-
-            if next_summary:
-                next_summary.linked = trans_summary
-                next_summary = trans_summary
-            else:
-                summary = trans_summary
-            next_summary = trans_summary
-
-        return summary or Summary()
+        if not transactions:
+            return Summary()
+        return self.delete_transactions([int(t.id) for t in transactions], dry_run)
 
     def iterator(
         self, filter_cb: Optional[Callable[[Transaction], bool]] = None
@@ -383,13 +509,19 @@ class Store:
                     yield (transaction, entry)
 
     def promote_transaction(
-        self, transaction: Transaction, comment: Optional[str] = None
+        self,
+        transaction: Transaction,
+        comment: Optional[str] = None,
+        link_mode: LinkMode = LinkMode.COPY,
     ) -> Summary:
         """Copy an existing transaction from another store.
 
         This function will clone the ``transaction`` object,
         :param transaction: The :class:`Transaction <pdbstore.store.transaction.Transaction>`
         object to be copied.
+        :param comment: Optional comment for the new transaction
+        :param link_mode: The :class:`LinkMode <pdbstore.io.copy.LinkMode>` used to
+            store the files
         :return: The new :class:`Transaction <pdbstore.store.transaction.Transaction>` object
         from the store
         """
@@ -414,7 +546,7 @@ class Store:
         for entry in transaction.entries:
             new_transaction.add_entry(entry.clone(self, True))
 
-        summary = self.commit(new_transaction, True, transaction.store)
+        summary = self.commit(new_transaction, True, transaction.store, link_mode=link_mode)
         if summary.status == OpStatus.SUCCESS:
             transaction.mark_promoted()
         return summary
@@ -429,3 +561,5 @@ class Store:
         self.transactions.reset()
         self.history.reset()
         self._next_transaction_id = None
+        self.index.close()
+        self.status.reset()
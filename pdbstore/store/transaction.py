@@ -15,15 +15,21 @@ from pdbstore.exceptions import (
     RenameFileError,
     WriteFileError,
 )
+from pdbstore.io.copy import LinkMode
 from pdbstore.io.output import PDBStoreOutput
+from pdbstore.store.compression import CompressionPolicy
 from pdbstore.store.entry import TransactionEntry
 from pdbstore.store.summary import OpStatus, Summary
 from pdbstore.store.transaction_type import TransactionType
-from pdbstore.typing import List, Optional, PathLike, Tuple, Union
+from pdbstore.typing import Dict, List, Optional, PathLike, Sequence, Tuple, Union
 
 __all__ = ["Transaction"]
 
 
+# Format of date/time from server and history files
+TIMESTAMP_FORMAT = "%m/%d/%Y,%H:%M:%S"
+
+
 class TransactionRegEx:
     """Constant related to transaction decryption"""
 
@@ -57,7 +63,9 @@ class Transaction:
         self.transactions_entries: List[TransactionEntry] = []
         self.transaction_id: str = transaction_id  # type: ignore[assignment]
         self.ref: str = ref
-        self.timestamp: Union[datetime, None] = timestamp
+        self._timestamp: Union[datetime, None] = timestamp
+        # Timestamp as read from a text file, only parsed when required
+        self._timestamp_text: Optional[str] = None
         self.product: Union[str, None] = product
         self.version: Union[str, None] = version
         self.comment: Union[str, None] = comment
@@ -79,6 +87,34 @@ class Transaction:
         """
         return self.transaction_id
 
+    @property
+    def timestamp(self) -> Union[datetime, None]:
+        """Retrieve transaction date/time
+
+        The date/time read from a server or history file is only parsed the first
+        time it is requested.
+
+        :return: The transaction date/time if defined, else None
+        """
+        if self._timestamp is None and self._timestamp_text is not None:
+            try:
+                self._timestamp = datetime.strptime(self._timestamp_text, TIMESTAMP_FORMAT)
+            except ValueError:
+                PDBStoreOutput().debug(
+                    f"{self._timestamp_text} : invalid timestamp for {self.transaction_id}"
+                )
+            self._timestamp_text = None
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: Union[datetime, None]) -> None:
+        """Define transaction date/time
+
+        :param timestamp: The new transaction date/time
+        """
+        self._timestamp = timestamp
+        self._timestamp_text = None
+
     def is_committed(self) -> bool:
         """Determine whether the transaction is committed or not
 
@@ -100,6 +136,9 @@ class Transaction:
             return True
         if not self.is_committed():
             return False
+        status: Optional[bool] = self.store.status.is_deleted(self.transaction_id)
+        if status is not None:
+            return status
         deleted_path: Path = Path(f"{self._entries_file_path()}.deleted")
         if deleted_path.exists():
             return True
@@ -111,6 +150,9 @@ class Transaction:
         :return: True if it is a promoted transaction, else False."""
         if not self.is_committed():
             return False
+        status: Optional[bool] = self.store.status.is_promoted(self.transaction_id)
+        if status is not None:
+            return status
         promoted_path: Path = Path(f"{self._entries_file_path()}.promoted")
         if promoted_path.exists():
             return True
@@ -129,6 +171,11 @@ class Transaction:
         if not self.is_committed():
             return []
 
+        if self.store.index.is_valid():
+            indexed: Optional[List[TransactionEntry]] = self.store.index.load_entries(self)
+            if indexed is not None:
+                return indexed
+
         file_path: Path = self._entries_file_path()
         if not file_path.exists():
             return []
@@ -175,6 +222,55 @@ class Transaction:
         self.add_entry(new_entry)
         return True
 
+    def register_entries(
+        self,
+        pathnames: Sequence[PathLike],
+        compress: bool = False,
+        jobs: Optional[int] = None,
+    ) -> List[Tuple[PathLike, Union[bool, Exception]]]:
+        """Register several new transaction entries
+
+        Files are identified in parallel, but the entries are registered, and the
+        results are reported, in the same order as ``pathnames``.
+
+        :param pathnames: List of paths to the files
+        :param compress: True to compress them, else False
+        :param jobs: Maximum number of files identified simultaneously. If None or 0,
+            the default number of workers is used. If 1, files are identified serially.
+        :return: List of tuples containing, for each file, its path and either the
+            :meth:`register_entry` result or the raised exception.
+        """
+
+        def _identify(pathname: PathLike) -> Union[Optional[str], Exception]:
+            try:
+                return io.file.compute_hash_key(pathname)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                return exc
+
+        if jobs == 1:
+            hash_values = [_identify(pathname) for pathname in pathnames]
+        else:
+            with cf.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+                hash_values = list(executor.map(_identify, pathnames))
+
+        results: List[Tuple[PathLike, Union[bool, Exception]]] = []
+        for pathname, hash_value in zip(pathnames, hash_values):
+            if isinstance(hash_value, Exception):
+                results.append((pathname, hash_value))
+                continue
+            if hash_value:
+                self.add_entry(
+                    TransactionEntry(
+                        self.store,
+                        os.path.basename(os.fspath(pathname)),
+                        hash_value,
+                        pathname,
+                        compress,
+                    )
+                )
+            results.append((pathname, bool(hash_value)))
+        return results
+
     @property
     def entries(self) -> List[TransactionEntry]:
         """Retrieve the list of associated entries
@@ -221,14 +317,25 @@ class Transaction:
         entry: TransactionEntry,
         force: Optional[bool] = False,
         store: Optional["Store"] = None,  # type: ignore[name-defined] # noqa F821
-    ) -> Tuple[TransactionEntry, Union[OpStatus, PDBStoreException]]:
+        compression: Optional[CompressionPolicy] = None,
+        link_mode: LinkMode = LinkMode.COPY,
+    ) -> Tuple[TransactionEntry, Union[OpStatus, PDBStoreException], Dict[str, str]]:
+        details: Dict[str, str] = {}
+        compress_level: Optional[int] = None
+        if compression is not None and entry.compressed and store is None:
+            entry.compressed, details["compression"] = compression.decide(entry.source_file)
+            compress_level = compression.level
         try:
-            return (
-                entry,
-                OpStatus.SUCCESS if entry.commit(force, store) else OpStatus.SKIPPED,
+            status = (
+                OpStatus.SUCCESS
+                if entry.commit(force, store, compress_level=compress_level, link_mode=link_mode)
+                else OpStatus.SKIPPED
             )
         except PDBStoreException as exc:  # pragma: no cover
-            return (entry, exc)
+            return (entry, exc, details)
+        if entry.link_method is not None:
+            details["link"] = entry.link_method.value
+        return (entry, status, details)
 
     def commit(
         self,
@@ -236,6 +343,9 @@ class Transaction:
         timestamp: datetime,
         force: Optional[bool] = False,
         store: Optional["Store"] = None,  # type: ignore[name-defined] # noqa F821
+        *,
+        compression: Optional[CompressionPolicy] = None,
+        link_mode: LinkMode = LinkMode.COPY,
     ) -> Summary:
         """Save the transaction on the disk.
 
@@ -251,6 +361,14 @@ class Transaction:
         :param force: If **True** and a file is already present in the store, the existing
             file will be overwritten and the file will be associated to ``transaction``, else
             this function will only make the associated between the file and ``transaction``.
+        :param compression: Optional
+            :class:`CompressionPolicy <pdbstore.store.compression.CompressionPolicy>`
+            object used to compress the entries requiring compression. Such entries
+            are compressed by a dedicated pool of workers and the decision taken for
+            each of them is recorded in the summary.
+        :param link_mode: The :class:`LinkMode <pdbstore.io.copy.LinkMode>` used to
+            store the files promoted from ``store``. The method used for each file is
+            recorded in the summary.
         :return: True if successful, else False
         :raise:
             :WriteFileError: Failed to update history file
@@ -273,17 +391,28 @@ class Transaction:
         self.timestamp = timestamp
         self.transaction_id = transaction_id
 
-        # publish all entries files to the store
-        with cf.ThreadPoolExecutor() as executor:
-            for result in executor.map(
-                lambda entry: Transaction.__commit_entry(entry, force, store),
-                self.entries,
-            ):
+        # publish all entries files to the store, compressed files being
+        # handled by a dedicated pool if a compression policy is given
+        with cf.ThreadPoolExecutor() as executor, cf.ThreadPoolExecutor(
+            max_workers=compression.workers if compression is not None else 1
+        ) as compress_executor:
+            futures = [
+                (
+                    compress_executor
+                    if compression is not None and entry.compressed and store is None
+                    else executor
+                ).submit(Transaction.__commit_entry, entry, force, store, compression, link_mode)
+                for entry in self.entries
+            ]
+            for future in futures:
+                result = future.result()
+                extra = result[2]
                 if isinstance(result[1], OpStatus):
                     summary.add_entry(
                         result[0],
                         result[1],
                         TransactionType.ADD,
+                        **extra,
                     )
                     if result[1] == OpStatus.SUCCESS:
                         summary.status = OpStatus.SUCCESS
@@ -293,6 +422,7 @@ class Transaction:
                         result[0],
                         OpStatus.FAILED,
                         TransactionType.ADD,
+                        **extra,
                     )
                     PDBStoreOutput().error(result[1])
 
@@ -325,6 +455,7 @@ class Transaction:
             os.rename(src, dest)
         except OSError as ex:  # pragma: no cover
             raise RenameFileError(src, dest) from ex
+        self.store.status.set_deleted(self.transaction_id)
 
     def mark_promoted(self) -> None:
         """Tag this transaction as promoted
@@ -346,6 +477,7 @@ class Transaction:
             shutil.copyfile(src, dest)
         except IOError as ex:  # pragma: no cover
             raise RenameFileError(src, dest) from ex
+        self.store.status.set_promoted(self.transaction_id)
 
     def __str__(self) -> str:
         """Get transaction as a string
@@ -360,13 +492,16 @@ class Transaction:
                 return ""
             return f"{self.transaction_id},{self.transaction_type.value},{self.deleted_id}"
 
-        if not self.timestamp:
+        if self._timestamp is None and self._timestamp_text is not None:
+            # Reuse the date/time as it was read
+            stamp = self._timestamp_text
+        elif self.timestamp:
+            stamp = self.timestamp.strftime(TIMESTAMP_FORMAT)
+        else:
             return ""
-        date_stamp = self.timestamp.strftime("%m/%d/%Y")
-        time_stamp = self.timestamp.strftime("%H:%M:%S")
 
         # pylint: disable=line-too-long
-        return f'{self.transaction_id},{self.transaction_type.value},{self.ref},{date_stamp},{time_stamp},"{self.product}","{self.version}","{self.comment}",'
+        return f'{self.transaction_id},{self.transaction_type.value},{self.ref},{stamp},"{self.product}","{self.version}","{self.comment}",'
 
     def __repr__(self) -> str:
         """Get text representation from a Transaction object."""
@@ -384,41 +519,83 @@ class Transaction:
         :return: The corresponding Transaction object if successful, else None
         """
 
-        line_res = TransactionRegEx.TRANSACTION_PREFIX_RE.match(line)
-        if not line_res:
+        # Fast path: split the line on its fixed comma positions
+        fields = line.split(",", 2)
+        if (
+            len(fields) != 3
+            or not fields[0].isdecimal()
+            or fields[1] not in (TransactionType.ADD.value, TransactionType.DEL.value)
+        ):
             return None
+        transaction_id, transaction_type, tail = fields
 
-        transaction_id = line_res.group("id")
-        transaction_type = line_res.group("type")
         if transaction_type == TransactionType.ADD.value:
-            add_res = TransactionRegEx.TRANSACTION_ADD_RE.match(line_res.group("tail"))
-            if not add_res:
-                return None
+            add_fields = Transaction._split_add(tail)
+            if add_fields is None:
+                # Slow path for unusual lines
+                add_res = TransactionRegEx.TRANSACTION_ADD_RE.match(tail)
+                if not add_res:
+                    return None
+                add_fields = (
+                    add_res.group("ref"),
+                    add_res.group("timestamp"),
+                    add_res.group("product"),
+                    add_res.group("version"),
+                    add_res.group("comment"),
+                )
 
-            timestamp = datetime.strptime(add_res.group("timestamp"), "%m/%d/%Y,%H:%M:%S")
-            return Transaction(
+            transaction = Transaction(
                 store,
                 transaction_id,
                 TransactionType.ADD,
-                add_res.group("ref"),
-                timestamp,
-                add_res.group("product"),
-                add_res.group("version"),
-                add_res.group("comment"),
+                add_fields[0],
+                None,
+                add_fields[2],
+                add_fields[3],
+                add_fields[4],
             )
-
-        del_res = TransactionRegEx.TRANSACTION_DEL_RE.match(line_res.group("tail"))
-        if not del_res:
-            PDBStoreOutput().debug(f"failed to decompress del type ({line_res.groupdict()})")
-            return None
+            transaction._timestamp_text = add_fields[1]  # pylint: disable=protected-access
+            return transaction
+
+        del_id = tail.split(",", 1)[0]
+        if not del_id.isdecimal():
+            del_res = TransactionRegEx.TRANSACTION_DEL_RE.match(tail)
+            if not del_res:
+                PDBStoreOutput().debug(f"failed to decompress del type ({line})")
+                return None
+            del_id = del_res.group("id")
 
         return Transaction(
             store,
             transaction_id,
             TransactionType.DEL,
-            deleted_id=del_res.group("id"),
+            deleted_id=del_id,
         )
 
+    @staticmethod
+    def _split_add(tail: str) -> Optional[Tuple[str, str, str, str, str]]:
+        """Split the fields of an 'add' line without regular expression.
+
+        :param tail: The line content following the transaction type
+        :return: A tuple containing the reference type, the date/time, the product
+            name, the product version and the comment if the line has the expected
+            layout, else None
+        """
+        # ref,MM/DD/YYYY,HH:MM:SS,"product","version","comment",...
+        parts = tail.split('"', 7)
+        if len(parts) < 7 or parts[2] != "," or parts[4] != "," or parts[6][:1] != ",":
+            return None
+        ref, _, stamp = parts[0].partition(",")
+        if ref not in ("file", "ptr") or len(stamp) != 20 or stamp[-1] != ",":
+            return None
+        stamp = stamp[:-1]
+        digits = stamp[0:2] + stamp[3:5] + stamp[6:10] + stamp[11:13] + stamp[14:16] + stamp[17:]
+        if stamp[2] + stamp[5] + stamp[10] + stamp[13] + stamp[16] != "//,::" or not (
+            digits.isdecimal()
+        ):
+            return None
+        return ref, stamp, parts[1], parts[3], parts[5]
+
     def compute_disk_usage(self) -> int:
         """Compute the disk space usage related to all files associated to
         this transaction
@@ -18,10 +18,20 @@ __all__ = ["FilesUsage", "Transactions"]
 
 
 class FilesUsage:
-    """Manage dictionary with all transactions for each file"""
+    """Manage reference counts of all files given by their name and hash.
+
+    For each file, the set of transactions referencing it is kept in registration
+    order, so both the reference count and the owning transactions can be found
+    in constant time. The structure is updated incrementally each time a
+    transaction is registered or unregistered.
+    """
 
     def __init__(self) -> None:
-        self.entries: Dict[Tuple[str, str], List[str]] = {}
+        self.entries: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        """Retrieve the number of referenced files"""
+        return len(self.entries)
 
     def add_entry(self, entry: TransactionEntry, transaction: Transaction) -> None:
         """Add a new transaction entry given its associated transaction object
@@ -29,32 +39,93 @@ class FilesUsage:
         :param entry: The transaction entry object to add
         :param transaction: The transaction object associated to ``entry``
         """
-        key = (entry.file_name, entry.file_hash)
-        if key not in self.entries:
-            self.entries[key] = []
-
+        owners = self.entries.setdefault((entry.file_name, entry.file_hash), {})
         if transaction.id:
-            self.entries[key].append(transaction.id)
+            owners[transaction.id] = owners.get(transaction.id, 0) + 1
+
+    def add_transaction(self, transaction: Transaction) -> None:
+        """Register all entries associated to a transaction
+
+        :param transaction: The transaction object to be registered
+        """
+        for entry in transaction.entries:
+            self.add_entry(entry, transaction)
+
+    def remove_transaction(self, transaction: Transaction) -> None:
+        """Unregister all entries associated to a transaction
+
+        :param transaction: The transaction object to be unregistered
+        """
+        for entry in transaction.entries:
+            key = (entry.file_name, entry.file_hash)
+            owners = self.entries.get(key)
+            if not owners:
+                continue
+            owners.pop(str(transaction.id), None)
+            if not owners:
+                del self.entries[key]
+
+    def find(self, file_name: str, file_hash: str) -> List[str]:
+        """Retrieve the list of transactions associated to a file
+
+        :param file_name: The file name to be found
+        :param file_hash: The required file hash associated to `file_name`
+        :return: List of transaction ids referencing the file, in registration order
+        """
+        return list(self.entries.get((file_name, file_hash), {}))
+
+    def refcount(self, file_name: str, file_hash: str) -> int:
+        """Retrieve the number of transactions referencing a file
+
+        :param file_name: The file name to be found
+        :param file_hash: The required file hash associated to `file_name`
+        :return: The number of transactions referencing the file
+        """
+        return len(self.entries.get((file_name, file_hash), {}))
 
     def find_unused_entries(self, transaction: Transaction) -> List[Tuple[str, str]]:
         """Determine the list of entries that are not used anymore from a transaction
 
-        This function will loop over all registered entries and check
-        how many transactions are associated to each file. When an entry
-        is referenced only once, this function will consider it as unused.
+        This function will only check the entries of the transaction. When an entry
+        is referenced by this transaction only, this function will consider it as
+        unused.
 
         :param transaction: A :class:`Transaction <pdbstore.store.transaction.Transaction>` object
         :return: List of tuple pairs
         """
-        deleted_entries = []
+        return self.find_released_entries([transaction])[str(transaction.id)]
+
+    def find_released_entries(
+        self, transactions: List[Transaction]
+    ) -> Dict[str, List[Tuple[str, str]]]:
+        """Determine the entries that are not used anymore once several transactions
+        are deleted
+
+        An entry is released by the last transaction from ``transactions`` which
+        references it, if it is not referenced by any other transaction.
 
-        for entry, ids in self.entries.items():
-            if transaction.id in ids:
-                if len(ids) == 1:
-                    # The entry is used only by the input transaction
-                    deleted_entries.append(entry)
+        :param transactions: List of
+            :class:`Transaction <pdbstore.store.transaction.Transaction>` objects to be
+            deleted, in deletion order
+        :return: Dictionary containing the list of released entries given by the id
+            of the transaction releasing them
+        """
+        deleted_ids = {transaction.id for transaction in transactions}
+        owners: Dict[Tuple[str, str], str] = {}
+        for transaction in transactions:
+            for entry in transaction.entries:
+                key = (entry.file_name, entry.file_hash)
+                if deleted_ids.issuperset(self.entries.get(key, {})):
+                    # Move the entry to the last transaction referencing it
+                    owners.pop(key, None)
+                    owners[key] = str(transaction.id)
 
-        return deleted_entries
+        released: Dict[str, List[Tuple[str, str]]] = {
+            str(transaction.id): [] for transaction in transactions
+        }
+        for key, tid in owners.items():
+            released[tid].append(key)
+        return released
 
 
 class Transactions:
@@ -63,6 +134,7 @@ class Transactions:
     def __init__(self, store: "Store"):  # type: ignore[name-defined]  # noqa: F821
         self.store: "Store" = store  # type: ignore[name-defined] # noqa: F821
         self._transactions: Dict[str, Transaction] = {}
+        self._usage: Optional[FilesUsage] = None
 
     @property
     def count(self) -> int:
@@ -90,9 +162,13 @@ class Transactions:
             PDBStoreOutput().verbose(f"{str(self.store.server_file_path)} not found")
             return {}
 
+        if self.store.index.is_valid():
+            indexed: Dict[str, Transaction] = self.store.index.load_transactions()
+            return indexed
+
         transactions = {}
 
-        for line in file.read_text_file(self.store.server_file_path, True):
+        for line in file.iter_text_file(self.store.server_file_path):
             transaction = Transaction.parse_line(self.store, line)
             if transaction and transaction.id:
                 transactions[transaction.id] = transaction
@@ -131,11 +207,46 @@ class Transactions:
         fmap = FilesUsage()
 
         for transaction in self.transactions.values():
-            for entry in transaction.entries:
-                fmap.add_entry(entry, transaction)
+            fmap.add_transaction(transaction)
 
         return fmap
 
+    @property
+    def usage(self) -> FilesUsage:
+        """Retrieve the reference counts of all files.
+
+        The structure is built from all registered transactions the first time it
+        is requested, then it is kept up to date each time a transaction is added
+        or deleted.
+
+        :return: A :class:`FilesUsage` object
+        """
+        if self._usage is None:
+            self._usage = self.get_files_usage()
+        return self._usage
+
+    def _usage_of(self, transactions: List[Transaction]) -> FilesUsage:
+        """Retrieve the reference counts of the files used by some transactions.
+
+        If the reference counts are not loaded yet and if the persistent index is
+        valid, only the files referenced by ``transactions`` are queried from the
+        index, so the cost does not depend on the store size.
+
+        :param transactions: The list of transactions
+        :return: A :class:`FilesUsage` object containing at least the files used
+            by ``transactions``
+        """
+        if self._usage is not None or not self.store.index.is_valid():
+            return self.usage
+
+        usage = FilesUsage()
+        for transaction in transactions:
+            for entry in transaction.entries:
+                key = (entry.file_name, entry.file_hash)
+                if key not in usage.entries:
+                    usage.entries[key] = dict.fromkeys(self.store.index.find(*key), 1)
+        return usage
+
     def items(self) -> ItemsView[str, Transaction]:
         """Iterate over registered transactions given their ID
 
@@ -153,6 +264,8 @@ class Transactions:
             with open(self.store.server_file_path, "ab") as fps:
                 fps.write(f"{transaction}{os.linesep}".encode("utf-8"))
             self.transactions[transaction.transaction_id] = transaction
+            if self._usage is not None:
+                self._usage.add_transaction(transaction)
         except Exception as exc:
             raise WriteFileError(None, f"failed to append '{transaction}' in server file") from exc
 
@@ -166,47 +279,80 @@ class Transactions:
         :raise:
             :WriteFileError: Failed to update history file
         """
+        return self.delete_many([transaction], dry_run)[0]
+
+    def delete_many(self, transactions: List[Transaction], dry_run: bool = False) -> List[Summary]:
+        """Delete several transactions at once.
+
+        Files usage is computed once and the server file is rewritten once,
+        whatever the number of transactions.
+
+        :param transactions: The transactions to be deleted
+        :param dry_run: True to just print the list of files to be deleted,
+                        else False to delete the requested transactions.
+        :return: A :class:`Summary <pdbstore.store.summary.Summary>` object for each
+            deleted transaction
+        :raise:
+            :WriteFileError: Failed to update history file
+        """
         # Build the list of unused entries
-        unused_list = self.get_files_usage().find_unused_entries(transaction)
-
-        summary = Summary(
-            transaction.transaction_id,
-            OpStatus.SUCCESS,
-            TransactionType.DEL,
-            references=transaction.count,
-        )
-
-        # delete any unused files
-        for fname, fhash in unused_list:
-            # Remove the associated directory on the disk
-            dir_path: Path = self.store.rootdir / fname / fhash
-            if dir_path.is_dir():
-                summary.add_file(dir_path, OpStatus.SUCCESS)
-                if not dry_run:
-                    shutil.rmtree(os.fspath(dir_path))
-
-                    try:
-                        parent_dir = os.fspath(dir_path.parent)
-                        if len(os.listdir(parent_dir)) == 0:
-                            # Remove empty directory
-                            shutil.rmtree(parent_dir)
-                    except Exception as exc:  # pylint: disable=broad-except
-                        PDBStoreOutput().error(exc)
-            else:
-                summary.add_file(dir_path, OpStatus.SKIPPED)
+        released = self._usage_of(transactions).find_released_entries(transactions)
+
+        summaries = []
+        for transaction in transactions:
+            summary = Summary(
+                transaction.transaction_id,
+                OpStatus.SUCCESS,
+                TransactionType.DEL,
+                references=transaction.count,
+            )
+            # delete any unused files
+            for fname, fhash in released[str(transaction.id)]:
+                self._delete_directory(summary, self.store.rootdir / fname / fhash, dry_run)
+            summaries.append(summary)
         if dry_run:
-            return summary
+            return summaries
 
-        # create a list of transaction without the deleted transaction
-        new_transactions = [v for v in self._transactions.values() if v.id != transaction.id]
+        # create a list of transaction without the deleted transactions
+        deleted_ids = {transaction.id for transaction in transactions}
+        new_transactions = [v for v in self._transactions.values() if v.id not in deleted_ids]
 
-        # 'delete' transaction listing from server file
+        # 'delete' transactions listing from server file
         self._rewrite_server_file(new_transactions)
 
-        # Unregister the deleted transaction
-        del self._transactions[transaction.id]
+        # Unregister the deleted transactions
+        for transaction in transactions:
+            self._transactions.pop(str(transaction.id), None)
+            if self._usage is not None:
+                self._usage.remove_transaction(transaction)
+
+        return summaries
+
+    @staticmethod
+    def _delete_directory(summary: Summary, dir_path: Path, dry_run: bool) -> None:
+        """Remove the directory associated to an unused file
 
-        return summary
+        :param summary: The :class:`Summary <pdbstore.store.summary.Summary>` object
+            to be updated
+        :param dir_path: Path to the directory to be removed
+        :param dry_run: True to just report the directory, else False
+        """
+        if not dir_path.is_dir():
+            summary.add_file(dir_path, OpStatus.SKIPPED)
+            return
+
+        summary.add_file(dir_path, OpStatus.SUCCESS)
+        if dry_run:
+            return
+        shutil.rmtree(os.fspath(dir_path))
+
+        try:
+            parent_dir = os.fspath(dir_path.parent)
+            if len(os.listdir(parent_dir)) == 0:
+                # Remove empty directory
+                shutil.rmtree(parent_dir)
+        except Exception as exc:  # pylint: disable=broad-except
+            PDBStoreOutput().error(exc)
 
     def _rewrite_server_file(self, transactions: List[Transaction]) -> None:
         """Overwrite server file given a list of transactions
@@ -228,3 +374,4 @@ class Transactions:
     def reset(self) -> None:
         """Reset transactions to an empty dictionary."""
         self._transactions = {}
+        self._usage = None
@@ -1,5 +1,6 @@
 """The subpackage containing the builtin templates."""
 
+import functools
 import pkgutil
 import time
 from datetime import datetime
@@ -8,11 +9,19 @@ from jinja2 import Template
 
 import pdbstore
 from pdbstore.io.output import PDBStoreOutput
-from pdbstore.typing import Any, Optional, Union
+from pdbstore.typing import Any, Callable, Dict, IO, Optional
 
+# Size of the buffer used to write a rendered template into a file
+OUTPUT_BUFFER_SIZE = 1024 * 1024
 
-def get_template(report_type: str, output_format: str) -> Union[Template, None]:
+
+@functools.lru_cache(maxsize=None)
+def get_template(report_type: str, output_format: str) -> Optional[Template]:
     """Get a builtin template.
+
+    Each template is compiled once, then the same object is returned by the next
+    calls, so it must not be modified.
+
     :param report_type: The report type
     :param output_format: The targeted output format
     :return:
@@ -21,38 +30,17 @@ def get_template(report_type: str, output_format: str) -> Union[Template, None]:
     template_data = pkgutil.get_data(__name__, output_format + "/" + report_type + ".tmpl")
     if template_data is None:
         return None
-    return Template(template_data.decode("utf-8"))
+    template: Template = Template(template_data.decode("utf-8"))
+    return template
 
 
-def render_template(
-    report_type: str,
-    output_format: str,
-    time_start: Optional[float] = None,
-    **kwargs: Any,
-) -> Any:
-    """Render a template given Template object.
-    :param report_type: The report type
-    :param output_format: The targeted output format
+def _generation_time_function(time_start: Optional[float]) -> Callable[..., Any]:
+    """Create the function giving the report generation time to templates.
     :param time_start: Optional timestamp defining the beginning of the
         report generation.
-    :param kwarg: Optional dictionary of named arguments to be
-        transmitted to the Jinja when rendering the requested template.
     :return:
-        The rendered template if successful, else an empty string.
+        The function to be called from templates.
     """
-    template = get_template(report_type, output_format)
-    if template is None:
-        PDBStoreOutput().error(f"{output_format}/{report_type}.tmpl template not found")
-        return ""
-
-    now = datetime.today()
-
-    kwargs["report"].update(
-        {
-            "now": now.strftime("%B %d, %Y at %H:%M:%S"),
-            "__version__": pdbstore.__version__,
-        }
-    )
 
     def _generation_time(simple: Optional[bool] = True) -> Any:
         if not time_start:
@@ -76,7 +64,81 @@ def render_template(
         text_repr += f"{seconds:02.2f}s"
         return text_repr
 
-    template.globals["generation_time"] = _generation_time
+    return _generation_time
+
+
+def _template_context(time_start: Optional[float], **kwargs: Any) -> Dict[str, Any]:
+    """Build the variables given to a template.
+    :param time_start: Optional timestamp defining the beginning of the
+        report generation.
+    :param kwarg: Dictionary of named arguments to be transmitted to the Jinja
+        template.
+    :return:
+        The dictionary of template variables.
+    """
+    now = datetime.today()
+
+    kwargs["report"].update(
+        {
+            "now": now.strftime("%B %d, %Y at %H:%M:%S"),
+            "__version__": pdbstore.__version__,
+        }
+    )
+    kwargs["generation_time"] = _generation_time_function(time_start)
+    return kwargs
+
+
+def render_template(
+    report_type: str,
+    output_format: str,
+    time_start: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """Render a template given Template object.
+    :param report_type: The report type
+    :param output_format: The targeted output format
+    :param time_start: Optional timestamp defining the beginning of the
+        report generation.
+    :param kwarg: Optional dictionary of named arguments to be
+        transmitted to the Jinja when rendering the requested template.
+    :return:
+        The rendered template if successful, else an empty string.
+    """
+    template = get_template(report_type, output_format)
+    if template is None:
+        PDBStoreOutput().error(f"{output_format}/{report_type}.tmpl template not found")
+        return ""
 
-    output = template.render(**kwargs)
+    output = template.render(**_template_context(time_start, **kwargs))
     return output
+
+
+def stream_template(
+    report_type: str,
+    output_format: str,
+    stream: IO[str],
+    time_start: Optional[float] = None,
+    **kwargs: Any,
+) -> bool:
+    """Render a template piece by piece into a text stream.
+
+    The rendered text is never fully loaded into memory, so the stream should be
+    buffered.
+
+    :param report_type: The report type
+    :param output_format: The targeted output format
+    :param stream: The text stream where the rendered template is written
+    :param time_start: Optional timestamp defining the beginning of the
+        report generation.
+    :param kwarg: Optional dictionary of named arguments to be
+        transmitted to the Jinja when rendering the requested template.
+    :return:
+        True if successful, else False.
+    """
+    template = get_template(report_type, output_format)
+    if template is None:
+        PDBStoreOutput().error(f"{output_format}/{report_type}.tmpl template not found")
+        return False
+
+    stream.writelines(template.generate(**_template_context(time_start, **kwargs)))
+    return True
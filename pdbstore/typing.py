@@ -7,11 +7,13 @@ from typing import (
     Generator,
     IO,
     ItemsView,
+    Iterable,
     List,
     Mapping,
     Optional,
     overload,
     Sequence,
+    Set,
     Tuple,
     TYPE_CHECKING,
     TypedDict,
@@ -28,11 +30,13 @@ __all__ = [
     "Generator",
     "IO",
     "ItemsView",
+    "Iterable",
     "List",
     "Optional",
     "Mapping",
     "PathLike",
     "Sequence",
+    "Set",
     "SubParserType",
     "Tuple",
     "TYPE_CHECKING",
@@ -0,0 +1,77 @@
+"""Measure file copy throughput of the available copy backends.
+
+This script is not collected by pytest. Run it directly, for example::
+
+    python tests/benchmark/bench_copy.py --size 4096 --runs 3
+
+A multi-GB file is generated in the temporary directory, or in ``--dir`` which
+should be located on the same file system as the symbol store.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.fspath(Path(__file__).resolve().parents[2]))
+
+# pylint: disable=wrong-import-position
+from pdbstore.io.copy import copy_file  # noqa: E402
+
+# Size of the random block repeated to generate the input file
+_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _generate(file_path: Path, size_mb: int) -> None:
+    """Generate the input file"""
+    block = os.urandom(_BLOCK_SIZE)
+    remaining = size_mb * 1024 * 1024
+    with file_path.open("wb") as fdest:
+        while remaining > 0:
+            remaining -= fdest.write(block[: min(remaining, _BLOCK_SIZE)])
+
+
+def _userspace_copy(src_path: Path, dest_path: Path) -> None:
+    """Copy a file from user space, as done by previous releases"""
+    with src_path.open("rb") as fsrc, dest_path.open("wb") as fdest:
+        shutil.copyfileobj(fsrc, fdest)
+    shutil.copymode(src_path, dest_path)
+
+
+def main() -> int:
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2048, help="Input file size in MB.")
+    parser.add_argument("--runs", type=int, default=3, help="Number of runs per backend.")
+    parser.add_argument("--dir", type=Path, default=None, help="Working directory.")
+    opts = parser.parse_args()
+
+    backends = {
+        "userspace": _userspace_copy,
+        "shutil.copy": shutil.copy,
+        "pdbstore.io.copy": copy_file,
+    }
+
+    with tempfile.TemporaryDirectory(dir=opts.dir) as work_dir:
+        src_path = Path(work_dir) / "input.pdb"
+        dest_path = Path(work_dir) / "output.pdb"
+        print(f"Generating {opts.size} MB into {src_path} ...")
+        _generate(src_path, opts.size)
+
+        for name, backend in backends.items():
+            durations = []
+            for _ in range(opts.runs):
+                dest_path.unlink(missing_ok=True)
+                start = time.perf_counter()
+                backend(src_path, dest_path)
+                durations.append(time.perf_counter() - start)
+            best = min(durations)
+            print(f"{name:<20} best {best:8.3f} s  {opts.size / best:10.1f} MB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
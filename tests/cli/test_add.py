@@ -85,6 +85,55 @@ def test_complete(tmp_store_dir, test_data_native_dir):
     assert len(store.Store(tmp_store_dir).history) == 2
 
 
+@pytest.mark.parametrize("jobs", ["1", "3"])
+def test_complete_with_jobs(tmp_store_dir, test_data_native_dir, jobs):
+    """test complete command-line with parallel file identification"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        "--jobs",
+        jobs,
+        str(test_data_native_dir / "dummyapp.pdb"),
+        str(test_data_native_dir / "dummyapp.exe"),
+        str(test_data_native_dir / "dummylib.pdb"),
+        str(test_data_native_dir / "dummylib.dll"),
+    ]
+
+    assert cli.main(["add"] + argv) == SUCCESS
+    transaction = store.Store(tmp_store_dir).find_transaction("0000000001")
+    assert transaction.count == 4
+
+    with mock.patch("pdbstore.cli.commands.add.Store") as mock_store:
+        assert cli.main(["add"] + argv[:-5] + ["-2"] + argv[-4:]) == ERROR_UNEXPECTED
+    mock_store.assert_not_called()
+
+
+def test_complete_with_hash_cache(tmp_store_dir, tmp_path, test_data_native_dir):
+    """test complete command-line with file identity cache"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        "--hash-cache",
+        str(tmp_path / "hash.db"),
+        str(test_data_native_dir / "dummyapp.pdb"),
+    ]
+
+    assert cli.main(["add"] + argv) == SUCCESS
+    assert (tmp_path / "hash.db").is_file()
+    with mock.patch("pdbstore.io.pdbfile.PDB") as mocked:
+        assert cli.main(["add"] + argv) == SUCCESS
+        mocked.assert_not_called()
+    assert store.Store(tmp_store_dir).next_transaction_id == "0000000003"
+
+
 def test_complete_with_invalid_file(tmp_store_dir, test_data_invalid_dir):
     """test complete command-line"""
 
@@ -189,3 +238,37 @@ def test_valid_compression(tmp_store_dir, test_data_native_dir):
 
     # Test with direct call to main function
     assert cli.main(["add"] + argv) == SUCCESS
+
+
+@pytest.mark.skipif(cab.compress is None, reason="compression not available")
+def test_compression_thresholds(tmp_store_dir, test_data_native_dir):
+    """test add command with compression settings"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        "--compress",
+        "--compress-level",
+        "1",
+        "--compress-jobs",
+        "2",
+        "--compress-min-size",
+        "100000000",
+        str(test_data_native_dir / "dummyapp.pdb"),
+    ]
+
+    assert cli.main(["add"] + argv) == SUCCESS
+    stored_dir: Path = tmp_store_dir / "dummyapp.pdb" / "DBF7CE25C6DC4E0EA9AD889187E296A21"
+    assert (stored_dir / "dummyapp.pdb").is_file()
+    assert not (stored_dir / "dummyapp.pd_").exists()
+
+    for option, value in [
+        ("--compress-level", "10"),
+        ("--compress-jobs", "-1"),
+        ("--compress-min-size", "-1"),
+        ("--compress-min-ratio", "101"),
+    ]:
+        assert cli.main(["add"] + argv[:7] + [option, value] + argv[-1:]) == ERROR_UNEXPECTED
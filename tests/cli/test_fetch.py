@@ -6,6 +6,7 @@ import pytest
 
 from pdbstore import cli
 from pdbstore.cli.exit_codes import ERROR_ENCOUNTERED, ERROR_UNEXPECTED, SUCCESS
+from pdbstore.io import hashcache
 
 
 @pytest.mark.parametrize(
@@ -160,3 +161,29 @@ def test_multiple_with_config(dynamic_config_file, test_data_native_dir, formatt
         cli.cli.main(["fetch"] + formatter + argv[0:4] + pe_list + [nf_path]) == ERROR_ENCOUNTERED
     )
     assert cli.cli.main(["fetch"] + formatter + argv[0:4] + pe_list + [script_path]) == SUCCESS
+
+
+def test_complete_with_hash_cache(tmp_store_dir, tmp_path, test_data_native_dir):
+    """test fetch command-line with file identity cache"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        str(test_data_native_dir / "dummyapp.pdb"),
+    ]
+    assert cli.cli.main(["add"] + argv) == SUCCESS
+
+    fetch_argv = argv[0:2] + [
+        "--hash-cache",
+        str(tmp_path / "hash.db"),
+        str(test_data_native_dir / "dummyapp.exe"),
+    ]
+    assert cli.cli.main(["fetch"] + fetch_argv) == SUCCESS
+    assert (tmp_path / "hash.db").is_file()
+    with mock.patch("pdbstore.io.peheader.PEHeader") as mocked:
+        assert cli.cli.main(["fetch"] + fetch_argv) == SUCCESS
+        mocked.assert_not_called()
+    hashcache.deactivate()
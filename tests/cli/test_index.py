@@ -0,0 +1,54 @@
+from unittest import mock
+
+import pytest
+
+from pdbstore import cli
+from pdbstore.cli.exit_codes import ERROR_UNEXPECTED, SUCCESS
+from pdbstore.store import Store
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["--delete"],
+    ],
+)
+def test_incomplete(argv):
+    """test incomplete command-line"""
+
+    # Test through direct command-line
+    with mock.patch("sys.argv", ["pdbstore", "index"] + argv):
+        assert cli.cli.main() == ERROR_UNEXPECTED
+
+    # Test with direct call to main function
+    assert cli.cli.main(["index"] + argv) == ERROR_UNEXPECTED
+
+
+def test_complete(capsys, tmp_store_dir, test_data_native_dir):
+    """test complete command-line"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        str(test_data_native_dir / "dummyapp.pdb"),
+    ]
+    assert cli.cli.main(["add"] + argv) == SUCCESS
+    capsys.readouterr()
+
+    assert cli.cli.main(["index", "--store-dir", str(tmp_store_dir)]) == SUCCESS
+    assert "Number of transactions indexed = 1" in capsys.readouterr().out
+    assert Store(tmp_store_dir).index.is_valid()
+
+    # The index must be kept up to date by the other commands
+    assert cli.cli.main(["add"] + argv) == SUCCESS
+    assert cli.cli.main(["del", "--store-dir", str(tmp_store_dir), "1"]) == SUCCESS
+    store = Store(tmp_store_dir)
+    assert store.index.is_valid()
+    assert list(store.transactions.transactions.keys()) == ["0000000002"]
+
+    assert cli.cli.main(["index", "--store-dir", str(tmp_store_dir), "--delete"]) == SUCCESS
+    assert not Store(tmp_store_dir).index.exists()
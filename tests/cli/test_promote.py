@@ -226,3 +226,31 @@ def test_with_config_file(
     assert release_store.transactions.transactions["0000000001"].comment.startswith(
         "Promote 0000000001 from"
     )
+
+
+@pytest.mark.parametrize("link", ["auto", "hard", "reflink", "copy"])
+def test_link(snapshot_store: Store, release_store: Store, link: str):
+    """test promote command with a link mode"""
+    argv = [
+        "--store-dir",
+        str(release_store.rootdir),
+        "--input-store-dir",
+        str(snapshot_store.rootdir),
+        "--link",
+        link,
+        "1",
+    ]
+
+    assert cli.cli.main(["promote"] + argv) == SUCCESS
+    release_store.reset()
+    entries = release_store.transactions.transactions["0000000001"].entries
+    assert len(entries) == 2
+    for entry in entries:
+        src = snapshot_store.rootdir / entry.rel_path
+        assert entry.stored_path.read_bytes() == src.read_bytes()
+        if link in ("auto", "hard"):
+            assert entry.stored_path.samefile(src)
+        elif link == "copy":
+            assert not entry.stored_path.samefile(src)
+
+    assert cli.cli.main(["promote"] + argv[:-3] + ["--link", "invalid", "1"]) != SUCCESS
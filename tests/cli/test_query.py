@@ -5,6 +5,7 @@ import pytest
 
 from pdbstore import cli
 from pdbstore.cli.exit_codes import ERROR_ENCOUNTERED, ERROR_UNEXPECTED, SUCCESS
+from pdbstore.io import hashcache
 
 
 @pytest.mark.parametrize(
@@ -152,3 +153,25 @@ def test_multiple_with_config(dynamic_config_file, test_data_native_dir, formatt
         cli.cli.main(["query"] + formatter + argv[0:4] + argv[-2:] + [str(__file__)])
         == ERROR_ENCOUNTERED
     )
+
+
+def test_complete_with_hash_cache(tmp_store_dir, tmp_path, test_data_native_dir):
+    """test query command-line with file identity cache"""
+    argv = [
+        "--store-dir",
+        str(tmp_store_dir),
+        "--product-name",
+        "myproduct",
+        "--product-version",
+        "1.0.0",
+        str(test_data_native_dir / "dummyapp.pdb"),
+    ]
+    assert cli.cli.main(["add"] + argv) == SUCCESS
+
+    query_argv = argv[0:2] + ["--hash-cache", str(tmp_path / "hash.db")] + argv[-1:]
+    assert cli.cli.main(["query"] + query_argv) == SUCCESS
+    assert (tmp_path / "hash.db").is_file()
+    with mock.patch("pdbstore.io.pdbfile.PDB") as mocked:
+        assert cli.cli.main(["query"] + query_argv) == SUCCESS
+        mocked.assert_not_called()
+    hashcache.deactivate()
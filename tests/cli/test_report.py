@@ -2,7 +2,7 @@ from unittest import mock
 
 import pytest
 
-from pdbstore import cli
+from pdbstore import cli, const
 from pdbstore.cli.exit_codes import ERROR_SUBCOMMAND_NAME, ERROR_UNEXPECTED, SUCCESS
 
 
@@ -83,6 +83,8 @@ def test_report_types(report_type, tmp_store_dir, test_data_native_dir):
     ]
     assert cli.cli.main(["add"] + argv) == SUCCESS
     assert cli.cli.main(["report", report_type] + argv[0:2]) == SUCCESS
+    assert (tmp_store_dir / const.REPORT_FILENAME).is_file()
+    assert cli.cli.main(["report", report_type, "--rebuild"] + argv[0:2]) == SUCCESS
 
 
 @pytest.mark.parametrize(
@@ -1,4 +1,7 @@
 import importlib
+import io
+import struct
+import zlib
 from unittest import mock
 
 import pytest
@@ -13,35 +16,19 @@ from pdbstore import exceptions
 @pytest.mark.parametrize(
     "test_args",
     [
-        (
-            "linux",
-            "/usr/bin/gcab",
-            pdbstore.io.cab._compress_gcab,
-        ),
-        (
-            "windows",
-            r"C:\Windows\System32\makecab.exe",
-            pdbstore.io.cab._compress_makecab,
-        ),
+        ("linux", "/usr/bin/gcab"),
+        ("windows", r"C:\Windows\System32\makecab.exe"),
+        ("linux", None),
+        ("windows", None),
     ],
 )
 def test_compress_supported_per_platform(_which, test_args):
-    """test compression is supported"""
+    """test built-in compression is always used"""
     _which.return_value = test_args[1]
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.compress is not None
-        assert pdbstore.io.cab.compress.__name__ == test_args[2].__name__
-
-
-@mock.patch("pdbstore.util.which")
-@pytest.mark.parametrize("platform", ["linux", "windows"])
-def test_compress_not_supported_per_platform(_which, platform):
-    """test compression is not supported"""
-    _which.return_value = None
-    with mock.patch("sys.platform", platform):
-        importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.is_compression_supported() is False
+        assert pdbstore.io.is_compression_supported() is True
+        assert pdbstore.io.cab.compress.__name__ == pdbstore.io.cab._compress_mszip.__name__
 
 
 @mock.patch("pdbstore.util.which")
@@ -63,21 +50,7 @@ def test_compress_linux_invocation_success(_which, fake_process):
     )
     with mock.patch("sys.platform", "linux"):
         importlib.reload(pdbstore.io.cab)
-        assert (  # pylint: disable=comparison-with-callable
-            pdbstore.io.cab.compress == pdbstore.io.cab._compress_gcab
-        )
-        pdbstore.io.cab.compress("/usr/input/file.pdb", "/usr/output/file.pd_")
-
-
-@mock.patch("pdbstore.util.which")
-def test_compress_linux_invocation_failure(_which):
-    """test linux compression with failure"""
-    _which.return_value = None
-
-    with mock.patch("sys.platform", "linux"):
-        importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.compress is None
-        assert pdbstore.io.is_compression_supported() is False
+        pdbstore.io.cab._compress_gcab("/usr/input/file.pdb", "/usr/output/file.pd_")
 
 
 @mock.patch("pdbstore.util.which")
@@ -124,9 +97,7 @@ def test_compress_invocation_success(_which, fake_process, test_args):
     )
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.compress is not None
-        assert pdbstore.io.cab.compress.__name__ == test_args[2].__name__
-        pdbstore.io.cab.compress("/usr/input/file.pdb", "/usr/output/file.pd_")
+        test_args[2]("/usr/input/file.pdb", "/usr/output/file.pd_")
 
 
 @mock.patch("pdbstore.util.which")
@@ -173,9 +144,8 @@ def test_compress_invocation_failure(_which, fake_process, test_args):
     )
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.compress.__name__ == test_args[2].__name__
         with pytest.raises(exceptions.CabCompressionError) as excinfo:
-            pdbstore.io.cab.compress("/usr/input/file.pdb", "/usr/output/file.pd_")
+            test_args[2]("/usr/input/file.pdb", "/usr/output/file.pd_")
         assert str(excinfo.value) == "compression error for /usr/input/file.pdb"
 
 
@@ -200,18 +170,19 @@ def test_decompress_supported_per_platform(_which, test_args):
     _which.return_value = test_args[1]
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.decompress is not None
-        assert pdbstore.io.cab.decompress.__name__ == test_args[2].__name__
+        assert pdbstore.io.cab.decompress.__name__ == pdbstore.io.cab._decompress_cab.__name__
+        assert pdbstore.io.cab._external_decompress.__name__ == test_args[2].__name__
 
 
 @mock.patch("pdbstore.util.which")
 @pytest.mark.parametrize("platform", ["linux", "windows"])
-def test_decompress_not_supported_per_platform(_which, platform):
-    """test compression is not supported"""
+def test_decompress_without_external_per_platform(_which, platform):
+    """test built-in decompression is supported without external utility"""
     _which.return_value = None
     with mock.patch("sys.platform", platform):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.is_decompression_supported() is False
+        assert pdbstore.io.is_decompression_supported() is True
+        assert pdbstore.io.cab._external_decompress is None
 
 
 @mock.patch("pdbstore.util.which")
@@ -254,9 +225,7 @@ def test_decompress_invocation_success(_which, fake_process, test_args):
     )
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.decompress is not None
-        assert pdbstore.io.cab.decompress.__name__ == test_args[2].__name__
-        pdbstore.io.cab.decompress("/usr/input/file.pd_", "/usr/output")
+        test_args[2]("/usr/input/file.pd_", "/usr/output")
 
 
 @mock.patch("pdbstore.util.which")
@@ -299,7 +268,181 @@ def test_decompress_invocation_failure(_which, fake_process, test_args):
     )
     with mock.patch("sys.platform", test_args[0]):
         importlib.reload(pdbstore.io.cab)
-        assert pdbstore.io.cab.decompress.__name__ == test_args[2].__name__
         with pytest.raises(exceptions.CabCompressionError) as excinfo:
-            pdbstore.io.cab.decompress("/usr/input/file.pd_", "/usr/output")
+            test_args[2]("/usr/input/file.pd_", "/usr/output")
         assert str(excinfo.value) == "decompression error for /usr/input/file.pd_"
+
+
+def _read_mszip(cab_path):
+    """Decode a single file cabinet written with MSZIP compression"""
+    content = cab_path.read_bytes()
+    header = struct.unpack_from(pdbstore.io.cab.CAB_HEADER_FORMAT, content, 0)
+    assert header[0] == pdbstore.io.cab.CAB_SIGNATURE
+    assert header[2] == len(content)
+    data_start, blocks_count, compress_type = struct.unpack_from(
+        pdbstore.io.cab.CAB_FOLDER_FORMAT,
+        content,
+        struct.calcsize(pdbstore.io.cab.CAB_HEADER_FORMAT),
+    )
+    assert compress_type == pdbstore.io.cab.CAB_COMPRESS_MSZIP
+    file_offset = header[4]
+    file_size = struct.unpack_from(pdbstore.io.cab.CAB_FILE_FORMAT, content, file_offset)[0]
+    name_offset = file_offset + struct.calcsize(pdbstore.io.cab.CAB_FILE_FORMAT)
+    name = content[name_offset : content.index(b"\0", name_offset)].decode("utf-8")
+
+    data = b""
+    offset = data_start
+    for _ in range(blocks_count):
+        _, compressed_size, uncompressed_size = struct.unpack_from(
+            pdbstore.io.cab.CAB_DATA_FORMAT, content, offset
+        )
+        offset += struct.calcsize(pdbstore.io.cab.CAB_DATA_FORMAT)
+        block = content[offset : offset + compressed_size]
+        assert block[:2] == pdbstore.io.cab.MSZIP_SIGNATURE
+        data += zlib.decompress(block[2:], -zlib.MAX_WBITS)
+        assert len(data) % pdbstore.io.cab.CAB_BLOCK_SIZE in (0, uncompressed_size)
+        offset += compressed_size
+    assert len(data) == file_size
+    return name, data
+
+
+@pytest.mark.parametrize("size", [0, 10, pdbstore.io.cab.CAB_BLOCK_SIZE, 100000])
+def test_compress_mszip(tmp_path, size):
+    """test built-in compression"""
+    src_path = tmp_path / "file.pdb"
+    src_path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+    dest_path = tmp_path / "file.pd_"
+    pdbstore.io.cab._compress_mszip(src_path, dest_path)
+    assert _read_mszip(dest_path) == ("file.pdb", src_path.read_bytes())
+
+
+def test_compress_mszip_failure(tmp_path):
+    """test built-in compression with failure"""
+    dest_path = tmp_path / "file.pd_"
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab._compress_mszip(tmp_path / "notfound.pdb", dest_path)
+    assert not dest_path.exists()
+
+
+def _write_cab(cab_path, files, compress_type, reserve=False):
+    """Write a single folder cabinet the same way as Microsoft tools
+
+    MSZIP blocks are compressed using the previous block as dictionary.
+    """
+    cab = pdbstore.io.cab
+    content = b"".join(data for _, data in files)
+    blocks = []
+    window = b""
+    for offset in range(0, len(content), cab.CAB_BLOCK_SIZE):
+        block = content[offset : offset + cab.CAB_BLOCK_SIZE]
+        if compress_type == cab.CAB_COMPRESS_MSZIP:
+            compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=window)
+            data = cab.MSZIP_SIGNATURE + compressor.compress(block) + compressor.flush()
+            window = block
+        else:
+            data = block
+        blocks.append(
+            struct.pack(cab.CAB_DATA_FORMAT, 0, len(data), len(block)) + b"\0" * reserve + data
+        )
+
+    flags = cab.CAB_FLAG_RESERVE_PRESENT if reserve else 0
+    reserve_fields = struct.pack("<HBB", 4, 2, 1) + b"\0" * 4 if reserve else b""
+    header_size = struct.calcsize(cab.CAB_HEADER_FORMAT) + len(reserve_fields)
+    folder = struct.pack(cab.CAB_FOLDER_FORMAT, 0, len(blocks), compress_type) + b"\0\0" * reserve
+    files_data = b""
+    offset = 0
+    for name, data in files:
+        files_data += struct.pack(cab.CAB_FILE_FORMAT, len(data), offset, 0, 0, 0, 0)
+        files_data += name.encode("ascii") + b"\0"
+        offset += len(data)
+    data_start = header_size + len(folder) + len(files_data)
+    folder = struct.pack(cab.CAB_FOLDER_FORMAT, data_start, len(blocks), compress_type) + folder[8:]
+    payload = folder + files_data + b"".join(blocks)
+    header = struct.pack(
+        cab.CAB_HEADER_FORMAT,
+        cab.CAB_SIGNATURE,
+        0,
+        header_size + len(payload),
+        0,
+        header_size + len(folder),
+        0,
+        3,
+        1,
+        1,
+        len(files),
+        flags,
+        0,
+        0,
+    )
+    cab_path.write_bytes(header + reserve_fields + payload)
+
+
+@pytest.mark.parametrize("size", [0, 10, pdbstore.io.cab.CAB_BLOCK_SIZE, 100000])
+def test_decompress_roundtrip(tmp_path, size):
+    """test built-in decompression of built-in compressed file"""
+    src_path = tmp_path / "file.pdb"
+    src_path.write_bytes(bytes(range(256)) * (size // 256) + b"x" * (size % 256))
+    pdbstore.io.cab._compress_mszip(src_path, tmp_path / "file.pd_")
+    (tmp_path / "out").mkdir()
+    pdbstore.io.cab._decompress_cab(tmp_path / "file.pd_", tmp_path / "out")
+    assert (tmp_path / "out" / "file.pdb").read_bytes() == src_path.read_bytes()
+
+    stream = io.BytesIO()
+    assert pdbstore.io.cab.decompress_to(tmp_path / "file.pd_", stream) == "file.pdb"
+    assert stream.getvalue() == src_path.read_bytes()
+
+
+@pytest.mark.parametrize(
+    "compress_type", [pdbstore.io.cab.CAB_COMPRESS_NONE, pdbstore.io.cab.CAB_COMPRESS_MSZIP]
+)
+@pytest.mark.parametrize("reserve", [False, True])
+def test_decompress_folder(tmp_path, compress_type, reserve):
+    """test built-in decompression of several files in a single folder"""
+    files = [
+        ("first.pdb", b"first" * 20000),
+        ("empty.pdb", b""),
+        ("second.pdb", b"second" * 10000),
+        ("../third.pdb", b"third"),
+    ]
+    _write_cab(tmp_path / "file.cab", files, compress_type, reserve)
+    pdbstore.io.cab._decompress_cab(tmp_path / "file.cab", tmp_path)
+    for name, data in files:
+        assert (tmp_path / name.split("/")[-1]).read_bytes() == data
+
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab.decompress_to(tmp_path / "file.cab", io.BytesIO())
+
+
+def test_decompress_lzx(tmp_path):
+    """test decompression of unsupported compression type"""
+    lzx = 3 | (21 << 8)
+    _write_cab(tmp_path / "file.cab", [("file.pdb", b"")], lzx)
+    with mock.patch("pdbstore.io.cab._external_decompress", None):
+        with pytest.raises(exceptions.CabCompressionError):
+            pdbstore.io.cab._decompress_cab(tmp_path / "file.cab", tmp_path)
+
+    with mock.patch("pdbstore.io.cab._external_decompress") as mocked:
+        pdbstore.io.cab._decompress_cab(tmp_path / "file.cab", tmp_path)
+        mocked.assert_called_once_with(tmp_path / "file.cab", tmp_path)
+
+
+def test_decompress_corrupted(tmp_path):
+    """test decompression of invalid files"""
+    (tmp_path / "file.pd_").write_bytes(b"MSCF")
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab._decompress_cab(tmp_path / "file.pd_", tmp_path)
+
+    (tmp_path / "file.pd_").write_bytes(b"x" * 64)
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab._decompress_cab(tmp_path / "file.pd_", tmp_path)
+
+    src_path = tmp_path / "file.pdb"
+    src_path.write_bytes(b"content" * 10000)
+    pdbstore.io.cab._compress_mszip(src_path, tmp_path / "file.pd_")
+    content = (tmp_path / "file.pd_").read_bytes()
+    (tmp_path / "file.pd_").write_bytes(content[:-10])
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab._decompress_cab(tmp_path / "file.pd_", tmp_path)
+
+    with pytest.raises(exceptions.CabCompressionError):
+        pdbstore.io.cab._decompress_cab(tmp_path / "notfound.pd_", tmp_path)
@@ -0,0 +1,47 @@
+import os
+
+from pdbstore.store import CompressionPolicy, OpStatus, Store
+
+
+def test_decide(tmp_path):
+    """test compression decision"""
+    compressible = tmp_path / "compressible.pdb"
+    compressible.write_bytes(b"pdbstore" * 100000)
+    random_data = tmp_path / "random.pdb"
+    random_data.write_bytes(os.urandom(300000))
+
+    policy = CompressionPolicy()
+    assert policy.decide(compressible) == (True, "compressed")
+    assert policy.decide(random_data) == (True, "compressed")
+    assert policy.decide(tmp_path / "notfound.pdb") == (True, "compressed")
+
+    policy = CompressionPolicy(min_size=500000)
+    compress, reason = policy.decide(random_data)
+    assert compress is False
+    assert reason.startswith("stored raw (size 300000")
+    assert policy.decide(compressible)[0] is True
+
+    policy = CompressionPolicy(min_ratio=0.1, sample_size=100000)
+    assert policy.decide(compressible) == (True, "compressed")
+    compress, reason = policy.decide(random_data)
+    assert compress is False
+    assert reason.startswith("stored raw (ratio")
+
+
+def test_commit(tmp_store_dir, test_data_native_dir):
+    """test transaction commit with a compression policy"""
+    store = Store(tmp_store_dir)
+    transaction = store.new_transaction("product", "1.0.0")
+    transaction.register_entries(
+        [test_data_native_dir / "dummyapp.pdb", test_data_native_dir / "dummylib.pdb"],
+        True,
+    )
+    policy = CompressionPolicy(workers=2, level=9, min_size=20000)
+    summary = store.commit(transaction, compression=policy)
+    assert summary.status == OpStatus.SUCCESS
+
+    decisions = {os.path.basename(file["path"]): file["compression"] for file in summary.files}
+    assert decisions["dummyapp.pd_"] == "compressed"
+    assert decisions["dummylib.pdb"].startswith("stored raw (size")
+    for entry in transaction.entries:
+        assert entry.is_committed()
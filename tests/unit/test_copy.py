@@ -0,0 +1,109 @@
+import errno
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+from pdbstore.exceptions import CopyFileError
+from pdbstore.io import copy
+from pdbstore.io.copy import copy_file, link_file, LinkMode
+
+
+@pytest.mark.parametrize("mode", list(LinkMode))
+def test_link_file(tmp_path, mode):
+    """test file storage with each link mode"""
+    src = tmp_path / "src.pdb"
+    src.write_bytes(b"pdbstore" * 1000)
+    dest = tmp_path / "dest.pdb"
+    dest.write_bytes(b"previous content")
+    other = tmp_path / "other.pdb"
+    os.link(dest, other)
+
+    method = link_file(src, dest, mode)
+    assert dest.read_bytes() == src.read_bytes()
+    # The replaced file must not be modified in place
+    assert other.read_bytes() == b"previous content"
+    if mode in (LinkMode.AUTO, LinkMode.HARD):
+        assert method == LinkMode.HARD
+        assert dest.samefile(src)
+    elif mode == LinkMode.REFLINK:
+        assert method in (LinkMode.REFLINK, LinkMode.COPY)
+    else:
+        assert method == LinkMode.COPY
+    assert not dest.with_name(f"dest.pdb.tmp{os.getpid()}").exists()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fcntl not available")
+def test_link_file_fallback(tmp_path):
+    """test fallback to a full copy"""
+    src = tmp_path / "src.pdb"
+    src.write_bytes(b"pdbstore")
+    dest = tmp_path / "dest.pdb"
+
+    with mock.patch("os.link", side_effect=OSError(errno.EXDEV, "cross-device link")):
+        with mock.patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "not supported")):
+            assert link_file(src, dest, LinkMode.AUTO) == LinkMode.COPY
+    assert dest.read_bytes() == b"pdbstore"
+    assert not dest.samefile(src)
+
+
+def test_link_file_failure(tmp_path):
+    """test failure when source file is not found"""
+    with pytest.raises(CopyFileError):
+        link_file(tmp_path / "notfound.pdb", tmp_path / "dest.pdb", LinkMode.AUTO)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(
+    "syscalls", [("copy_file_range", "sendfile"), ("copy_file_range",), ("sendfile",)]
+)
+def test_copy_file(tmp_path, syscalls):
+    """test copy with unsupported system calls"""
+    src = tmp_path / "src.pdb"
+    src.write_bytes(os.urandom(100000))
+    dest = tmp_path / "dest.pdb"
+    dest.write_bytes(b"x" * 200000)
+
+    with mock.patch.object(copy, "COPY_CHUNK_SIZE", 4096):
+        with mock.patch.multiple(
+            os,
+            **{
+                name: mock.MagicMock(side_effect=OSError(errno.ENOSYS, "not implemented"))
+                for name in syscalls
+                if hasattr(os, name)
+            },
+        ):
+            copy_file(src, dest)
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_copy_file_failure(tmp_path):
+    """test copy failure"""
+    with pytest.raises(OSError):
+        copy_file(tmp_path / "notfound.pdb", tmp_path / "dest.pdb")
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range not available")
+@pytest.mark.parametrize("with_sendfile", [True, False])
+def test_copy_file_partial(tmp_path, with_sendfile):
+    """test copy resumed after a partial copy_file_range"""
+    src = tmp_path / "src.pdb"
+    src.write_bytes(os.urandom(100000))
+    dest = tmp_path / "dest.pdb"
+    copy_file_range = os.copy_file_range
+    calls = []
+
+    def _short_copy_file_range(*args):
+        calls.append(args)
+        if len(calls) > 1:
+            raise OSError(errno.EIO, "I/O error")
+        return copy_file_range(*args[:2], 1000, *args[3:])
+
+    patches = {"copy_file_range": mock.MagicMock(side_effect=_short_copy_file_range)}
+    if not with_sendfile:
+        patches["sendfile"] = mock.MagicMock(side_effect=OSError(errno.ENOSYS, "not implemented"))
+    with mock.patch.multiple(os, **patches):
+        copy_file(src, dest)
+    assert len(calls) == 2
+    assert dest.read_bytes() == src.read_bytes()
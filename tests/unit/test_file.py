@@ -100,3 +100,15 @@ def test_valid_file_size(file_access):
 def test_invalid_file_size(file_path):
     """test invalid file size behavior"""
     assert file.get_file_size(file_path) == 0
+
+
+@pytest.mark.parametrize("file_access", [[TEXT_FILE_WITH_LF + "\n"]], indirect=True)
+def test_iter_text_file(file_access):
+    """test text file lines iteration"""
+    assert list(file.iter_text_file(file_access)) == NEWLINES_FILE_CONTENT.split("\n")
+
+
+def test_iter_text_file_not_found(tmp_path):
+    """test text file lines iteration with missing file"""
+    with pytest.raises(ReadFileError):
+        list(file.iter_text_file(tmp_path / "not_found.txt"))
@@ -6,6 +6,7 @@ import pytest
 
 from pdbstore import exceptions
 from pdbstore.io import file
+from pdbstore.io.file_type import FileType
 
 
 @pytest.mark.parametrize(
@@ -83,3 +84,25 @@ def test_incomplete(dir_name, request):
             mocked.return_value = fds
             with pytest.raises(exceptions.UnknowFileTypeError):
                 file.compute_hash_key(pdb_path)
+
+
+@pytest.mark.parametrize(
+    "file_info",
+    [
+        ("test_data_native_dir", "dummyapp.exe", FileType.PE),
+        ("test_data_native_dir", "dummylib.dll", FileType.PE),
+        ("test_data_native_dir", "dummylib.pdb", FileType.PDB),
+        ("test_data_portable_dir", "dummylib.pdb", FileType.PORTABLE_PDB),
+        ("test_data_invalid_dir", "bad.exe", None),
+    ],
+)
+def test_detect_file_type(file_info, request):
+    """Test file type detection"""
+    base_dir = request.getfixturevalue(file_info[0])
+    assert file.detect_file_type(base_dir / file_info[1]) == file_info[2]
+
+
+def test_detect_file_type_not_found(test_data_dir):
+    """Test file type detection with inexistant file"""
+    with pytest.raises(exceptions.FileNotExistsError):
+        file.detect_file_type(test_data_dir / "notfound.pdb")
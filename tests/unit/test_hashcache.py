@@ -0,0 +1,96 @@
+import os
+import shutil
+from unittest import mock
+
+from pdbstore.io import file, hashcache
+
+
+def test_hash_key(tmp_path, test_data_native_dir):
+    """test hash key caching"""
+    pe_path = tmp_path / "dummyapp.exe"
+    shutil.copyfile(test_data_native_dir / "dummyapp.exe", pe_path)
+
+    cache = hashcache.HashCache(tmp_path / "cache" / "hash.db")
+    assert cache.get_hash_key(pe_path) is None
+    cache.set_hash_key(pe_path, "B85047B88000")
+    assert cache.get_hash_key(pe_path) == "B85047B88000"
+    assert cache.get_hash_key(tmp_path / "notfound.exe") is None
+    assert len(cache) == 1
+    cache.close()
+
+    # Cache content is persistent
+    cache = hashcache.HashCache(tmp_path / "cache" / "hash.db")
+    assert cache.get_hash_key(pe_path) == "B85047B88000"
+
+    # Modified file must be identified again
+    stat_info = os.stat(pe_path)
+    os.utime(pe_path, ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns + 1000))
+    assert cache.get_hash_key(pe_path) is None
+    cache.set_hash_key(pe_path, "ABCDEF")
+    assert cache.get_hash_key(pe_path) == "ABCDEF"
+    assert len(cache) == 1
+    cache.close()
+
+
+def test_dbg_info(tmp_path, test_data_native_dir):
+    """test debugging information caching"""
+    pe_path = test_data_native_dir / "dummyapp.exe"
+    cache = hashcache.HashCache(tmp_path / "hash.db")
+    assert cache.get_dbg_info(pe_path) is None
+    cache.set_hash_key(pe_path, "B85047B88000")
+    assert cache.get_dbg_info(pe_path) is None
+    cache.set_dbg_info(pe_path, ("dummyapp.pdb", "DBF7CE25C6DC4E0EA9AD889187E296A21"))
+    assert cache.get_dbg_info(pe_path) == ("dummyapp.pdb", "DBF7CE25C6DC4E0EA9AD889187E296A21")
+    assert cache.get_hash_key(pe_path) == "B85047B88000"
+    cache.close()
+
+
+def test_eviction(tmp_path):
+    """test least recently used entries eviction"""
+    cache = hashcache.HashCache(tmp_path / "hash.db", max_entries=10)
+    paths = []
+    for index in range(10):
+        path = tmp_path / f"file{index}.exe"
+        path.write_bytes(b"MZ")
+        cache.set_hash_key(path, f"{index}")
+        paths.append(path)
+    assert len(cache) == 10
+
+    # Use the oldest entry, so it must be preserved
+    assert cache.get_hash_key(paths[0]) == "0"
+
+    path = tmp_path / "file10.exe"
+    path.write_bytes(b"MZ")
+    cache.set_hash_key(path, "10")
+    assert len(cache) == 9
+    assert cache.get_hash_key(paths[0]) == "0"
+    assert cache.get_hash_key(paths[1]) is None
+    assert cache.get_hash_key(paths[2]) is None
+    assert cache.get_hash_key(path) == "10"
+    cache.close()
+
+
+def test_active(tmp_path, test_data_native_dir):
+    """test cache usage when identifying files"""
+    assert hashcache.get_active() is None
+    assert hashcache.activate(None) is None
+    cache = hashcache.activate(tmp_path / "hash.db")
+    try:
+        assert hashcache.get_active() is cache
+        pe_path = test_data_native_dir / "dummyapp.exe"
+        assert file.compute_hash_key(pe_path) == "B85047B88000"
+        assert file.extract_dbg_info(pe_path) == (
+            "dummyapp.pdb",
+            "DBF7CE25C6DC4E0EA9AD889187E296A21",
+        )
+
+        with mock.patch("pdbstore.io.peheader.PEHeader") as mocked:
+            assert file.compute_hash_key(pe_path) == "B85047B88000"
+            assert file.extract_dbg_info(pe_path) == (
+                "dummyapp.pdb",
+                "DBF7CE25C6DC4E0EA9AD889187E296A21",
+            )
+            mocked.assert_not_called()
+    finally:
+        hashcache.deactivate()
+    assert hashcache.get_active() is None
@@ -0,0 +1,127 @@
+from unittest import mock
+
+from pdbstore.store import OpStatus, Store
+
+
+def _fill_store(store: Store, test_data_native_dir) -> None:
+    for file_name in ("dummylib.pdb", "dummylib.dll"):
+        new_transaction = store.new_transaction("my product", "1.0", "")
+        new_transaction.register_entry(test_data_native_dir / file_name, False)
+        assert store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+
+def test_not_available(tmp_store: Store, test_data_native_dir):
+    """test store behavior without persistent index"""
+    _fill_store(tmp_store, test_data_native_dir)
+    assert not tmp_store.index.exists()
+    assert not tmp_store.index.is_valid()
+    assert tmp_store.find_entries(test_data_native_dir / "dummylib.pdb")
+    assert not tmp_store.index.exists()
+
+
+def test_rebuild(tmp_store: Store, test_data_native_dir):
+    """test index generation from text files"""
+    _fill_store(tmp_store, test_data_native_dir)
+    assert tmp_store.index.rebuild() == 2
+    assert tmp_store.index.is_valid()
+
+    store = Store(tmp_store.rootdir)
+    assert store.index.is_valid()
+    transactions = store.transactions.transactions
+    assert list(transactions.keys()) == ["0000000001", "0000000002"]
+    assert transactions["0000000001"].product == "my product"
+    assert (
+        transactions["0000000001"].timestamp == tmp_store.transactions.find("0000000001").timestamp
+    )
+    assert [e.file_name for e in transactions["0000000002"].entries] == ["dummylib.dll"]
+
+    entry = store.find_entries(test_data_native_dir / "dummylib.pdb")[0][1]
+    assert store.index.find(entry.file_name, entry.file_hash) == ["0000000001"]
+    assert store.fetch_symbol(test_data_native_dir / "dummylib.dll")[0].id == "0000000001"
+
+
+def test_update(tmp_store: Store, test_data_native_dir):
+    """test index update on commit and delete"""
+    _fill_store(tmp_store, test_data_native_dir)
+    tmp_store.index.rebuild()
+
+    store = Store(tmp_store.rootdir)
+    _fill_store(store, test_data_native_dir)
+    assert store.delete_transaction(1).status == OpStatus.SUCCESS
+
+    store = Store(tmp_store.rootdir)
+    assert store.index.is_valid()
+    entry = store.find_entries(test_data_native_dir / "dummylib.pdb")[0][1]
+    assert store.index.find(entry.file_name, entry.file_hash) == ["0000000003"]
+    assert list(store.transactions.transactions.keys()) == [
+        "0000000002",
+        "0000000003",
+        "0000000004",
+    ]
+
+
+def test_out_of_date(tmp_store: Store, test_data_native_dir):
+    """test index is ignored once the server file is modified by another tool"""
+    _fill_store(tmp_store, test_data_native_dir)
+    tmp_store.index.rebuild()
+
+    with open(tmp_store.server_file_path, "ab") as fps:
+        fps.write(b"\n")
+
+    store = Store(tmp_store.rootdir)
+    assert store.index.exists()
+    assert not store.index.is_valid()
+    assert len(store.transactions.transactions) == 2
+
+
+def test_delete_without_usage(tmp_store: Store, test_data_native_dir):
+    """test reference counts queried from the index when deleting a transaction"""
+    _fill_store(tmp_store, test_data_native_dir)
+    _fill_store(tmp_store, test_data_native_dir)
+    tmp_store.index.rebuild()
+
+    store = Store(tmp_store.rootdir)
+    with mock.patch.object(store.transactions, "get_files_usage") as mocked:
+        summary = store.delete_transactions([1, 2])
+        mocked.assert_not_called()
+    assert summary.success(True) == 0
+    summary = store.delete_transactions([3])
+    assert summary.success() == 1
+    assert not (tmp_store.rootdir / "dummylib.pdb").exists()
+
+
+def test_promoted_compressed(tmp_store_input: Store, tmp_store: Store, test_data_native_dir):
+    """test compression state of promoted entries loaded from the index"""
+    new_transaction = tmp_store_input.new_transaction("my product", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", True)
+    assert tmp_store_input.commit(new_transaction, False).status == OpStatus.SUCCESS
+    tmp_store.index.rebuild()
+    assert tmp_store.promote_transaction(new_transaction).status == OpStatus.SUCCESS
+
+    store = Store(tmp_store.rootdir)
+    assert store.index.is_valid()
+    indexed = store.find_transaction(1).entries
+    with mock.patch.object(store.index, "is_valid", return_value=False):
+        loaded = store.transactions.find("0000000001")._load_entries()
+    assert [(e.file_name, e.file_hash, e.compressed) for e in indexed] == [
+        (e.file_name, e.file_hash, e.compressed) for e in loaded
+    ]
+    assert indexed[0].compressed
+    assert indexed[0].stored_path.is_file()
+
+
+def test_compressed_state(tmp_store: Store, test_data_native_dir):
+    """test compression state of entries updated by a newer transaction"""
+    _fill_store(tmp_store, test_data_native_dir)
+    tmp_store.index.rebuild()
+    new_transaction = tmp_store.new_transaction("my product", "2.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", True)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+    store = Store(tmp_store.rootdir)
+    assert store.index.is_valid()
+    for transaction_id in ("0000000001", "0000000003"):
+        indexed = store.transactions.find(transaction_id).entries
+        with mock.patch.object(store.index, "is_valid", return_value=False):
+            loaded = store.transactions.find(transaction_id)._load_entries()
+        assert [e.compressed for e in indexed] == [e.compressed for e in loaded] == [True]
@@ -1,5 +1,6 @@
 import io
 import pathlib
+import struct
 from unittest import mock
 
 import pytest
@@ -55,3 +56,27 @@ def test_pdb_not_found(test_data_dir):
     """Test inexistant file"""
     with pytest.raises(exceptions.FileNotExistsError):
         pdbfile.PDB(test_data_dir / "notfound.pdb")
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_stream_directory(test_data_native_dir, mapped):
+    """Test stream directory parsing with and without memory mapped file"""
+    # pylint: disable=protected-access
+    with open(test_data_native_dir / "dummyapp.pdb", "rb") as fps:
+        fps.seek(len(pdbfile.PDB_HEADER_SIGNATURE))
+        page_size, _, _, root_stream_size = struct.unpack("<IIII", fps.read(4 * 4))
+        data = memoryview(pathlib.Path(fps.name).read_bytes()) if mapped else None
+        root = pdbfile.RootStream(fps, page_size, root_stream_size, data)
+        assert root.parse_guid() == "DBF7CE25C6DC4E0EA9AD889187E296A2"
+        assert root.parse_age() == 1
+
+        assert root.streams_count > pdbfile.DBI_STREAM_INDEX
+        assert len(root.streams_sizes) == root.streams_count
+        assert len(root.streams_pages) == root.streams_count
+        for index in range(root.streams_count):
+            size = root._get_stream_size(index)
+            if size != pdbfile.PDB_NIL_STREAM_SIZE:
+                assert len(root._get_stream_page_indexes(index)) * page_size >= size
+
+        with pytest.raises(exceptions.PDBInvalidStreamIndexError):
+            root._get_stream_page_indexes(root.streams_count)
@@ -0,0 +1,72 @@
+import io
+import pathlib
+from unittest import mock
+
+import pytest
+
+from pdbstore import exceptions
+from pdbstore.io import file, peheader
+
+
+@pytest.mark.parametrize(
+    "file_info",
+    [
+        ("dummyapp.exe", 0xB85047B8, 0x8000),
+        ("dummylib.dll", 0xF2B0D720, 0x8000),
+    ],
+)
+def test_native(test_data_native_dir, file_info):
+    """Test PE headers"""
+    header = peheader.PEHeader(test_data_native_dir / file_info[0])
+    assert header.timestamp == file_info[1]
+    assert header.size_of_image == file_info[2]
+
+
+def test_incomplete(test_data_native_dir):
+    """test incomplete PE file content"""
+    pe_path = test_data_native_dir / "dummyapp.exe"
+    with open(pe_path, "rb") as fps:
+        fds = io.BytesIO(fps.read(1))
+        fps.seek(0)
+        fds.close = mock.Mock(return_value=None, side_effect=lambda: fds.seek(0))
+
+        with mock.patch.object(pathlib.Path, "open") as mocked:
+            mocked.return_value = fds
+            with pytest.raises(exceptions.InvalidPEFile):
+                peheader.PEHeader(pe_path)
+
+        fds = io.BytesIO(fps.read(160))
+        fps.seek(0)
+        fds.close = mock.Mock(return_value=None, side_effect=lambda: fds.seek(0))
+
+        with mock.patch.object(pathlib.Path, "open") as mocked:
+            mocked.return_value = fds
+            with pytest.raises(exceptions.ParseFileError):
+                peheader.PEHeader(pe_path)
+
+
+def test_pdb(test_data_native_dir):
+    """Test invalid pe file"""
+    with pytest.raises(exceptions.InvalidPEFile):
+        peheader.PEHeader(test_data_native_dir / "dummyapp.pdb")
+
+
+def test_pe_not_found(test_data_dir):
+    """Test inexistant file"""
+    with pytest.raises(exceptions.FileNotExistsError):
+        peheader.PEHeader(test_data_dir / "notfound.exe")
+
+
+@pytest.mark.parametrize("file_name", ["dummyapp.exe", "dummylib.dll"])
+def test_debug_info(test_data_native_dir, file_name):
+    """Test CodeView record against pefile module"""
+    # pylint: disable=protected-access
+    header = peheader.PEHeader(test_data_native_dir / file_name, debug_info=True)
+    assert header.codeview_signature == b"RSDS"
+    assert header.debug_info == file._extract_dbg_info_pefile(str(test_data_native_dir / file_name))
+    assert header.pdb_name == file_name.replace(".exe", ".pdb").replace(".dll", ".pdb")
+    assert header.age is not None
+
+    header = peheader.PEHeader(test_data_native_dir / file_name)
+    assert header.codeview_signature is None
+    assert header.debug_info is None
@@ -48,3 +48,14 @@ def test_pdb_not_found(test_data_dir):
     """Test inexistant file"""
     with pytest.raises(exceptions.FileNotExistsError):
         portablepdbfile.PortablePDB(test_data_dir / "notfound.pdb")
+
+
+@pytest.mark.parametrize("read_size", [8, 1024])
+def test_streams(test_data_portable_dir, read_size):
+    """Test stream headers parsing whatever the buffered read size"""
+    # pylint: disable=protected-access
+    with mock.patch.object(portablepdbfile, "HEADER_READ_SIZE", read_size):
+        pdb = portablepdbfile.PortablePDB(test_data_portable_dir / "dummylib.pdb")
+    assert list(pdb._root.streams) == ["#Pdb", "#~", "#Strings", "#US", "#GUID", "#Blob"]
+    assert pdb._root.streams[portablepdbfile.STREAM_PDB].name == portablepdbfile.STREAM_PDB
+    assert pdb.guid == "26AAE66BC7ED4655BD38492E7BB26883"
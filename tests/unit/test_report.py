@@ -1,6 +1,13 @@
+import io
+import os
+from datetime import datetime
+from unittest import mock
+
 import pytest
 
-from pdbstore.report import ReportGenerator
+from pdbstore import templates
+from pdbstore.report import ReportGenerator, ReportSnapshot
+from pdbstore.store import OpStatus, Store, StoreSizes, TransactionEntry
 
 
 def test_supported_list(tmp_store):
@@ -32,3 +39,175 @@ def test_invalid_report(tmp_store, capsys):
     report = ReportGenerator(tmp_store)
     assert report.generate("invalid") is None
     assert capsys.readouterr().err == "ERROR: invalid : unsupported report type\n"
+
+
+def test_shared_files(tmp_store, test_data_native_dir):
+    """test disk space shared between several transactions"""
+    for version in ["1.0", "2.0"]:
+        new_transaction = tmp_store.new_transaction("my product", version, "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    file_size = os.path.getsize(test_data_native_dir / "dummylib.pdb")
+
+    report = ReportGenerator(tmp_store)
+    products = report.generate(ReportGenerator.PRODUCTS)
+    assert products is not None
+    assert products.statistics[("my product", "1.0")].disk_space == file_size
+    assert products.statistics[("my product", "2.0")].shared_space == file_size
+
+    transactions = report.generate(ReportGenerator.TRANSACTIONS)
+    assert transactions is not None
+    assert [len(value.files) for value in transactions.statistics.values()] == [1, 1]
+    assert report.generate(ReportGenerator.TRANSACTIONS).statistics is not transactions.statistics
+
+
+def test_store_sizes(tmp_store, test_data_native_dir):
+    """test report generation from a single walk of the store tree"""
+    for file_name, compress in [("dummylib.pdb", False), ("dummylib.dll", True)]:
+        new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+        new_transaction.register_entry(test_data_native_dir / file_name, compress)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+    sizes = StoreSizes(tmp_store, 2)
+    assert sizes.build() == 2
+    entries = [entry for t in tmp_store.transactions.transactions.values() for entry in t.entries]
+    for entry in entries:
+        assert sizes.get(entry.file_name, entry.file_hash) == (
+            entry.get_disk_usage(),
+            entry.compressed,
+        )
+        assert sizes.disk_usage(entry) == entry.get_disk_usage()
+    assert sizes.get("unknown.pdb", "0") is None
+
+    with mock.patch.object(TransactionEntry, "get_disk_usage", side_effect=AssertionError):
+        report = ReportGenerator(tmp_store, sizes)
+        for report_type in report.supported_list():
+            assert report.generate(report_type) is not None
+
+
+def test_files_report(tmp_store, test_data_native_dir):
+    """test files report with a file shared between several products"""
+    for product, version in [("product", "1.0"), ("product", "2.0"), ("other", "1.0")]:
+        new_transaction = tmp_store.new_transaction(product, version, "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    assert tmp_store.delete_transaction(3).status == OpStatus.SUCCESS
+
+    files = ReportGenerator(tmp_store).generate(ReportGenerator.FILES)
+    assert files is not None
+    assert len(files.statistics) == 1
+    fes = next(iter(files.statistics.values()))
+    assert fes.get_file_size() == os.path.getsize(test_data_native_dir / "dummylib.pdb")
+    assert fes.get_products() == {("product", "1.0"): 1, ("product", "2.0"): 1}
+
+    other = ReportGenerator(tmp_store).generate(ReportGenerator.FILES)
+    assert other is not None
+    assert other.statistics is not files.statistics
+    assert next(iter(other.statistics.values())).get_products() == fes.get_products()
+
+
+def _statistics(report, report_type):
+    """Extract comparable data from generated statistics"""
+    generated = report.generate(report_type)
+    assert generated is not None
+    return {key: vars(value) for key, value in generated.statistics.items()}
+
+
+def test_snapshot(tmp_store, test_data_native_dir):
+    """test incremental report snapshot update"""
+    for version in ["1.0", "2.0"]:
+        new_transaction = tmp_store.new_transaction("my product", version, "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+    snapshot = ReportSnapshot(tmp_store)
+    assert not snapshot.load()
+    assert snapshot.update() == 2
+    assert tmp_store.report_file_path.is_file()
+    assert snapshot.last_id == "0000000002"
+    assert snapshot.update() == 0
+
+    new_transaction = tmp_store.new_transaction("other", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.dll", False)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    assert tmp_store.delete_transaction(1).status == OpStatus.SUCCESS
+
+    snapshot = ReportSnapshot(tmp_store)
+    with mock.patch.object(TransactionEntry, "get_disk_usage", return_value=1) as disk_usage:
+        assert snapshot.update() == 2
+    assert disk_usage.call_count == 1
+    assert snapshot.last_id == "0000000004"
+    assert snapshot.records["0000000001"].status == "deleted"
+    assert snapshot.records["0000000003"].files[0][3] == 1
+
+    assert snapshot.update(rebuild=True) == 4
+    assert snapshot.records["0000000003"].files[0][3] > 1
+    for report_type in ReportGenerator(tmp_store).supported_list():
+        assert _statistics(ReportGenerator(tmp_store), report_type) == _statistics(
+            ReportGenerator(tmp_store, snapshot=False), report_type
+        )
+
+
+def test_snapshot_stale(tmp_store, test_data_native_dir):
+    """test report snapshot from another history file"""
+    new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    snapshot = ReportSnapshot(tmp_store)
+    snapshot.update()
+    snapshot.last_id = "0000000005"
+    snapshot._save(set(), set(), False)
+
+    snapshot = ReportSnapshot(tmp_store)
+    assert snapshot.update() == 1
+    assert snapshot.last_id == "0000000001"
+
+    tmp_store.report_file_path.write_text("invalid")
+    assert ReportSnapshot(tmp_store).update() == 1
+
+
+def test_snapshot_rewritten_file(tmp_store, test_data_native_dir):
+    """test report snapshot after a stored file is compressed by a forced add"""
+    new_transaction = tmp_store.new_transaction("p", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    assert ReportGenerator(tmp_store).generate(ReportGenerator.PRODUCTS)
+    entry_hash = new_transaction.entries[0].file_hash
+
+    new_transaction = tmp_store.new_transaction("p", "2.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", True)
+    assert tmp_store.commit(new_transaction, True).status == OpStatus.SUCCESS
+
+    store = Store(tmp_store.rootdir)
+    for report_type in ReportGenerator(store).supported_list():
+        assert _statistics(ReportGenerator(store), report_type) == _statistics(
+            ReportGenerator(Store(tmp_store.rootdir), snapshot=False), report_type
+        )
+    assert _statistics(ReportGenerator(store), ReportGenerator.PRODUCTS)[("p", "1.0")][
+        "disk_space"
+    ] == os.path.getsize(tmp_store.rootdir / "dummylib.pdb" / entry_hash / "dummylib.pd_")
+    snapshot = ReportSnapshot(store)
+    assert snapshot.load()
+    assert snapshot.records["0000000001"].files == snapshot.records["0000000002"].files
+
+
+@pytest.mark.parametrize("out_format", ["text", "markdown", "json", "html"])
+def test_stream_template(tmp_store, test_data_native_dir, out_format):
+    """test report rendered piece by piece"""
+    new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+    assert templates.get_template("transactions", out_format) is templates.get_template(
+        "transactions", out_format
+    )
+    generated = ReportGenerator(tmp_store).generate(ReportGenerator.TRANSACTIONS)
+    assert generated is not None
+    report = {"statistics": generated.statistics, "store_name": "", "store": tmp_store}
+    with mock.patch("pdbstore.templates.datetime") as mock_datetime:
+        mock_datetime.today.return_value = datetime(2024, 1, 1)
+        stream = io.StringIO()
+        assert templates.stream_template("transactions", out_format, stream, report=report)
+        assert stream.getvalue() == templates.render_template(
+            "transactions", out_format, report=report
+        )
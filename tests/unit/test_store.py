@@ -37,6 +37,40 @@ def _assert_text_file_contents(file_path, content):
         assert fps.read() == content
 
 
+@pytest.mark.parametrize("history_store", [[HISTORE_FILE_EMPTY]], indirect=True)
+def test_history_recent(history_store):
+    """test reading the end of history file"""
+    history_store.store.history_file_path.unlink()
+    assert not history_store.tail(5)
+    assert not history_store.since("0000000001")
+    assert history_store.checkpoint() == 0
+
+    lines = [f'{i:010d},add,file,11/05/2023,14:46:44,"product","{i}","",' for i in range(1, 3001)]
+    lines.append("3001,del,0000000002")
+    history_store._write_lines(lines[:2000])
+    checkpoint = history_store.checkpoint()
+    history_store._write_lines(lines[2000:])
+
+    with mock.patch("pdbstore.store.history.HISTORY_BLOCK_SIZE", 1000):
+        assert [t.id for t in history_store.tail(3)] == ["0000002999", "0000003000", "3001"]
+        assert [t.id for t in history_store.tail(5000)] == [t.id for t in history_store]
+        assert history_store.tail(0) == []
+        recent = history_store.since("0000002998")
+        assert [t.version for t in recent[:2]] == ["2999", "3000"]
+        assert recent[2].transaction_type == TransactionType.DEL
+        assert len(history_store.since("0")) == 3001
+        assert history_store.since("3001") == []
+
+    transactions, next_checkpoint = history_store.read_from(checkpoint)
+    assert [t.id for t in transactions] == [t.id for t in history_store.since("0000002000")]
+    assert history_store.read_from(next_checkpoint) == ([], next_checkpoint)
+    with pytest.raises(ValueError):
+        history_store.read_from(next_checkpoint + 1)
+
+    assert [t.id for t in history_store.tail(2)] == ["0000003000", "3001"]
+    assert len(history_store.since("0000002990")) == 11
+
+
 @pytest.mark.parametrize("history_store", [[HISTORE_FILE_EMPTY]], indirect=True)
 def test_assert_empty_history(history_store):
     """test adding new trasaction line to an empty store"""
@@ -223,3 +257,120 @@ def test_promote_failure(tmp_store_input: Store, tmp_store: Store):
     summary = tmp_store.promote_transaction(new_transaction)
     assert summary.status == OpStatus.FAILED
     assert summary.error_msg == "Invalid transaction type"
+
+
+def test_files_index(tmp_store: Store, test_data_native_dir):
+    """test lookup index maintenance on commit and delete"""
+    for _ in range(2):
+        new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+
+    entry = tmp_store.find_entries(test_data_native_dir / "dummylib.pdb")[0][1]
+    assert tmp_store.files_index.find(entry.file_name, entry.file_hash) == [
+        "0000000001",
+        "0000000002",
+    ]
+    assert len(tmp_store.find_entries(test_data_native_dir / "dummylib.pdb", True)) == 2
+
+    new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+    new_transaction.register_entry(test_data_native_dir / "dummylib.dll", False)
+    assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    assert tmp_store.find_entries(test_data_native_dir / "dummylib.dll")
+
+    assert tmp_store.delete_transaction(1).status == OpStatus.SUCCESS
+    assert tmp_store.files_index.find(entry.file_name, entry.file_hash) == ["0000000002"]
+    assert tmp_store.fetch_symbol(test_data_native_dir / "dummylib.dll")[0].id == "0000000002"
+
+    assert tmp_store.files_index.refcount(entry.file_name, entry.file_hash) == 1
+    assert tmp_store.files_index.find_unused_entries(tmp_store.find_transaction(2)) == [
+        (entry.file_name, entry.file_hash)
+    ]
+
+    assert tmp_store.delete_transaction(2).status == OpStatus.SUCCESS
+    assert not tmp_store.files_index.find(entry.file_name, entry.file_hash)
+    assert tmp_store.files_index.refcount(entry.file_name, entry.file_hash) == 0
+    assert len(tmp_store.files_index) == 1
+    assert tmp_store.fetch_symbol(test_data_native_dir / "dummylib.dll") is None
+
+
+def test_delete_transactions(tmp_store: Store, test_data_native_dir):
+    """test deletion of several transactions at once"""
+    for i in range(4):
+        new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        if i == 3:
+            new_transaction.register_entry(test_data_native_dir / "dummylib.dll", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    entry = tmp_store.find_entries(test_data_native_dir / "dummylib.pdb")[0][1]
+    stored_dir = tmp_store.rootdir / entry.file_name / entry.file_hash
+
+    with mock.patch.object(
+        tmp_store.transactions,
+        "_rewrite_server_file",
+        wraps=tmp_store.transactions._rewrite_server_file,
+    ) as rewrite_mocked:
+        summary = tmp_store.delete_transactions([1, 2, 99, 1], True)
+        rewrite_mocked.assert_not_called()
+        summaries = list(summary.iterator())
+        assert [cur.status for cur in summaries] == [
+            OpStatus.SUCCESS,
+            OpStatus.SUCCESS,
+            OpStatus.FAILED,
+            OpStatus.SKIPPED,
+        ]
+        assert summaries[3].transaction_id == "0000000001"
+        assert "duplicate" in summaries[3].error_msg
+        assert stored_dir.is_dir()
+
+        # Shared file is released by the last transaction referencing it
+        summary = tmp_store.delete_transactions(["1", "2", "3"])
+        rewrite_mocked.assert_called_once()
+
+    summaries = list(summary.iterator())
+    assert [cur.transaction_id for cur in summaries] == ["0000000001", "0000000002", "0000000003"]
+    assert [len(cur.files) for cur in summaries] == [0, 0, 0]
+    assert stored_dir.is_dir()
+    assert sorted(tmp_store.transactions.transactions) == ["0000000004"]
+    assert tmp_store.next_transaction_id == "0000000008"
+    _assert_text_file_contents(
+        tmp_store.history_file_path,
+        [line for line in tmp_store.history_file_path.read_text().splitlines() if ",add," in line]
+        + [
+            "0000000005,del,0000000001",
+            "0000000006,del,0000000002",
+            "0000000007,del,0000000003",
+        ],
+    )
+
+    summary = tmp_store.delete_transactions([4])
+    assert summary.success() == 2
+    assert not stored_dir.exists()
+
+
+def test_status(tmp_store: Store, test_data_native_dir):
+    """test deleted and promoted status snapshot"""
+    for _ in range(3):
+        new_transaction = tmp_store.new_transaction("my product", "1.0", "")
+        new_transaction.register_entry(test_data_native_dir / "dummylib.pdb", False)
+        assert tmp_store.commit(new_transaction, False).status == OpStatus.SUCCESS
+    transaction = tmp_store.find_transaction(1)
+    assert transaction.is_deleted() is False
+    assert transaction.is_promoted() is False
+
+    # Markers are not checked anymore once the snapshot is loaded
+    (tmp_store.admin_dir / "0000000002.promoted").touch()
+    with mock.patch.object(pathlib.Path, "exists", side_effect=AssertionError):
+        assert tmp_store.find_transaction(2).is_promoted() is False
+
+    # Snapshot is updated when marking transactions
+    assert tmp_store.delete_transaction(1).status == OpStatus.SUCCESS
+    tmp_store.find_transaction(3).mark_promoted()
+    with mock.patch.object(pathlib.Path, "exists", side_effect=AssertionError):
+        assert transaction.is_deleted() is True
+        assert tmp_store.find_transaction(3).is_promoted() is True
+        assert tmp_store.find_transaction(2).is_promoted() is False
+
+    tmp_store.status.reset()
+    assert tmp_store.find_transaction(2).is_promoted() is True
+    assert tmp_store.status.is_deleted("0000000001") is True
@@ -62,6 +62,25 @@ def test_register_entry(tmp_store, test_data_native_dir):
     assert transaction.register_entry(test_data_native_dir / "dummyapp.pdb", False) is True
 
 
+@pytest.mark.parametrize("jobs", [None, 1, 4])
+def test_register_entries(tmp_store, test_data_native_dir, test_data_invalid_dir, jobs):
+    """test parallel registration of several files"""
+    transaction = Transaction(tmp_store, None, TransactionType.ADD.value)
+    paths = [
+        test_data_native_dir / "dummyapp.pdb",
+        test_data_invalid_dir / "bad.exe",
+        test_data_native_dir / "notfound.exe",
+        test_data_native_dir / "dummylib.dll",
+    ]
+    results = transaction.register_entries(paths, False, jobs)
+    assert [result[0] for result in results] == paths
+    assert results[0][1] is True
+    assert isinstance(results[1][1], exceptions.UnknowFileTypeError)
+    assert isinstance(results[2][1], exceptions.FileNotExistsError)
+    assert results[3][1] is True
+    assert [entry.file_name for entry in transaction.entries] == ["dummyapp.pdb", "dummylib.dll"]
+
+
 def test_deleted(tmp_store, monkeypatch, capsys):
     """test deleted tag"""
     transaction = Transaction(tmp_store, "0000000001", TransactionType.ADD.value)
@@ -177,3 +196,22 @@ def test_parse_line(tmp_store):
     assert Transaction.parse_line(tmp_store, "0000000002,del,0000000001") is not None
     assert Transaction.parse_line(tmp_store, "0000000002,del,") is None
     assert Transaction.parse_line(tmp_store, "0000000002,delc,0000000001") is None
+
+
+def test_parse_line_lazy_timestamp(tmp_store):
+    """Test parse_line fast path and timestamp parsing on demand"""
+    line = '0000000001,add,file,11/05/2023,14:46:44,"product","1.0","comment, with comma",'
+    transaction = Transaction.parse_line(tmp_store, line)
+    assert transaction is not None
+    assert transaction.product == "product"
+    assert transaction.version == "1.0"
+    assert transaction.comment == "comment, with comma"
+    assert str(transaction) == line
+    assert transaction.timestamp == datetime(2023, 11, 5, 14, 46, 44)
+    assert str(transaction) == line
+
+    transaction = Transaction.parse_line(
+        tmp_store, '0000000001,add,file,13/45/2023,14:46:44,"product","1.0","",'
+    )
+    assert transaction is not None
+    assert transaction.timestamp is None
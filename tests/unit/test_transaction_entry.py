@@ -147,22 +147,13 @@ def test_extract_failure(tmp_path, tmp_store, test_data_native_dir, fake_process
 
     entry = TransactionEntry.create(tmp_store, test_data_native_dir / "dummylib.pdb")
     entry.compressed = True
-    fake_process.register(
-        ["gcab", "-z", "-n", "-c", entry.stored_path, entry.file_path],
-        stdout=b"compression ok",
-        returncode=0,
-    )
-    fake_process.register(
-        ["gcab", "-x", "-C", tmp_path, entry.stored_path],
-        stdout=b"decompression failed",
-        returncode=1,
-    )
 
     with mock.patch("pdbstore.util.which") as _which:
         _which.return_value = "/usr/bin/gcab"
         importlib.reload(pdbstore.io.cab)
         assert pdbstore.io.is_decompression_supported() is True
         assert entry.commit() is True
+        entry.stored_path.write_bytes(b"MSCF")
         with pytest.raises(exceptions.CabCompressionError):
             entry.extract(tmp_path)
 